@@ -0,0 +1,296 @@
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set
+
+
+@dataclass
+class Profile:
+    """
+    How a stand-in server behaves.
+
+    Each response waits latency (+/- jitter, as a fraction of latency), then streams
+    completion_tokens at tokens_per_sec (0 = all at once). failure_rate of the requests
+    answer failure_status instead.
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.2
+    tokens_per_sec: float = 2000.0
+    completion_tokens: int = 200
+    failure_rate: float = 0.0
+    failure_status: int = 503
+
+
+# Named profiles for --profile; individual fields can still be overridden
+PROFILES: Dict[str, Dict[str, Profile]] = {
+    "instant": {
+        "llm": Profile(latency=0.0, jitter=0.0, tokens_per_sec=0.0),
+        "research": Profile(latency=0.0, jitter=0.0, tokens_per_sec=0.0),
+    },
+    "fast": {
+        "llm": Profile(),
+        "research": Profile(latency=0.05, tokens_per_sec=0.0),
+    },
+    "realistic": {
+        "llm": Profile(latency=0.4, jitter=0.3, tokens_per_sec=150.0, completion_tokens=600),
+        "research": Profile(latency=1.5, jitter=0.3, tokens_per_sec=0.0),
+    },
+    "flaky": {
+        "llm": Profile(failure_rate=0.05, failure_status=429),
+        "research": Profile(latency=0.05, tokens_per_sec=0.0, failure_rate=0.05, failure_status=503),
+    },
+}
+
+
+class _StandInServer(ABC):
+    """ThreadingHTTPServer on a free local port, run in a daemon thread, counting requests."""
+
+    def __init__(self, profile: Optional[Profile] = None, host: str = "127.0.0.1", port: int = 0, seed: Optional[int] = None):
+        self.profile = profile or Profile()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.failures = 0
+            self.completion_tokens = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": self.requests, "failures": self.failures, "completion_tokens": self.completion_tokens}
+
+    def _admit(self) -> bool:
+        """Count one request; False if the failure profile says it should fail."""
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.profile.failure_rate
+            if failed:
+                self.failures += 1
+            return not failed
+
+    def _delay(self) -> float:
+        with self._lock:
+            spread = self._random.uniform(-1.0, 1.0) * self.profile.jitter
+        return max(0.0, self.profile.latency * (1.0 + spread))
+
+    def _count_tokens(self, n: int) -> None:
+        with self._lock:
+            self.completion_tokens += n
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._json(400, {"error": {"message": "invalid JSON"}})
+                    return
+                server._route(self, self.path.split("?", 1)[0], body)
+
+            def _json(self, status: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    @abstractmethod
+    def _route(self, handler: Any, path: str, body: Dict[str, Any]) -> None:
+        """Answer one POST to path with the handler's _json, or stream it."""
+
+    def _fail(self, handler: Any) -> None:
+        time.sleep(self._delay())
+        handler._json(self.profile.failure_status, {"error": {"message": "stand-in failure", "type": "server_error"}})
+
+    def start(self) -> "_StandInServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "_StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def _filler(n_tokens: int) -> str:
+    return " ".join(f"word{i % 50}" for i in range(n_tokens))
+
+
+class FakeLLMServer(_StandInServer):
+    """
+    OpenAI-compatible stand-in serving POST /v1/chat/completions (plain and streamed).
+
+    Replies are filler text of profile.completion_tokens tokens, except that design prompts get
+    `modules` template-shaped module sections and the module extraction prompt gets a JSON list
+    of `modules` modules, so Develop has work to do.
+
+    Like a server with prefix caching, a system message it has already seen (since the last
+    reset) is reported as cached in usage.prompt_tokens_details.cached_tokens.
+    """
+
+    def __init__(self, profile: Optional[Profile] = None, modules: int = 3, **kwargs: Any):
+        self.modules = modules
+        super().__init__(profile, **kwargs)
+
+    def reset(self) -> None:
+        super().reset()
+        with self._lock:
+            self._prefixes: Set[str] = set()
+
+    def _cached_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        """Tokens of a leading system message seen before; it is remembered for later requests."""
+        if not messages or messages[0].get("role") != "system":
+            return 0
+        prefix = str(messages[0].get("content") or "")
+        with self._lock:
+            seen = prefix in self._prefixes
+            self._prefixes.add(prefix)
+        return len(prefix) // 4 if seen else 0
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    def _reply(self, prompt: str) -> str:
+        if '"module_title"' in prompt:
+            modules = [
+                {
+                    "module_title": f"Module {i + 1}",
+                    "script": _filler(40),
+                    "slides_plan": _filler(40),
+                    "assessment_plan": _filler(40),
+                }
+                for i in range(self.modules)
+            ]
+            return json.dumps({"modules": modules})
+        if "### Module 1:" in prompt or "### Module Structure" in prompt:
+            return self._design_reply()
+        return _filler(self.profile.completion_tokens)
+
+    def _design_reply(self) -> str:
+        """Design artifact shaped like the templates: a module table and one section per module."""
+        per_section = max(1, self.profile.completion_tokens // (self.modules + 1))
+        rows = "\n".join(f"| {i + 1} | Module {i + 1} | 1 week | {_filler(10)} | None |" for i in range(self.modules))
+        sections = "\n\n".join(f"### Module {i + 1}: Module {i + 1}\n{_filler(per_section)}" for i in range(self.modules))
+        return (
+            "### Module Structure\n\n| Module | Title | Duration | Learning Outcomes | Prerequisites |\n"
+            f"|---|---|---|---|---|\n{rows}\n\n{sections}\n\n### Guidelines\n{_filler(per_section)}"
+        )
+
+    def _route(self, handler: Any, path: str, body: Dict[str, Any]) -> None:
+        if not path.rstrip("/").endswith("/chat/completions"):
+            handler._json(404, {"error": {"message": f"unknown path {path}"}})
+            return
+        if not self._admit():
+            self._fail(handler)
+            return
+        prompt = "\n".join(str(m.get("content") or "") for m in body.get("messages", []))
+        text = self._reply(prompt)
+        pieces = text.split(" ")
+        usage = {
+            "prompt_tokens": max(1, len(prompt) // 4),
+            "completion_tokens": len(pieces),
+            "total_tokens": max(1, len(prompt) // 4) + len(pieces),
+            "prompt_tokens_details": {"cached_tokens": self._cached_tokens(body.get("messages", []))},
+        }
+        self._count_tokens(len(pieces))
+        created = int(time.time())
+        model = body.get("model", "stand-in")
+        time.sleep(self._delay())
+        rate = self.profile.tokens_per_sec
+
+        if not body.get("stream"):
+            if rate > 0:
+                time.sleep(len(pieces) / rate)
+            handler._json(200, {
+                "id": "chatcmpl-standin",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        # Server-sent events, one chunk per ~10 tokens, paced at the token rate
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+
+        def _send(choices: list, extra: Optional[Dict[str, Any]] = None) -> None:
+            chunk = {"id": "chatcmpl-standin", "object": "chat.completion.chunk", "created": created, "model": model, "choices": choices}
+            chunk.update(extra or {})
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            handler.wfile.flush()
+
+        step = 10
+        for i in range(0, len(pieces), step):
+            part = pieces[i:i + step]
+            if rate > 0:
+                time.sleep(len(part) / rate)
+            content = (" " if i else "") + " ".join(part)
+            _send([{"index": 0, "delta": {"content": content}, "finish_reason": None}])
+        _send([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if (body.get("stream_options") or {}).get("include_usage"):
+            _send([], {"usage": usage})
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+
+class FakeResearchServer(_StandInServer):
+    """Stand-in for the researcher API: POST /fast_search and /fast_research."""
+
+    def _route(self, handler: Any, path: str, body: Dict[str, Any]) -> None:
+        endpoint = path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint not in ("fast_search", "fast_research"):
+            handler._json(404, {"detail": f"unknown path {path}"})
+            return
+        if not self._admit():
+            self._fail(handler)
+            return
+        query = str(body.get("query", ""))
+        text = _filler(self.profile.completion_tokens)
+        self._count_tokens(self.profile.completion_tokens)
+        delay = self._delay()
+        if self.profile.tokens_per_sec > 0:
+            delay += self.profile.completion_tokens / self.profile.tokens_per_sec
+        time.sleep(delay)
+        handler._json(200, {
+            "query": query,
+            "answer": text,
+            "results": [{"title": f"Source {i + 1}", "url": f"https://example.com/{i + 1}", "content": text[:200]} for i in range(3)],
+        })
@@ -0,0 +1,249 @@
+"""
+End-to-end benchmark of the ADDIE pipeline against local stand-in LLM and research servers.
+
+    python -m benchmarks.run --profile fast --modules 4 --repeat 3 --json bench.json
+
+Every scenario runs without checkpoints or response/research caches, so each run
+makes the full set of calls. Wall time, call counts, failures and throughput are reported
+per scenario (sync and async flavours of course generation and Develop, plus the DAG pipeline).
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, replace
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.fake_servers import PROFILES, FakeLLMServer, FakeResearchServer, Profile
+
+COURSE = {
+    "course_name": "Benchmark Course",
+    "course_description": "A stand-in course used to benchmark the generation pipeline end to end.",
+    "learning_objectives": "Measure wall time, Count calls, Compare sync and async modes",
+}
+
+SCENARIOS = ("sync_course", "async_course", "sync_develop", "async_develop", "async_pipeline")
+
+# Retries for the untimed warm-up run, whatever --retries says
+WARMUP_RETRIES = 3
+
+
+def _point_at(llm: FakeLLMServer, research: FakeResearchServer) -> None:
+    """Route src.* at the stand-ins. Must run before src is imported."""
+    os.environ["OPENAI_BASE_URL"] = llm.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["RESEARCHER_BASE_URL"] = research.url
+    for name in ("FAST_SEARCH_URL", "FAST_RESEARCH_URL", "LLM_CACHE_DIR", "RESEARCH_CACHE_DIR"):
+        os.environ.pop(name, None)
+
+
+def _build_addie(args: argparse.Namespace, retries: Optional[int] = None) -> Any:
+    from openai import AsyncOpenAI, OpenAI
+
+    from src.addie import ADDIE
+    from src.services.limiter import AdaptiveLimiter
+    from src.services.llm import wrap_clients
+    from src.services.metrics import metrics
+    from src.services.resilience import RetryPolicy
+
+    base_url = os.environ["OPENAI_BASE_URL"]
+    client = OpenAI(api_key="benchmark", base_url=base_url)
+    async_client = AsyncOpenAI(api_key="benchmark", base_url=base_url)
+    limiter = AdaptiveLimiter(max_limit=args.max_llm_calls) if args.max_llm_calls else None
+    retries = args.retries if retries is None else retries
+    retry = RetryPolicy(max_retries=retries) if retries else None
+    client, async_client = wrap_clients(client, async_client, limiter=limiter, retry=retry, metrics=metrics)
+    addie = ADDIE(client, async_client)
+    addie.design.local_module_parser = not args.llm_module_extraction
+    return addie
+
+
+def _scenarios(design: Dict[str, str], args: argparse.Namespace) -> Dict[str, Callable[[Any, str], Any]]:
+    develop_inputs = dict(COURSE, **design)
+
+    def _async(method: str, **kwargs: Any) -> Callable[[Any, str], Any]:
+        async def _call(addie: Any, checkpoint_dir: str) -> Any:
+            try:
+                return await getattr(addie, method)(**kwargs, use_checkpoint=False, checkpoint_dir=checkpoint_dir)
+            finally:
+                await addie.aclose()
+                await addie.develop.async_client.close()
+
+        return lambda addie, d: asyncio.run(_call(addie, d))
+
+    return {
+        "sync_course": lambda addie, d: addie.generate_course(
+            **COURSE, use_checkpoint=False, checkpoint_dir=d, max_workers=args.workers
+        ),
+        "async_course": _async("async_generate_course", **COURSE, max_concurrency=args.concurrency),
+        "sync_develop": lambda addie, d: addie.develop_modules_materials(
+            **develop_inputs, use_checkpoint=False, checkpoint_dir=d, max_workers=args.workers
+        ),
+        "async_develop": _async("async_develop_modules_materials", **develop_inputs, max_concurrency=args.concurrency),
+        "async_pipeline": _async("async_run_pipeline", **COURSE, max_concurrency=args.concurrency),
+    }
+
+
+def _errors(result: Any) -> List[str]:
+    """Failures the pipeline reported instead of raising (per-module or per-stage)."""
+    if isinstance(result, list):
+        return [str(item["error"]) for item in result if isinstance(item, dict) and item.get("error")]
+    if isinstance(result, dict):
+        return [f"{name}: {error}" for name, error in (result.get("errors") or {}).items()]
+    return []
+
+
+def _run_once(
+    fn: Callable[[Any, str], Any], args: argparse.Namespace, llm: FakeLLMServer, research: FakeResearchServer
+) -> Dict[str, Any]:
+    from src.services.metrics import metrics
+
+    # Fresh clients per run: AsyncOpenAI's connection pool is bound to the event loop of the
+    # asyncio.run that first used it
+    addie = _build_addie(args)
+
+    llm.reset()
+    research.reset()
+    metrics.reset()
+    workdir = tempfile.mkdtemp(prefix="addie-bench-")
+    start = time.perf_counter()
+    error = None
+    try:
+        reported = _errors(fn(addie, workdir))
+        if reported:
+            error = f"{len(reported)} failed: {reported[0]}"
+    except Exception as exc:
+        error = repr(exc)
+    wall = time.perf_counter() - start
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    llm_stats, research_stats = llm.stats(), research.stats()
+    llm_latency = metrics.summary()["totals"].get("llm", {})
+    return {
+        "wall_seconds": round(wall, 3),
+        "llm_requests": llm_stats["requests"],
+        "llm_failures": llm_stats["failures"],
+        "research_requests": research_stats["requests"],
+        "research_failures": research_stats["failures"],
+        "completion_tokens": llm_stats["completion_tokens"],
+        "prompt_tokens": llm_latency.get("prompt_tokens", 0),
+        "cached_tokens": llm_latency.get("cached_tokens", 0),
+        "cached_ratio": llm_latency.get("cached_ratio") or 0.0,
+        "llm_calls_per_sec": round(llm_stats["requests"] / wall, 2) if wall else 0.0,
+        "tokens_per_sec": round(llm_stats["completion_tokens"] / wall, 1) if wall else 0.0,
+        "llm_latency_p50": llm_latency.get("latency_p50", 0.0),
+        "llm_latency_p95": llm_latency.get("latency_p95", 0.0),
+        "error": error,
+    }
+
+
+def _summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of each numeric field over the repeats; the first error, if any."""
+    summary: Dict[str, Any] = {"runs": len(runs)}
+    for field, value in runs[0].items():
+        if isinstance(value, (int, float)):
+            summary[field] = statistics.median(run[field] for run in runs)
+    summary["wall_seconds_min"] = min(run["wall_seconds"] for run in runs)
+    summary["error"] = next((run["error"] for run in runs if run["error"]), None)
+    return summary
+
+
+def _print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    columns = [
+        ("scenario", "{:<15}"),
+        ("wall_seconds", "{:>8.2f}"),
+        ("llm_requests", "{:>6.0f}"),
+        ("research_requests", "{:>6.0f}"),
+        ("llm_failures", "{:>6.0f}"),
+        ("llm_calls_per_sec", "{:>8.2f}"),
+        ("tokens_per_sec", "{:>9.1f}"),
+        ("cached_ratio", "{:>7.1%}"),
+        ("llm_latency_p95", "{:>7.3f}"),
+    ]
+    headers = ["scenario", "wall s", "llm", "search", "fail", "calls/s", "tok/s", "cached", "p95 s"]
+    widths = [15, 8, 6, 6, 6, 8, 9, 7, 7]
+    print("  ".join(h.rjust(w) if i else h.ljust(w) for i, (h, w) in enumerate(zip(headers, widths))))
+    for name, summary in results.items():
+        row = dict(summary, scenario=name)
+        print("  ".join(fmt.format(row[field]) for field, fmt in columns) + (f"  ERROR {row['error']}" if row["error"] else ""))
+
+
+def _profile(base: Profile, latency: Optional[float], tokens_per_sec: Optional[float], failure_rate: Optional[float]) -> Profile:
+    overrides = {"latency": latency, "tokens_per_sec": tokens_per_sec, "failure_rate": failure_rate}
+    return replace(base, **{k: v for k, v in overrides.items() if v is not None})
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Benchmark ADDIE against local stand-in LLM and research servers.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast", help="Latency/token-rate/failure preset")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--modules", type=int, default=3, help="Modules the stand-in LLM returns on extraction")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario (medians are reported)")
+    parser.add_argument("--workers", type=int, default=4, help="Thread pool size for the sync paths")
+    parser.add_argument("--concurrency", type=int, default=8, help="max_concurrency for the async paths")
+    parser.add_argument("--max-llm-calls", type=int, default=0, help="Wrap the clients in an AIMD limiter capped here")
+    parser.add_argument("--retries", type=int, default=0, help="Wrap the clients in a RetryPolicy with this many retries")
+    parser.add_argument("--llm-latency", type=float, default=None, help="Override the LLM time to first token (s)")
+    parser.add_argument("--llm-tokens-per-sec", type=float, default=None, help="Override the LLM token rate")
+    parser.add_argument("--llm-failure-rate", type=float, default=None, help="Override the LLM failure rate (0-1)")
+    parser.add_argument("--research-latency", type=float, default=None, help="Override the research latency (s)")
+    parser.add_argument("--research-failure-rate", type=float, default=None, help="Override the research failure rate (0-1)")
+    parser.add_argument("--llm-module-extraction", action="store_true", help="Always split modules with the LLM extractor")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and failures")
+    parser.add_argument("--json", default=None, help="Also write the results here")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    preset = PROFILES[args.profile]
+    llm_profile = _profile(preset["llm"], args.llm_latency, args.llm_tokens_per_sec, args.llm_failure_rate)
+    research_profile = _profile(preset["research"], args.research_latency, None, args.research_failure_rate)
+
+    with FakeLLMServer(llm_profile, modules=args.modules, seed=args.seed) as llm, \
+            FakeResearchServer(research_profile, seed=args.seed + 1) as research:
+        _point_at(llm, research)
+        # The warm-up is not timed, so it always retries: a flaky profile without --retries
+        # should fail inside the scenarios it measures, not abort the benchmark up front
+        addie = _build_addie(args, retries=max(args.retries, WARMUP_RETRIES))
+
+        # Design inputs for the Develop scenarios, produced once outside the timed runs
+        warmup = tempfile.mkdtemp(prefix="addie-bench-")
+        try:
+            course = addie.generate_course(**COURSE, use_checkpoint=False, checkpoint_dir=warmup, max_workers=args.workers)
+        except Exception as exc:
+            parser.exit(1, f"benchmark warm-up failed, no design to develop from: {exc!r}\n")
+        finally:
+            shutil.rmtree(warmup, ignore_errors=True)
+        design = {key: course["design"][key] for key in ("syllabus", "slides_plan", "assessment_plan")}
+
+        scenarios = _scenarios(design, args)
+        results = {}
+        for name in names:
+            runs = [_run_once(scenarios[name], args, llm, research) for _ in range(max(1, args.repeat))]
+            results[name] = _summarize(runs)
+
+    _print_table(results)
+    report = {
+        "profile": args.profile,
+        "llm_profile": asdict(llm_profile),
+        "research_profile": asdict(research_profile),
+        "modules": args.modules,
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
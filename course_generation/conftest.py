@@ -0,0 +1,6 @@
+import os
+
+# src.services.llm builds the default clients at import time; tests pass their own stub clients
+os.environ.setdefault("OPENAI_API_KEY", "test")
+for name in ("CASSETTE", "LLM_CACHE_DIR", "RESEARCH_CACHE_DIR"):
+    os.environ.pop(name, None)
@@ -1,8 +1,16 @@
+import os
+
 from dotenv import load_dotenv
 
 load_dotenv()
 from src.addie import ADDIE
 
+# Record the LLM and research traffic once, then replay it offline in seconds. Checkpoints are
+# turned off so every stage runs again against the cassette:
+#   CASSETTE=runs/marketing.jsonl.gz CASSETTE_MODE=record USE_CHECKPOINT=0 python main.py
+#   CASSETTE=runs/marketing.jsonl.gz CASSETTE_MODE=replay USE_CHECKPOINT=0 python main.py
+use_checkpoint = os.getenv("USE_CHECKPOINT", "1") != "0"
+
 addie = ADDIE()
 # result = addie.generate_course(
 #     course_name="Agile and Scrum",
@@ -28,7 +36,7 @@ course_result = addie.generate_course(
     course_description="This course provides non-marketing professionals with a comprehensive understanding of fundamental marketing concepts, strategies, and tools to enhance their ability to contribute to marketing efforts within their organizations.",
     learning_objectives="Understand basic marketing principles, Learn about market research and consumer behavior, Develop skills in digital marketing and social media strategies",
     do_research=True,
-    use_checkpoint=True
+    use_checkpoint=use_checkpoint
 )
 
 modules = addie.develop_modules_materials(
@@ -36,7 +44,8 @@ modules = addie.develop_modules_materials(
     course_description="This course provides non-marketing professionals with a comprehensive understanding of fundamental marketing concepts, strategies, and tools to enhance their ability to contribute to marketing efforts within their organizations.",
     learning_objectives="Understand basic marketing principles, Learn about market research and consumer behavior, Develop skills in digital marketing and social media strategies",
     do_research=True,
-    use_checkpoint=True
+    use_checkpoint=use_checkpoint,
+    max_workers=4,
 )
 
 
@@ -1,16 +1,46 @@
 from src.services.llm import client, async_client
-from src.utils import fast_search, async_fast_search
-from typing import Optional, Dict
+from src.utils import fast_search, async_fast_search, close_async_research_client
+from typing import Optional, Dict, List
 # New imports for checkpointing
 import os
 import json
 import hashlib
 import asyncio
+import time
 from typing import Any
 
 from src.analyze import Analyze
+from src.checkpoint import CheckpointStore, MarkdownStore, atomic_write, stage_key
+from src.concurrency import format_errors, gather_bounded, run_threaded
 from src.design import Design
 from src.develop import Develop
+from src.pipeline import Scheduler, course_graph
+from src.services.metrics import metric_labels
+
+# Course-level artifacts, in generation order, and their checkpoint files
+COURSE_FILES = {
+    "shared_context": "shared_context.md",
+    "objectives": "objectives.md",
+    "audience": "audience.md",
+    "resources": "resources.md",
+    "combined": "analysis_combined.md",
+    "syllabus": "syllabus.md",
+    "slides_plan": "slides_plan.md",
+    "assessment_plan": "assessment_plan.md",
+}
+ANALYSIS_ARTIFACTS = ("objectives", "audience", "resources")
+DESIGN_ARTIFACTS = ("syllabus", "slides_plan", "assessment_plan")
+# Artifacts each course stage is built from; their content is part of the stage's checkpoint key
+COURSE_STAGE_INPUTS = {
+    "shared_context": (),
+    "objectives": ("shared_context",),
+    "audience": ("shared_context",),
+    "resources": ("shared_context",),
+    "combined": ANALYSIS_ARTIFACTS,
+    "syllabus": ("combined",),
+    "slides_plan": ("combined",),
+    "assessment_plan": ("combined",),
+}
         
 
 
@@ -20,13 +50,28 @@ class ADDIE:
     Full ADDIE model for course generation.
     Combines Analyze, Design, and Develop phases.
     """
-    def __init__(self, client = client, async_client = async_client, checkpoint_dir: Optional[str] = None):
+    def __init__(
+        self,
+        client = client,
+        async_client = async_client,
+        checkpoint_dir: Optional[str] = None,
+        verify_checkpoints: bool = True,
+        checkpoint_store: Optional[CheckpointStore] = None,
+    ):
+        # New: where checkpoints live; markdown files + manifest by default (see src/checkpoint.py).
+        # verify_checkpoints hash-checks artifacts before reusing them.
+        self.verify_checkpoints = verify_checkpoints
+        self.store = checkpoint_store or MarkdownStore(verify=verify_checkpoints)
         self.analyze = Analyze(client, async_client)
-        self.design = Design(client, async_client)
-        self.develop = Develop(client, async_client)
+        self.design = Design(client, async_client, checkpoint_store=self.store)
+        self.develop = Develop(client, async_client, checkpoint_store=self.store)
         # New: checkpoint directory
         self.checkpoint_dir = checkpoint_dir or ".addie_checkpoints"
 
+    async def aclose(self) -> None:
+        """Close the pooled research connections shared by the async Analyze and Develop calls."""
+        await close_async_research_client()
+
     # New: checkpoint helpers
     def _make_checkpoint_key(
         self,
@@ -79,12 +124,10 @@ class ADDIE:
         return s[:80] or "course"
 
     def _course_dir(self, course_name: str, key: str, checkpoint_dir: Optional[str] = None) -> str:
+        # Location only: the checkpoint store creates directories when it writes
         base = checkpoint_dir or self.checkpoint_dir
-        os.makedirs(base, exist_ok=True)
         folder = f"{self._sanitize_course_name(course_name)}-{key}"
-        path = os.path.join(base, folder)
-        os.makedirs(path, exist_ok=True)
-        return path
+        return os.path.join(base, folder)
 
     def _read_md(self, path: str) -> Optional[str]:
         if os.path.exists(path):
@@ -96,11 +139,100 @@ class ADDIE:
         return None
 
     def _write_md(self, path: str, content: str) -> None:
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(str(content or ""))
-        except Exception:
-            pass
+        # Temp file + rename, so a crash never leaves a half-written artifact behind
+        atomic_write(path, str(content or ""))
+
+    def _course_fingerprint(self, name: str) -> str:
+        if name == "shared_context":
+            return self.analyze.stage_fingerprint("research")
+        if name in ANALYSIS_ARTIFACTS or name == "combined":
+            return self.analyze.stage_fingerprint(name)
+        return self.design.stage_fingerprint(name)
+
+    def _course_stage_key(self, name: str, done: Dict[str, str]) -> str:
+        """Stage key: the stage's prompt/model/sampling fingerprint plus the content of its inputs."""
+        return stage_key(self._course_fingerprint(name), [done[dep] for dep in COURSE_STAGE_INPUTS[name]])
+
+    def _reuse_course_artifact(self, course_path: str, name: str, done: Dict[str, str], use_checkpoint: bool = True) -> bool:
+        """
+        True if `name` is available: already in `done`, or checkpointed under the stage key its
+        current inputs give (then it is loaded into `done`). Checkpoints that fail their
+        size/hash check or were built with another template, model or sampling params are not
+        reused. Empty artifacts are ignored, except shared_context (empty when research is off).
+        """
+        if name in done:
+            return True
+        if not use_checkpoint or any(dep not in done for dep in COURSE_STAGE_INPUTS[name]):
+            return False
+        content = self.store.read(course_path, COURSE_FILES[name], key=self._course_stage_key(name, done))
+        if content is None or not (content.strip() or name == "shared_context"):
+            return False
+        done[name] = content
+        return True
+
+    def _load_course_artifacts(self, course_path: str) -> Dict[str, str]:
+        """Every checkpointed course artifact that is still valid, checked in dependency order."""
+        done: Dict[str, str] = {}
+        for name in COURSE_FILES:
+            self._reuse_course_artifact(course_path, name, done)
+        return done
+
+    def _course_saver(self, course_path: str, done: Dict[str, str], use_checkpoint: bool, timings: Dict[str, float]):
+        """
+        Callback recording an artifact and checkpointing it (with its stage key) immediately.
+        Artifacts downstream of a regenerated one are dropped from `done`, make-style, so they
+        are only reused if their checkpoint still matches the new input.
+        """
+        def _save(name: str, content: str) -> None:
+            stale = {name}
+            for stage, inputs in COURSE_STAGE_INPUTS.items():
+                if stale.intersection(inputs):
+                    stale.add(stage)
+                    done.pop(stage, None)
+            done[name] = content
+            if use_checkpoint:
+                model = None
+                if name in ANALYSIS_ARTIFACTS:
+                    model = self.analyze.model
+                elif name in DESIGN_ARTIFACTS:
+                    model = self.design.model
+                self.store.write(
+                    course_path, COURSE_FILES[name], content, artifact=name, model=model,
+                    elapsed=timings.get(name), key=self._course_stage_key(name, done),
+                )
+        return _save
+
+    def _timed(self, timings: Dict[str, float], name: str, fn):
+        """Wrap a zero-arg call so its duration is recorded under `name` and its LLM/research calls are labelled with it."""
+        def _call():
+            start = time.monotonic()
+            try:
+                with metric_labels(stage=name):
+                    return fn()
+            finally:
+                timings[name] = time.monotonic() - start
+        return _call
+
+    def _async_timed(self, timings: Dict[str, float], name: str, fn):
+        async def _call():
+            start = time.monotonic()
+            try:
+                with metric_labels(stage=name):
+                    return await fn()
+            finally:
+                timings[name] = time.monotonic() - start
+        return _call
+
+    def _course_result(self, done: Dict[str, str]) -> dict:
+        return {
+            "analysis": {
+                "objectives": done.get("objectives", ""),
+                "audience": done.get("audience", ""),
+                "resources": done.get("resources", ""),
+                "combined": done.get("combined", ""),
+            },
+            "design": {name: done.get(name, "") for name in DESIGN_ARTIFACTS},
+        }
 
     def generate_course(
         self,
@@ -110,85 +242,74 @@ class ADDIE:
         do_research: bool = True,
         use_checkpoint: bool = True,
         checkpoint_dir: Optional[str] = None,
+        max_workers: int = 3,
     ) -> dict:
         """
         Generate analysis and design parts separately and return a structured dict.
         Uses single-step research for aligned analysis when do_research=True.
-        Saves each artifact to Markdown in a course-named folder.
+        Each artifact (including the research context) is saved to Markdown in a course-named
+        folder as soon as it is produced and reused individually on restart, so only missing
+        artifacts and those whose stage key changed (template, model, sampling params or
+        inputs) are regenerated. Up to max_workers independent calls run in parallel threads.
         """
         key = self._make_checkpoint_key(course_name, course_description, learning_objectives, do_research, stage="parts")
         course_path = self._course_dir(course_name, key, checkpoint_dir)
-
-        # New: attempt to load all artifacts from .md files
-        if use_checkpoint:
-            files = {
-                "objectives": os.path.join(course_path, "objectives.md"),
-                "audience": os.path.join(course_path, "audience.md"),
-                "resources": os.path.join(course_path, "resources.md"),
-                "combined": os.path.join(course_path, "analysis_combined.md"),
-                "syllabus": os.path.join(course_path, "syllabus.md"),
-                "slides_plan": os.path.join(course_path, "slides_plan.md"),
-                "assessment_plan": os.path.join(course_path, "assessment_plan.md"),
+        done = self._load_course_artifacts(course_path) if use_checkpoint else {}
+        timings: Dict[str, float] = {}
+        save = self._course_saver(course_path, done, use_checkpoint, timings)
+        args = (course_name, course_description, learning_objectives)
+
+        # The three analyses only depend on the shared research context, so they run concurrently
+        missing = [name for name in ANALYSIS_ARTIFACTS if not self._reuse_course_artifact(course_path, name, done, use_checkpoint)]
+        if missing:
+            if "shared_context" not in done:
+                start = time.monotonic()
+                with metric_labels(stage="shared_context"):
+                    shared_context = self.analyze.build_shared_research_context(*args) if do_research else ""
+                timings["shared_context"] = time.monotonic() - start
+                save("shared_context", shared_context)
+                # Analyses checkpointed against an identical research context are still valid
+                missing = [name for name in missing if not self._reuse_course_artifact(course_path, name, done, use_checkpoint)]
+            analyses = {
+                "objectives": self.analyze.analyze_objectives,
+                "audience": self.analyze.analyze_audience,
+                "resources": self.analyze.analyze_resources,
             }
-            if all(os.path.exists(p) for p in files.values()):
-                return {
-                    "analysis": {
-                        "objectives": self._read_md(files["objectives"]) or "",
-                        "audience": self._read_md(files["audience"]) or "",
-                        "resources": self._read_md(files["resources"]) or "",
-                        "combined": self._read_md(files["combined"]) or "",
-                    },
-                    "design": {
-                        "syllabus": self._read_md(files["syllabus"]) or "",
-                        "slides_plan": self._read_md(files["slides_plan"]) or "",
-                        "assessment_plan": self._read_md(files["assessment_plan"]) or "",
-                    },
-                }
-
-        # ...existing generation flow...
-        if do_research:
-            aligned = self.analyze.analyze_all_aligned(
-                course_name, course_description, learning_objectives, do_research=True
+            _, errors = run_threaded(
+                {
+                    name: self._timed(
+                        timings, name,
+                        lambda name=name: analyses[name](*args, do_research=False, shared_context=done["shared_context"]),
+                    )
+                    for name in missing
+                },
+                max_workers=max_workers,
+                on_result=save,
             )
-            objectives = aligned["objectives"]
-            audience = aligned["audience"]
-            resources = aligned["resources"]
-            analysis_combined = aligned["combined"]
-        else:
-            objectives = self.analyze.analyze_objectives(course_name, course_description, learning_objectives, do_research=False)
-            audience = self.analyze.analyze_audience(course_name, course_description, learning_objectives, do_research=False)
-            resources = self.analyze.analyze_resources(course_name, course_description, learning_objectives, do_research=False)
-            analysis_combined = f"Objectives:\n{objectives}\n\nAudience:\n{audience}\n\nResources:\n{resources}"
-
-        syllabus = self.design.design_syllabus(analysis_combined)
-        slides_plan = self.design.plan_slides(analysis_combined)
-        assessment_plan = self.design.plan_assessments(analysis_combined)
-
-        result = {
-            "analysis": {
-                "objectives": objectives,
-                "audience": audience,
-                "resources": resources,
-                "combined": analysis_combined,
-            },
-            "design": {
-                "syllabus": syllabus,
-                "slides_plan": slides_plan,
-                "assessment_plan": assessment_plan,
-            },
+            if errors:
+                raise RuntimeError(f"Analysis failed for {course_name!r}: {format_errors(errors)}")
+        if not self._reuse_course_artifact(course_path, "combined", done, use_checkpoint):
+            save("combined", self.analyze.combine_analysis(done["objectives"], done["audience"], done["resources"]))
+
+        # The three design artifacts only need the combined analysis
+        analysis_combined = done["combined"]
+        designs = {
+            "syllabus": self.design.design_syllabus,
+            "slides_plan": self.design.plan_slides,
+            "assessment_plan": self.design.plan_assessments,
         }
+        _, errors = run_threaded(
+            {
+                name: self._timed(timings, name, lambda name=name: designs[name](analysis_combined))
+                for name in DESIGN_ARTIFACTS if not self._reuse_course_artifact(course_path, name, done, use_checkpoint)
+            },
+            max_workers=max_workers,
+            on_result=save,
+        )
+        if errors:
+            raise RuntimeError(f"Design failed for {course_name!r}: {format_errors(errors)}")
 
-        # New: save artifacts as .md
-        if use_checkpoint:
-            self._write_md(os.path.join(course_path, "objectives.md"), objectives)
-            self._write_md(os.path.join(course_path, "audience.md"), audience)
-            self._write_md(os.path.join(course_path, "resources.md"), resources)
-            self._write_md(os.path.join(course_path, "analysis_combined.md"), analysis_combined)
-            self._write_md(os.path.join(course_path, "syllabus.md"), syllabus)
-            self._write_md(os.path.join(course_path, "slides_plan.md"), slides_plan)
-            self._write_md(os.path.join(course_path, "assessment_plan.md"), assessment_plan)
-
-        return result
+        return self._course_result(done)
 
     async def async_generate_course(
         self,
@@ -198,88 +319,83 @@ class ADDIE:
         do_research: bool = True,
         use_checkpoint: bool = True,
         checkpoint_dir: Optional[str] = None,
+        max_concurrency: Optional[int] = 3,
+        allow_partial: bool = False,
     ) -> dict:
         """
         Async variant using single-step research for aligned analysis when do_research=True.
-        Saves each artifact to Markdown in a course-named folder.
+        Analysis and design calls each run concurrently (bounded by max_concurrency).
+        Each artifact is saved to Markdown as soon as it is produced and reused individually on
+        restart. With allow_partial=True a failed design call does not raise; the result then
+        carries an "errors" mapping and the failed artifacts are empty. Checkpoint writes run in
+        worker threads; a failed write raises CallbackError rather than failing its call.
         """
         key = self._make_checkpoint_key(course_name, course_description, learning_objectives, do_research, stage="parts")
         course_path = self._course_dir(course_name, key, checkpoint_dir)
-
-        # New: attempt to load all artifacts from .md files
-        if use_checkpoint:
-            files = {
-                "objectives": os.path.join(course_path, "objectives.md"),
-                "audience": os.path.join(course_path, "audience.md"),
-                "resources": os.path.join(course_path, "resources.md"),
-                "combined": os.path.join(course_path, "analysis_combined.md"),
-                "syllabus": os.path.join(course_path, "syllabus.md"),
-                "slides_plan": os.path.join(course_path, "slides_plan.md"),
-                "assessment_plan": os.path.join(course_path, "assessment_plan.md"),
+        done = self._load_course_artifacts(course_path) if use_checkpoint else {}
+        timings: Dict[str, float] = {}
+        save = self._course_saver(course_path, done, use_checkpoint, timings)
+        args = (course_name, course_description, learning_objectives)
+
+        missing = [name for name in ANALYSIS_ARTIFACTS if not self._reuse_course_artifact(course_path, name, done, use_checkpoint)]
+        if missing:
+            if "shared_context" not in done:
+                start = time.monotonic()
+                with metric_labels(stage="shared_context"):
+                    shared_context = await self.analyze.async_build_shared_research_context(*args) if do_research else ""
+                timings["shared_context"] = time.monotonic() - start
+                await asyncio.to_thread(save, "shared_context", shared_context)
+                # Analyses checkpointed against an identical research context are still valid
+                missing = [name for name in missing if not self._reuse_course_artifact(course_path, name, done, use_checkpoint)]
+            analyses = {
+                "objectives": self.analyze.async_analyze_objectives,
+                "audience": self.analyze.async_analyze_audience,
+                "resources": self.analyze.async_analyze_resources,
             }
-            if all(os.path.exists(p) for p in files.values()):
-                return {
-                    "analysis": {
-                        "objectives": self._read_md(files["objectives"]) or "",
-                        "audience": self._read_md(files["audience"]) or "",
-                        "resources": self._read_md(files["resources"]) or "",
-                        "combined": self._read_md(files["combined"]) or "",
-                    },
-                    "design": {
-                        "syllabus": self._read_md(files["syllabus"]) or "",
-                        "slides_plan": self._read_md(files["slides_plan"]) or "",
-                        "assessment_plan": self._read_md(files["assessment_plan"]) or "",
-                    },
-                }
-
-        # ...existing generation flow...
-        if do_research:
-            aligned = await self.analyze.async_analyze_all_aligned(
-                course_name, course_description, learning_objectives, do_research=True
+            _, errors = await gather_bounded(
+                {
+                    name: self._async_timed(
+                        timings, name,
+                        lambda name=name: analyses[name](*args, do_research=False, shared_context=done["shared_context"]),
+                    )
+                    for name in missing
+                },
+                max_concurrency=max_concurrency,
+                on_result=save,
             )
-            objectives = aligned["objectives"]
-            audience = aligned["audience"]
-            resources = aligned["resources"]
-            analysis_combined = aligned["combined"]
-        else:
-            objectives = await self.analyze.async_analyze_objectives(course_name, course_description, learning_objectives, do_research=False)
-            # Fixed: call async analysis on self.analyze
-            audience = await self.analyze.async_analyze_audience(course_name, course_description, learning_objectives, do_research=False)
-            resources = await self.analyze.async_analyze_resources(course_name, course_description, learning_objectives, do_research=False)
-            analysis_combined = f"Objectives:\n{objectives}\n\nAudience:\n{audience}\n\nResources:\n{resources}"
-
-        syllabus = await self.design.async_design_syllabus(analysis_combined)
-        slides_plan = await self.design.async_plan_slides(analysis_combined)
-        assessment_plan = await self.design.async_plan_assessments(analysis_combined)
-
-        result = {
-            "analysis": {
-                "objectives": objectives,
-                "audience": audience,
-                "resources": resources,
-                "combined": analysis_combined,
-            },
-            "design": {
-                "syllabus": syllabus,
-                "slides_plan": slides_plan,
-                "assessment_plan": assessment_plan,
-            },
+            if errors:
+                raise RuntimeError(f"Analysis failed for {course_name!r}: {format_errors(errors)}")
+        if not self._reuse_course_artifact(course_path, "combined", done, use_checkpoint):
+            combined = self.analyze.combine_analysis(done["objectives"], done["audience"], done["resources"])
+            await asyncio.to_thread(save, "combined", combined)
+
+        # The three design artifacts only need analysis_combined: run the missing ones
+        # concurrently and checkpoint each one as soon as it finishes
+        analysis_combined = done["combined"]
+        designs = {
+            "syllabus": self.design.async_design_syllabus,
+            "slides_plan": self.design.async_plan_slides,
+            "assessment_plan": self.design.async_plan_assessments,
         }
+        _, design_errors = await gather_bounded(
+            {
+                name: self._async_timed(timings, name, lambda name=name: designs[name](analysis_combined))
+                for name in DESIGN_ARTIFACTS if not self._reuse_course_artifact(course_path, name, done, use_checkpoint)
+            },
+            max_concurrency=max_concurrency,
+            on_result=save,
+        )
+        if design_errors and not allow_partial:
+            raise RuntimeError(f"Design failed for {course_name!r}: {format_errors(design_errors)}")
 
-        # New: save artifacts as .md
-        if use_checkpoint:
-            self._write_md(os.path.join(course_path, "objectives.md"), objectives)
-            self._write_md(os.path.join(course_path, "audience.md"), audience)
-            self._write_md(os.path.join(course_path, "resources.md"), resources)
-            self._write_md(os.path.join(course_path, "analysis_combined.md"), analysis_combined)
-            self._write_md(os.path.join(course_path, "syllabus.md"), syllabus)
-            self._write_md(os.path.join(course_path, "slides_plan.md"), slides_plan)
-            self._write_md(os.path.join(course_path, "assessment_plan.md"), assessment_plan)
+        result = self._course_result(done)
+        if design_errors:
+            # Partial result: completed artifacts are already checkpointed, failed ones are left out
+            result["errors"] = {name: str(exc) for name, exc in design_errors.items()}
 
         return result
     
     
-
     def develop_modules_materials(
         self,
         course_name: str,
@@ -291,11 +407,15 @@ class ADDIE:
         do_research: bool = True,
         use_checkpoint: bool = True,
         checkpoint_dir: Optional[str] = None,
-    ) -> str:
+        max_workers: int = 1,
+    ) -> List[Dict[str, str]]:
         """
         Build a Module Design (the 'design' input for Develop phase) by reading syllabus, slides_plan,
         and assessment_plan. Falls back to generate_course if those artifacts are missing.
         Saves result as module_design-<module>.md in the course folder.
+        With max_workers > 1 modules are developed on a thread pool over the shared sync client.
+        Results are returned in module order, one dict per module with its "title"; a module that
+        fails carries an "error" entry instead of aborting the others.
         """
         key = self._make_checkpoint_key(course_name, course_description, learning_objectives, do_research, stage="parts")
         course_path = self._course_dir(course_name, key, checkpoint_dir)
@@ -304,7 +424,7 @@ class ADDIE:
         def _read_or_value(value: Optional[str], filename: str) -> Optional[str]:
             if value and value.strip():
                 return value
-            return self._read_md(os.path.join(course_path, filename))
+            return self.store.read(course_path, filename)
 
         syllabus_text = _read_or_value(syllabus, "syllabus.md")
         slides_text = _read_or_value(slides_plan, "slides_plan.md")
@@ -312,7 +432,7 @@ class ADDIE:
 
         # If any input missing, generate course artifacts first
         if not all([syllabus_text, slides_text, assessment_text]):
-            _ = self.generate_course(
+            course = self.generate_course(
                 course_name=course_name,
                 course_description=course_description,
                 learning_objectives=learning_objectives,
@@ -320,53 +440,55 @@ class ADDIE:
                 use_checkpoint=use_checkpoint,
                 checkpoint_dir=checkpoint_dir,
             )
-            syllabus_text = self._read_md(os.path.join(course_path, "syllabus.md")) or ""
-            slides_text = self._read_md(os.path.join(course_path, "slides_plan.md")) or ""
-            assessment_text = self._read_md(os.path.join(course_path, "assessment_plan.md")) or ""
+            syllabus_text = course["design"]["syllabus"]
+            slides_text = course["design"]["slides_plan"]
+            assessment_text = course["design"]["assessment_plan"]
 
         # Seperate modules design from above syllabus, slides, assessment
-        modules = self.design.extract_modules_from_design_output(
-            syllabus_text, slides_text, assessment_text
-        )
+        with metric_labels(stage="modules"):
+            modules = self.design.extract_modules_from_design_output(
+                syllabus_text, slides_text, assessment_text
+            )
+
+        # Generate Modules Design via Develop, on up to max_workers threads sharing the sync client.
+        designs = [self._module_design(module) for module in modules]
+        module_paths = [self._module_dir(course_path, module["title"]) for module in modules]
+        owners = self._module_owners(modules, designs)
 
-        # Generate Modules Design via Develop
-        modules_materials = []  # ensure defined even if not found
-        for module in modules:
-            # Create module checkpoint dir
-            module_path = os.path.join(course_path, module["title"])
-            if not os.path.exists(module_path):
-                os.makedirs(module_path, exist_ok=True)
-
-            # Generate Module materials
-            module_materials = self.develop.develop_module(
-                module_title=module["title"],
-                design = f"Syllabus:\n{module['script']}\n\nSlides Plan:\n{module['slides_plan']}\n\nAssessment Plan:\n{module['assessment_plan']}",
+        def _develop(i: int) -> Dict[str, str]:
+            return self.develop.develop_module(
+                module_title=modules[i]["title"],
+                design=designs[i],
                 course_name=course_name,
                 do_research=do_research,
                 use_checkpoint=use_checkpoint,
-                checkpoint_dir=module_path,
+                checkpoint_dir=module_paths[i],
             )
-            modules_materials.append(module_materials)
 
-
-        return modules_materials
+        calls = {str(i): (lambda i=i: _develop(i)) for i in sorted(set(owners))}
+        results, errors = run_threaded(calls, max_workers=max_workers)
+        return self._collect_module_materials(modules, owners, results, errors)
 
     async def async_develop_modules_materials(
         self,
         course_name: str,
         course_description: str,
         learning_objectives: str,
-        module_title: str,
+        module_title: Optional[str] = None,
         syllabus: Optional[str] = None,
         slides_plan: Optional[str] = None,
         assessment_plan: Optional[str] = None,
         do_research: bool = True,
         use_checkpoint: bool = True,
         checkpoint_dir: Optional[str] = None,
-    ) -> str:
+        max_concurrency: Optional[int] = 4,
+    ) -> List[Dict[str, str]]:
         """
         Async variant. Builds a Module Design (the 'design' input for Develop phase) by reading syllabus,
         slides_plan, and assessment_plan. Falls back to async_generate_course if missing. Saves to .md.
+        Modules are developed concurrently (at most max_concurrency at a time) and returned in module
+        order, one dict per module with its "title". A module that fails carries an "error" entry
+        instead of aborting the others. Pass module_title to develop a single module.
         """
         key = self._make_checkpoint_key(course_name, course_description, learning_objectives, do_research, stage="parts")
         course_path = self._course_dir(course_name, key, checkpoint_dir)
@@ -374,14 +496,14 @@ class ADDIE:
         def _read_or_value(value: Optional[str], filename: str) -> Optional[str]:
             if value and value.strip():
                 return value
-            return self._read_md(os.path.join(course_path, filename))
+            return self.store.read(course_path, filename)
 
         syllabus_text = _read_or_value(syllabus, "syllabus.md")
         slides_text = _read_or_value(slides_plan, "slides_plan.md")
         assessment_text = _read_or_value(assessment_plan, "assessment_plan.md")
 
         if not all([syllabus_text, slides_text, assessment_text]):
-            _ = await self.async_generate_course(
+            course = await self.async_generate_course(
                 course_name=course_name,
                 course_description=course_description,
                 learning_objectives=learning_objectives,
@@ -389,34 +511,133 @@ class ADDIE:
                 use_checkpoint=use_checkpoint,
                 checkpoint_dir=checkpoint_dir,
             )
-            syllabus_text = self._read_md(os.path.join(course_path, "syllabus.md")) or ""
-            slides_text = self._read_md(os.path.join(course_path, "slides_plan.md")) or ""
-            assessment_text = self._read_md(os.path.join(course_path, "assessment_plan.md")) or ""
-
-        # Seperate modules design from above syllabus, slides, assessment
-        modules = self.design.extract_modules_from_design_output(
-            syllabus_text, slides_text, assessment_text
-        )
-
-        # Generate Modules Design via Develop (async)
-        modules_materials = []
-        for module in modules:
-            module_path = os.path.join(course_path, module["title"])
-            if not os.path.exists(module_path):
-                os.makedirs(module_path, exist_ok=True)
-
-            module_materials = await self.develop.async_develop_module(
-                module_title=module["title"],
-                design = f"Syllabus:\n{module['script']}\n\nSlides Plan:\n{module['slides_plan']}\n\nAssessment Plan:\n{module['assessment_plan']}",
+            syllabus_text = course["design"]["syllabus"]
+            slides_text = course["design"]["slides_plan"]
+            assessment_text = course["design"]["assessment_plan"]
+
+        # Seperate modules design from above syllabus, slides, assessment (sync client, keep the loop free)
+        with metric_labels(stage="modules"):
+            modules = await asyncio.to_thread(
+                self.design.extract_modules_from_design_output, syllabus_text, slides_text, assessment_text
+            )
+        if module_title:
+            modules = [m for m in modules if m["title"] == module_title]
+
+        # Generate Modules Design via Develop (async), up to max_concurrency modules at a time
+        designs = [self._module_design(module) for module in modules]
+        module_paths = [self._module_dir(course_path, module["title"]) for module in modules]
+        owners = self._module_owners(modules, designs)
+
+        async def _develop(i: int) -> Dict[str, str]:
+            return await self.develop.async_develop_module(
+                module_title=modules[i]["title"],
+                design=designs[i],
                 course_name=course_name,
                 do_research=do_research,
                 use_checkpoint=use_checkpoint,
-                checkpoint_dir=module_path,
+                checkpoint_dir=module_paths[i],
             )
-            modules_materials.append(module_materials)
 
-        return module_materials
-    
+        calls = {str(i): (lambda i=i: _develop(i)) for i in sorted(set(owners))}
+        results, errors = await gather_bounded(calls, max_concurrency=max_concurrency)
+        return self._collect_module_materials(modules, owners, results, errors)
+
+    async def async_run_pipeline(
+        self,
+        course_name: str,
+        course_description: str,
+        learning_objectives: str,
+        do_research: bool = True,
+        use_checkpoint: bool = True,
+        checkpoint_dir: Optional[str] = None,
+        develop: bool = True,
+        max_concurrency: Optional[int] = 8,
+        research_concurrency: Optional[int] = 4,
+    ) -> Dict[str, Any]:
+        """
+        Generate the course (and, with develop=True, every module's materials) as a dependency
+        graph: each stage starts as soon as its inputs exist, e.g. a module's script starts
+        while other modules are still being researched. At most max_concurrency LLM stages and
+        research_concurrency research calls run at once. Checkpoints use the same files as
+        generate_course / develop_modules_materials. Failures are reported under "errors"
+        (stage name -> message) and only block the stages that depend on them.
+        """
+        key = self._make_checkpoint_key(course_name, course_description, learning_objectives, do_research, stage="parts")
+        course_path = self._course_dir(course_name, key, checkpoint_dir)
+        nodes = course_graph(
+            self, course_name, course_description, learning_objectives, course_path,
+            do_research=do_research, develop=develop,
+        )
+        scheduler = Scheduler(
+            limits={"llm": max_concurrency, "research": research_concurrency},
+            use_checkpoint=use_checkpoint,
+            store=self.store,
+        )
+        run = await scheduler.run(nodes)
+        artifacts = run.artifacts
+
+        result: Dict[str, Any] = {
+            "analysis": {
+                "objectives": artifacts.get("objectives", ""),
+                "audience": artifacts.get("audience", ""),
+                "resources": artifacts.get("resources", ""),
+                "combined": artifacts.get("analysis_combined", ""),
+            },
+            "design": {
+                name: artifacts.get(name, "") for name in ("syllabus", "slides_plan", "assessment_plan")
+            },
+            "errors": {name: f"{type(exc).__name__}: {exc}" for name, exc in run.errors.items()},
+            "blocked": run.blocked,
+            "timings": run.timings,
+        }
+        if develop and "modules" in artifacts:
+            modules = artifacts["modules"]
+            owners = self._module_owners(modules, [self._module_design(m) for m in modules])
+            materials = []
+            for module, owner in zip(modules, owners):
+                names = {a: f"{a}:{owner}" for a in ("script", "slides", "assessment", "combined", "shared_context")}
+                if all(name in artifacts for name in names.values()):
+                    materials.append({"title": module["title"], **{a: artifacts[n] for a, n in names.items()}})
+                else:
+                    failed = [f"{n}: {result['errors'][n]}" for n in result["errors"] if n.endswith(f":{owner}")]
+                    materials.append({"title": module["title"], "error": "; ".join(failed) or "not completed"})
+            result["modules"] = materials
+        return result
+
+    # Module helpers shared by the sync and async develop paths
+    def _module_dir(self, course_path: str, module_title: str) -> str:
+        return os.path.join(course_path, module_title)
+
+    def _module_design(self, module: Dict[str, str]) -> str:
+        return f"Syllabus:\n{module['script']}\n\nSlides Plan:\n{module['slides_plan']}\n\nAssessment Plan:\n{module['assessment_plan']}"
+
+    def _module_owners(self, modules: List[Dict[str, str]], designs: List[str]) -> List[int]:
+        """
+        Map each module position to the first position with the same title and design.
+        Duplicates share one develop call, so concurrent workers never write the same checkpoint files.
+        """
+        first_seen: Dict[tuple, int] = {}
+        return [first_seen.setdefault((module["title"], design), i) for i, (module, design) in enumerate(zip(modules, designs))]
+
+    def _collect_module_materials(
+        self,
+        modules: List[Dict[str, str]],
+        owners: List[int],
+        results: Dict[str, Dict[str, str]],
+        errors: Dict[str, Exception],
+    ) -> List[Dict[str, str]]:
+        """
+        Order per-module outcomes by module position. Failed modules are reported as
+        {"title": ..., "error": ...} instead of aborting the whole course.
+        """
+        materials = []
+        for module, owner in zip(modules, owners):
+            if str(owner) in errors:
+                exc = errors[str(owner)]
+                materials.append({"title": module["title"], "error": f"{type(exc).__name__}: {exc}"})
+            else:
+                materials.append({"title": module["title"], **results[str(owner)]})
+        return materials
 
     # Deprecated wrappers for backward compatibility
     def generate_chapter_design(self, *args, **kwargs) -> str:
@@ -1,6 +1,10 @@
-from src.services.llm import client, async_client
+from src.services.llm import client, async_client, MODEL
 from src.utils import fast_search, async_fast_search
-from typing import Optional, Dict
+from src.concurrency import gather_bounded, run_threaded
+from src.compaction import compact_context
+from src.checkpoint import config_hash
+from src.prompts import Prompt, build_prompt
+from typing import Any, Optional, Dict
 
 class Analyze:
     """
@@ -11,9 +15,26 @@ class Analyze:
     - Resource assessment 
     """
     
-    def __init__(self, client = client, async_client = async_client):
+    def __init__(
+        self,
+        client = client,
+        async_client = async_client,
+        compact_research: bool = True,
+        context_token_budget: Optional[int] = 1200,
+    ):
         self.client = client
         self.async_client = async_client
+        # New: research context is compacted per artifact before prompt injection
+        self.compact_research = compact_research
+        self.context_token_budget = context_token_budget
+        # New: model and per-stage sampling params (both part of each stage's checkpoint key)
+        self.model = MODEL
+        self.sampling: Dict[str, Dict[str, Any]] = {
+            "course": {"max_tokens": 5000, "temperature": 0.7},
+            "objectives": {"max_tokens": 5000, "temperature": 0.5},
+            "audience": {"max_tokens": 5000, "temperature": 0.5},
+            "resources": {"max_tokens": 5000, "temperature": 0.5},
+        }
         
         # Predefined outline templates
         self.objectives_template = """
@@ -138,6 +159,15 @@ class Analyze:
 {self.resources_template}
 """
 
+    def _research_query(self, course_name: str, course_description: str, learning_objectives: str) -> str:
+        return f"""
+        Research to inform Objectives, Audience, and Resource assessment for a course.
+        Course Name: {course_name}
+        Course Description: {course_description}
+        Initial Learning Objectives: {learning_objectives}
+        Include: domain trends, learner personas, prerequisite skills, common pitfalls, accessibility, tooling/platforms, datasets, standards, and best practices.
+        """
+
     # Single-step research to align all analysis attributes
     def build_shared_research_context(
         self,
@@ -145,14 +175,7 @@ class Analyze:
         course_description: str,
         learning_objectives: str,
     ) -> str:
-        query = f"""
-        Research to inform Objectives, Audience, and Resource assessment for a course.
-        Course Name: {course_name}
-        Course Description: {course_description}
-        Initial Learning Objectives: {learning_objectives}
-        Include: domain trends, learner personas, prerequisite skills, common pitfalls, accessibility, tooling/platforms, datasets, standards, and best practices.
-        """
-        return fast_search(query)
+        return fast_search(self._research_query(course_name, course_description, learning_objectives))
 
     async def async_build_shared_research_context(
         self,
@@ -160,14 +183,17 @@ class Analyze:
         course_description: str,
         learning_objectives: str,
     ) -> str:
-        query = f"""
-        Research to inform Objectives, Audience, and Resource assessment for a course.
-        Course Name: {course_name}
-        Course Description: {course_description}
-        Initial Learning Objectives: {learning_objectives}
-        Include: domain trends, learner personas, prerequisite skills, common pitfalls, accessibility, tooling/platforms, datasets, standards, and best practices.
+        return await async_fast_search(self._research_query(course_name, course_description, learning_objectives))
+
+    def _context_for(self, context: Any, purpose: str, focus: str = "", budget_scale: int = 1) -> Any:
+        """
+        Compact a research payload for one artifact: drop the echoed query and boilerplate,
+        keep the passages most relevant to `purpose` within the token budget.
         """
-        return await async_fast_search(query)
+        if not self.compact_research or not context:
+            return context
+        budget = self.context_token_budget * budget_scale if self.context_token_budget else None
+        return compact_context(context, purpose, token_budget=budget, focus=focus)
 
     def analyze_course(
         self,
@@ -180,26 +206,11 @@ class Analyze:
         Analyze the course information and return the analysis.
         """
         if not do_research:
-            prompt = f"""
-            You are an expert instructional designer. 
-            Analyze the following course information and provide a detailed analysis following this EXACT structure:
-
-            {self.combined_template}
-
-            Course Name: {course_name}
-            Course Description: {course_description}
-            Learning Objectives: {learning_objectives}
-
-            Replace the bracketed placeholders with specific, detailed content. Maintain the markdown formatting and section structure exactly as shown.
-            """
+            prompt = self._course_prompt(course_name, course_description, learning_objectives)
             response = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {"role": "system", "content": "You are an expert instructional designer."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=5000,
-                temperature=0.7,
+                model=self.model,
+                messages=prompt.messages(),
+                **self.sampling["course"],
             )
             return response.choices[0].message.content
         else:
@@ -215,27 +226,12 @@ class Analyze:
             context = fast_search(
                 query
             )
-            prompt = f"""
-            You are an expert instructional designer.
-            Analyze the following course information and additional research context following this EXACT structure:
-
-            {self.combined_template}
-
-            Course Name: {course_name}
-            Course Description: {course_description}
-            Learning Objectives: {learning_objectives}
-            Additional Context: {context}
-            
-            Replace the bracketed placeholders with specific, detailed content. Maintain the markdown formatting and section structure exactly as shown.
-            """
+            context = self._context_for(context, "analysis", focus=learning_objectives, budget_scale=3)
+            prompt = self._course_prompt(course_name, course_description, learning_objectives, context)
             response = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {"role": "system", "content": "You are an expert instructional designer."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=5000,
-                temperature=0.7,
+                model=self.model,
+                messages=prompt.messages(),
+                **self.sampling["course"],
             )
             return response.choices[0].message.content
 
@@ -246,28 +242,28 @@ class Analyze:
         course_description: str,
         learning_objectives: str,
         do_research: bool = True,
-    ) -> Dict[str, str]:
+        max_workers: int = 3,
+    ) -> Dict[str, Any]:
+        """
+        Run the three analyses against one shared research context.
+        The calls are independent, so up to `max_workers` run in parallel threads.
+        A failed call leaves its artifact empty and is reported under "errors"
+        instead of discarding the other results.
+        """
         shared_context = (
             self.build_shared_research_context(course_name, course_description, learning_objectives)
             if do_research else ""
         )
-        objectives = self.analyze_objectives(
-            course_name, course_description, learning_objectives, do_research=False, shared_context=shared_context
-        )
-        audience = self.analyze_audience(
-            course_name, course_description, learning_objectives, do_research=False, shared_context=shared_context
-        )
-        resources = self.analyze_resources(
-            course_name, course_description, learning_objectives, do_research=False, shared_context=shared_context
+        args = (course_name, course_description, learning_objectives)
+        results, errors = run_threaded(
+            {
+                "objectives": lambda: self.analyze_objectives(*args, do_research=False, shared_context=shared_context),
+                "audience": lambda: self.analyze_audience(*args, do_research=False, shared_context=shared_context),
+                "resources": lambda: self.analyze_resources(*args, do_research=False, shared_context=shared_context),
+            },
+            max_workers=max_workers,
         )
-        combined = f"Objectives:\n{objectives}\n\nAudience:\n{audience}\n\nResources:\n{resources}"
-        return {
-            "objectives": objectives,
-            "audience": audience,
-            "resources": resources,
-            "combined": combined,
-            "shared_context": shared_context,
-        }
+        return self._aligned_result(results, errors, shared_context)
 
     async def async_analyze_all_aligned(
         self,
@@ -275,29 +271,136 @@ class Analyze:
         course_description: str,
         learning_objectives: str,
         do_research: bool = True,
-    ) -> Dict[str, str]:
+        max_concurrency: Optional[int] = 3,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of analyze_all_aligned. The three analyses run concurrently,
+        bounded by `max_concurrency`, with the same per-call error isolation.
+        """
         shared_context = (
             await self.async_build_shared_research_context(course_name, course_description, learning_objectives)
             if do_research else ""
         )
-        objectives = await self.async_analyze_objectives(
-            course_name, course_description, learning_objectives, do_research=False, shared_context=shared_context
-        )
-        audience = await self.async_analyze_audience(
-            course_name, course_description, learning_objectives, do_research=False, shared_context=shared_context
+        args = (course_name, course_description, learning_objectives)
+        results, errors = await gather_bounded(
+            {
+                "objectives": lambda: self.async_analyze_objectives(*args, do_research=False, shared_context=shared_context),
+                "audience": lambda: self.async_analyze_audience(*args, do_research=False, shared_context=shared_context),
+                "resources": lambda: self.async_analyze_resources(*args, do_research=False, shared_context=shared_context),
+            },
+            max_concurrency=max_concurrency,
         )
-        resources = await self.async_analyze_resources(
-            course_name, course_description, learning_objectives, do_research=False, shared_context=shared_context
-        )
-        combined = f"Objectives:\n{objectives}\n\nAudience:\n{audience}\n\nResources:\n{resources}"
+        return self._aligned_result(results, errors, shared_context)
+
+    def _aligned_result(
+        self,
+        results: Dict[str, str],
+        errors: Dict[str, Exception],
+        shared_context: str,
+    ) -> Dict[str, Any]:
+        objectives = results.get("objectives", "")
+        audience = results.get("audience", "")
+        resources = results.get("resources", "")
+        combined = self.combine_analysis(objectives, audience, resources)
         return {
             "objectives": objectives,
             "audience": audience,
             "resources": resources,
             "combined": combined,
             "shared_context": shared_context,
+            "errors": errors,
         }
 
+    def combine_analysis(self, objectives: str, audience: str, resources: str) -> str:
+        """Join the three analyses into the combined text the Design phase consumes."""
+        return f"Objectives:\n{objectives}\n\nAudience:\n{audience}\n\nResources:\n{resources}"
+
+    # Prompt builders shared by the sync and async variants. Instructions and templates form a
+    # static system prefix; course data and research context go last, in the user message.
+    def _course_prompt(
+        self, course_name: str, course_description: str, learning_objectives: str, context: Any = None
+    ) -> Prompt:
+        fields = [
+            ("Course Name", course_name),
+            ("Course Description", course_description),
+            ("Learning Objectives", learning_objectives),
+        ]
+        if context is not None:
+            fields.append(("Additional Context", context))
+        return build_prompt(
+            "Analyze the course information (and the additional research context, when given) in the user message "
+            "and provide a detailed analysis following this EXACT structure:",
+            self.combined_template,
+            "Replace the bracketed placeholders with specific, detailed content. Maintain the markdown formatting and section structure exactly as shown.",
+            fields,
+        )
+
+    def _objectives_prompt(self, course_name: str, course_description: str, learning_objectives: str, context: Any) -> Prompt:
+        context = self._context_for(context, "objectives", focus=learning_objectives)
+        return build_prompt(
+            "Produce ONLY the Objectives definition for the course in the user message, following this EXACT structure:",
+            self.objectives_template,
+            "Replace the bracketed placeholders with specific, measurable outcomes. Maintain the markdown formatting exactly as shown.",
+            [
+                ("Course Name", course_name),
+                ("Course Description", course_description),
+                ("Provided Learning Objectives", learning_objectives),
+                ("Additional Context", context),
+            ],
+        )
+
+    def _audience_prompt(self, course_name: str, course_description: str, learning_objectives: str, context: Any) -> Prompt:
+        context = self._context_for(context, "audience", focus=learning_objectives)
+        return build_prompt(
+            "Produce ONLY the Audience analysis for the course in the user message, following this EXACT structure:",
+            self.audience_template,
+            "Replace the bracketed placeholders with specific audience insights. Maintain the markdown formatting exactly as shown.",
+            [
+                ("Course Name", course_name),
+                ("Course Description", course_description),
+                ("Learning Objectives", learning_objectives),
+                ("Additional Context", context),
+            ],
+        )
+
+    def _resources_prompt(self, course_name: str, course_description: str, learning_objectives: str, context: Any) -> Prompt:
+        context = self._context_for(context, "resources", focus=learning_objectives)
+        return build_prompt(
+            "Produce ONLY the Resource assessment for the course in the user message, following this EXACT structure:",
+            self.resources_template,
+            "Replace the bracketed placeholders with specific resource requirements. Maintain the markdown formatting exactly as shown.",
+            [
+                ("Course Name", course_name),
+                ("Course Description", course_description),
+                ("Learning Objectives", learning_objectives),
+                ("Additional Context", context),
+            ],
+        )
+
+    def stage_fingerprint(self, stage: str) -> str:
+        """
+        Hash of what shapes a stage's output besides its inputs: the prompt rendered with
+        placeholder course fields, the model, sampling params and research compaction.
+        Stages: research, objectives, audience, resources, combined.
+        """
+        fields = ("{course_name}", "{course_description}", "{learning_objectives}")
+        if stage == "research":
+            return config_hash(stage=stage, query=self._research_query(*fields))
+        if stage == "combined":
+            return config_hash(stage=stage, text=self.combine_analysis("{objectives}", "{audience}", "{resources}"))
+        prompts = {
+            "objectives": self._objectives_prompt,
+            "audience": self._audience_prompt,
+            "resources": self._resources_prompt,
+        }
+        return config_hash(
+            stage=stage,
+            prompt=prompts[stage](*fields, "").messages(),
+            model=self.model,
+            sampling=self.sampling[stage],
+            compaction=(self.compact_research, self.context_token_budget),
+        )
+
     def analyze_objectives(
         self,
         course_name: str,
@@ -308,27 +411,11 @@ class Analyze:
     ) -> str:
         query = f"Define clear learning objectives for a course.\nCourse: {course_name}\nDesc: {course_description}\nInitial Objectives: {learning_objectives}"
         context = shared_context if shared_context is not None else (fast_search(query) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Objectives definition following this EXACT structure:
-
-        {self.objectives_template}
-
-        Course Name: {course_name}
-        Course Description: {course_description}
-        Provided Learning Objectives: {learning_objectives}
-        Additional Context: {context}
-        
-        Replace the bracketed placeholders with specific, measurable outcomes. Maintain the markdown formatting exactly as shown.
-        """
+        prompt = self._objectives_prompt(course_name, course_description, learning_objectives, context)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["objectives"],
         )
         return response.choices[0].message.content
 
@@ -342,27 +429,11 @@ class Analyze:
     ) -> str:
         query = f"Define clear learning objectives for a course.\nCourse: {course_name}\nDesc: {course_description}\nInitial Objectives: {learning_objectives}"
         context = shared_context if shared_context is not None else (await async_fast_search(query) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Objectives definition following this EXACT structure:
-
-        {self.objectives_template}
-
-        Course Name: {course_name}
-        Course Description: {course_description}
-        Provided Learning Objectives: {learning_objectives}
-        Additional Context: {context}
-        
-        Replace the bracketed placeholders with specific, measurable outcomes. Maintain the markdown formatting exactly as shown.
-        """
+        prompt = self._objectives_prompt(course_name, course_description, learning_objectives, context)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["objectives"],
         )
         return response.choices[0].message.content
 
@@ -376,27 +447,11 @@ class Analyze:
     ) -> str:
         query = f"Analyze target learners for a course.\nCourse: {course_name}\nDesc: {course_description}\nObjectives: {learning_objectives}"
         context = shared_context if shared_context is not None else (fast_search(query) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Audience analysis following this EXACT structure:
-
-        {self.audience_template}
-
-        Course Name: {course_name}
-        Course Description: {course_description}
-        Learning Objectives: {learning_objectives}
-        Additional Context: {context}
-        
-        Replace the bracketed placeholders with specific audience insights. Maintain the markdown formatting exactly as shown.
-        """
+        prompt = self._audience_prompt(course_name, course_description, learning_objectives, context)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["audience"],
         )
         return response.choices[0].message.content
 
@@ -410,27 +465,11 @@ class Analyze:
     ) -> str:
         query = f"Analyze target learners for a course.\nCourse: {course_name}\nDesc: {course_description}\nObjectives: {learning_objectives}"
         context = shared_context if shared_context is not None else (await async_fast_search(query) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Audience analysis following this EXACT structure:
-
-        {self.audience_template}
-
-        Course Name: {course_name}
-        Course Description: {course_description}
-        Learning Objectives: {learning_objectives}
-        Additional Context: {context}
-        
-        Replace the bracketed placeholders with specific audience insights. Maintain the markdown formatting exactly as shown.
-        """
+        prompt = self._audience_prompt(course_name, course_description, learning_objectives, context)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["audience"],
         )
         return response.choices[0].message.content
 
@@ -444,27 +483,11 @@ class Analyze:
     ) -> str:
         query = f"Identify resources for a course (tools, platforms, time, SMEs, datasets, references).\nCourse: {course_name}\nDesc: {course_description}\nObjectives: {learning_objectives}"
         context = shared_context if shared_context is not None else (fast_search(query) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Resource assessment following this EXACT structure:
-
-        {self.resources_template}
-
-        Course Name: {course_name}
-        Course Description: {course_description}
-        Learning Objectives: {learning_objectives}
-        Additional Context: {context}
-        
-        Replace the bracketed placeholders with specific resource requirements. Maintain the markdown formatting exactly as shown.
-        """
+        prompt = self._resources_prompt(course_name, course_description, learning_objectives, context)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["resources"],
         )
         return response.choices[0].message.content
 
@@ -478,27 +501,11 @@ class Analyze:
     ) -> str:
         query = f"Identify resources for a course (tools, platforms, time, SMEs, datasets, references).\nCourse: {course_name}\nDesc: {course_description}\nObjectives: {learning_objectives}"
         context = shared_context if shared_context is not None else (await async_fast_search(query) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Resource assessment following this EXACT structure:
-
-        {self.resources_template}
-
-        Course Name: {course_name}
-        Course Description: {course_description}
-        Learning Objectives: {learning_objectives}
-        Additional Context: {context}
-        
-        Replace the bracketed placeholders with specific resource requirements. Maintain the markdown formatting exactly as shown.
-        """
+        prompt = self._resources_prompt(course_name, course_description, learning_objectives, context)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["resources"],
         )
         return response.choices[0].message.content
         
@@ -513,26 +520,11 @@ class Analyze:
         Asynchronously analyze the course information and return the analysis.
         """
         if not do_research:
-            prompt = f"""
-            You are an expert instructional designer. 
-            Analyze the following course information and provide a detailed analysis following this EXACT structure:
-
-            {self.combined_template}
-
-            Course Name: {course_name}
-            Course Description: {course_description}
-            Learning Objectives: {learning_objectives}
-
-            Replace the bracketed placeholders with specific, detailed content. Maintain the markdown formatting and section structure exactly as shown.
-            """
+            prompt = self._course_prompt(course_name, course_description, learning_objectives)
             response = await self.async_client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {"role": "system", "content": "You are an expert instructional designer."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=5000,
-                temperature=0.7,
+                model=self.model,
+                messages=prompt.messages(),
+                **self.sampling["course"],
             )
             return response.choices[0].message.content
         else:
@@ -548,26 +540,11 @@ class Analyze:
             context = await async_fast_search(
                 query
             )
-            prompt = f"""
-            You are an expert instructional designer.
-            Analyze the following course information and additional research context following this EXACT structure:
-
-            {self.combined_template}
-
-            Course Name: {course_name}
-            Course Description: {course_description}
-            Learning Objectives: {learning_objectives}
-            Additional Context: {context}
-            
-            Replace the bracketed placeholders with specific, detailed content. Maintain the markdown formatting and section structure exactly as shown.
-            """
+            context = self._context_for(context, "analysis", focus=learning_objectives, budget_scale=3)
+            prompt = self._course_prompt(course_name, course_description, learning_objectives, context)
             response = await self.async_client.chat.completions.create(
-                model="openai/gpt-oss-20b",
-                messages=[
-                    {"role": "system", "content": "You are an expert instructional designer."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=5000,
-                temperature=0.7,
+                model=self.model,
+                messages=prompt.messages(),
+                **self.sampling["course"],
             )
             return response.choices[0].message.content
\ No newline at end of file
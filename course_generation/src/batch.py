@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from src.concurrency import gather_bounded
+
+
+@dataclass
+class CourseSpec:
+    """One course to generate, as read from a batch manifest."""
+
+    course_name: str
+    course_description: str
+    learning_objectives: str
+    do_research: bool = True
+
+
+# Accepted manifest column names for each CourseSpec field
+_FIELD_ALIASES = {
+    "course_name": ("course_name", "name", "title"),
+    "course_description": ("course_description", "description"),
+    "learning_objectives": ("learning_objectives", "objectives"),
+    "do_research": ("do_research", "research"),
+}
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ("0", "false", "no", "n", "off", "")
+
+
+def _spec_from_row(row: Dict[str, Any], line: int) -> CourseSpec:
+    values: Dict[str, Any] = {}
+    for field, aliases in _FIELD_ALIASES.items():
+        for alias in aliases:
+            if row.get(alias) not in (None, ""):
+                values[field] = row[alias]
+                break
+    missing = [f for f in ("course_name", "course_description", "learning_objectives") if f not in values]
+    if missing:
+        raise RuntimeError(f"Manifest entry {line} is missing {', '.join(missing)}")
+    if "do_research" in values:
+        values["do_research"] = _parse_bool(values["do_research"])
+    return CourseSpec(**values)
+
+
+def load_manifest(path: str) -> List[CourseSpec]:
+    """
+    Read course specs from a .jsonl (one object per line) or .csv manifest.
+    Columns: course_name/name, course_description/description,
+    learning_objectives/objectives and optional do_research.
+    """
+    specs: List[CourseSpec] = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            for i, row in enumerate(csv.DictReader(f), start=2):
+                specs.append(_spec_from_row(row, i))
+        else:
+            for i, line in enumerate(f, start=1):
+                if line.strip():
+                    specs.append(_spec_from_row(json.loads(line), i))
+    return specs
+
+
+class BatchRunner:
+    """
+    Generate many courses with one shared ADDIE instance.
+
+    At most `max_courses` courses are in progress at once; the LLM call limit is global
+    when the ADDIE clients are wrapped with a shared limiter (see `build_addie`). Each
+    course resumes from its checkpoint folder, so re-running a manifest after an
+    interruption only generates what is missing. One JSON line per course (status,
+    timings, module counts) is appended to `report_path` as soon as the course finishes.
+    """
+
+    def __init__(
+        self,
+        addie: Any,
+        max_courses: int = 4,
+        module_concurrency: int = 4,
+        develop: bool = True,
+        checkpoint_dir: Optional[str] = None,
+        report_path: Optional[str] = None,
+    ):
+        self.addie = addie
+        self.max_courses = max_courses
+        self.module_concurrency = module_concurrency
+        self.develop = develop
+        self.checkpoint_dir = checkpoint_dir
+        self.report_path = report_path
+
+    def _is_checkpointed(self, spec: CourseSpec) -> bool:
+        key = self.addie._make_checkpoint_key(
+            spec.course_name, spec.course_description, spec.learning_objectives, spec.do_research, stage="parts"
+        )
+        course_path = self.addie._course_dir(spec.course_name, key, self.checkpoint_dir)
+        done = self.addie._load_course_artifacts(course_path)
+        return all(name in done for name in ("combined", "syllabus", "slides_plan", "assessment_plan"))
+
+    def _write_report(self, record: Dict[str, Any]) -> None:
+        if not self.report_path:
+            return
+        directory = os.path.dirname(self.report_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.report_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    async def run_course(self, spec: CourseSpec) -> Dict[str, Any]:
+        """Generate one course; failures are recorded in the returned report entry, not raised."""
+        record: Dict[str, Any] = {
+            **asdict(spec),
+            "status": "ok",
+            "resumed": self._is_checkpointed(spec),
+            "design_seconds": None,
+            "develop_seconds": None,
+            "modules": 0,
+            "module_errors": 0,
+            "error": None,
+        }
+        args = dict(
+            course_name=spec.course_name,
+            course_description=spec.course_description,
+            learning_objectives=spec.learning_objectives,
+            do_research=spec.do_research,
+            use_checkpoint=True,
+            checkpoint_dir=self.checkpoint_dir,
+        )
+        start = time.monotonic()
+        try:
+            course = await self.addie.async_generate_course(**args)
+            record["design_seconds"] = round(time.monotonic() - start, 3)
+            if self.develop:
+                develop_start = time.monotonic()
+                design = course["design"]
+                materials = await self.addie.async_develop_modules_materials(
+                    syllabus=design["syllabus"],
+                    slides_plan=design["slides_plan"],
+                    assessment_plan=design["assessment_plan"],
+                    max_concurrency=self.module_concurrency,
+                    **args,
+                )
+                record["develop_seconds"] = round(time.monotonic() - develop_start, 3)
+                record["modules"] = len(materials)
+                record["module_errors"] = sum(1 for m in materials if "error" in m)
+                if record["module_errors"]:
+                    record["status"] = "partial"
+        except Exception as exc:
+            record["status"] = "failed"
+            record["error"] = f"{type(exc).__name__}: {exc}"
+        record["total_seconds"] = round(time.monotonic() - start, 3)
+        self._write_report(record)
+        return record
+
+    async def run(self, specs: List[CourseSpec]) -> List[Dict[str, Any]]:
+        """Run every spec (bounded by max_courses) and return report entries in manifest order."""
+        calls = {str(i): (lambda spec=spec: self.run_course(spec)) for i, spec in enumerate(specs)}
+        results, _ = await gather_bounded(calls, max_concurrency=self.max_courses)
+        return [results[str(i)] for i in range(len(specs))]
+
+
+def build_addie(
+    max_llm_calls: Optional[int] = None,
+    checkpoint_dir: Optional[str] = None,
+    checkpoint_db: Optional[str] = None,
+) -> Any:
+    """
+    ADDIE over the default clients, with one AIMD limiter shared by every course when
+    max_llm_calls is set, and checkpoints in a SQLite database when checkpoint_db is set.
+    """
+    from src.addie import ADDIE
+    from src.checkpoint import SQLiteStore
+    from src.services.limiter import AdaptiveLimiter
+    from src.services.llm import async_client, client, wrap_clients
+
+    if max_llm_calls:
+        limiter = AdaptiveLimiter(initial_limit=min(4, max_llm_calls), max_limit=max_llm_calls)
+        client, async_client = wrap_clients(client, async_client, limiter=limiter)
+    store = SQLiteStore(checkpoint_db, root=checkpoint_dir or ".addie_checkpoints") if checkpoint_db else None
+    return ADDIE(client, async_client, checkpoint_dir=checkpoint_dir, checkpoint_store=store)
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    statuses: Dict[str, int] = {}
+    for record in records:
+        statuses[record["status"]] = statuses.get(record["status"], 0) + 1
+    return {
+        "courses": len(records),
+        "statuses": statuses,
+        "resumed": sum(1 for r in records if r["resumed"]),
+        "total_seconds": round(sum(r["total_seconds"] for r in records), 3),
+    }
+
+
+async def run_manifest(
+    manifest_path: str,
+    max_courses: int = 4,
+    max_llm_calls: Optional[int] = 16,
+    module_concurrency: int = 4,
+    develop: bool = True,
+    checkpoint_dir: Optional[str] = None,
+    report_path: Optional[str] = None,
+    checkpoint_db: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    specs = load_manifest(manifest_path)
+    addie = build_addie(max_llm_calls, checkpoint_dir, checkpoint_db)
+    runner = BatchRunner(
+        addie,
+        max_courses=max_courses,
+        module_concurrency=module_concurrency,
+        develop=develop,
+        checkpoint_dir=checkpoint_dir,
+        report_path=report_path,
+    )
+    try:
+        return await runner.run(specs)
+    finally:
+        try:
+            await addie.aclose()
+        finally:
+            # Closes the --checkpoint-db connections (and with them the WAL files)
+            addie.store.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate courses in bulk from a JSONL/CSV manifest.")
+    parser.add_argument("manifest", help="Path to a .jsonl or .csv manifest of course specs")
+    parser.add_argument("--max-courses", type=int, default=4, help="Courses generated at once")
+    parser.add_argument("--max-llm-calls", type=int, default=16, help="Global cap on in-flight LLM calls (0 = no cap)")
+    parser.add_argument("--module-concurrency", type=int, default=4, help="Modules developed at once per course")
+    parser.add_argument("--no-develop", action="store_true", help="Stop after analysis and design")
+    parser.add_argument("--checkpoint-dir", default=None, help="Checkpoint root (default .addie_checkpoints)")
+    parser.add_argument("--checkpoint-db", default=None, help="Keep checkpoints in this SQLite database instead of files")
+    parser.add_argument("--report", default="batch_report.jsonl", help="Per-course status/timing report (JSONL)")
+    parser.add_argument("--metrics", default=None, help="Write per-call latency/token metrics (JSON) here")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on this port")
+    args = parser.parse_args(argv)
+
+    from src.services.metrics import metrics, serve_prometheus
+
+    if args.metrics_port is not None:
+        serve_prometheus(args.metrics_port)
+
+    records = asyncio.run(
+        run_manifest(
+            args.manifest,
+            max_courses=args.max_courses,
+            max_llm_calls=args.max_llm_calls or None,
+            module_concurrency=args.module_concurrency,
+            develop=not args.no_develop,
+            checkpoint_dir=args.checkpoint_dir,
+            report_path=args.report,
+            checkpoint_db=args.checkpoint_db,
+        )
+    )
+    print(json.dumps(summarize(records), indent=2))
+    if args.metrics:
+        metrics.write_json(args.metrics)
+
+
+if __name__ == "__main__":
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except ImportError:
+        pass
+    main()
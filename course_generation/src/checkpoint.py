@@ -0,0 +1,435 @@
+import hashlib
+from abc import ABC, abstractmethod
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Write text to a temp file next to `path` and rename it into place."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def config_hash(**parts: Any) -> str:
+    """Stable hash of a stage's configuration: rendered prompt template, model, sampling params."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return content_hash(blob)[:16]
+
+
+def stage_key(fingerprint: str, inputs: Sequence[Any] = ()) -> str:
+    """
+    Key of a stage's output: its own fingerprint plus the content of the artifacts it was built
+    from, in dependency order. Non-text values are hashed as their str(), which is also how they
+    are checkpointed, so a value and its restored checkpoint give the same key.
+    """
+    parts = [fingerprint] + [content_hash(value if isinstance(value, str) else str(value)) for value in inputs]
+    return content_hash("\n".join(parts))[:16]
+
+
+class CheckpointManifest:
+    """
+    Per-directory record of checkpointed artifacts: file name -> artifact name, sha256,
+    size, model, generation time and creation time, stored in `manifest.json`.
+
+    The manifest is read once when opened, so a lookup costs one open of the artifact
+    itself; a keyed read that misses re-reads it in case another process wrote the entry.
+    An artifact is served only if its size (and, with `verify`, its hash) still matches the
+    entry; otherwise the entry is dropped and the caller regenerates it. Entries may also
+    carry the stage key the artifact was built under; a read asking for a different key
+    misses, so edited templates or models invalidate just that stage.
+    Artifact files and the manifest are both written atomically. Every manifest update
+    re-reads the file and merges into it under an exclusive file lock, so processes sharing
+    a directory keep each other's entries. Files from before manifests existed are adopted
+    on first read; callers decide whether empty is valid.
+    Use `CheckpointManifest.open(directory)` to share one instance per directory.
+    """
+
+    _instances: Dict[str, "CheckpointManifest"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory: str, verify: bool = True):
+        self.directory = directory
+        self.verify = verify
+        self.path = os.path.join(directory, MANIFEST_FILENAME)
+        self._lock = threading.RLock()
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    @classmethod
+    def open(cls, directory: str) -> "CheckpointManifest":
+        """The shared instance for `directory`; pass `verify` per read instead of per instance."""
+        key = os.path.abspath(directory)
+        with cls._instances_lock:
+            manifest = cls._instances.get(key)
+            if manifest is None:
+                manifest = cls._instances[key] = cls(directory)
+            return manifest
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        entries = data.get("artifacts") if isinstance(data, dict) else None
+        return dict(entries) if isinstance(entries, dict) else {}
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock across processes, held on `manifest.json.lock` next to the manifest."""
+        os.makedirs(self.directory or ".", exist_ok=True)
+        with open(f"{self.path}.lock", "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _update(self, filename: str, entry: Optional[Dict[str, Any]], stale: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Set one entry, merged into the manifest currently on disk. With entry=None, remove it
+        unless another writer has replaced `stale` in the meantime.
+        """
+        with self._lock, self._file_lock():
+            entries = self._load()
+            if entry is None:
+                if entries.get(filename) == stale:
+                    entries.pop(filename, None)
+            else:
+                entries[filename] = entry
+            payload = {"version": 1, "artifacts": entries}
+            atomic_write(self.path, json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True))
+            self.entries = entries
+
+    def _reload(self) -> None:
+        entries = self._load()
+        with self._lock:
+            self.entries = entries
+
+    def read(self, filename: str, key: Optional[str] = None, verify: Optional[bool] = None) -> Optional[str]:
+        """
+        Content of a checkpointed file, or None if it is missing, fails validation or (when
+        `key` is given) was built under a different stage key. `verify` overrides the
+        instance's hash check for this read.
+        """
+        path = os.path.join(self.directory, filename)
+        with self._lock:
+            entry = self.entries.get(filename)
+        if key is not None and (entry is None or entry.get("key") != key):
+            self._reload()
+            with self._lock:
+                entry = self.entries.get(filename)
+        if entry is None:
+            content = self._adopt(filename, path)
+            return content if key is None else None
+        if key is not None and entry.get("key") != key:
+            return None
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            self._drop(filename, entry)
+            return None
+        verify = self.verify if verify is None else verify
+        if len(raw) != entry.get("size") or (verify and hashlib.sha256(raw).hexdigest() != entry.get("sha256")):
+            self._drop(filename, entry)
+            return None
+        return raw.decode("utf-8")
+
+    def _adopt(self, filename: str, path: str) -> Optional[str]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        self._record(filename, content, artifact=None, model=None, elapsed=None, key=None)
+        return content
+
+    def _drop(self, filename: str, stale: Dict[str, Any]) -> None:
+        self._update(filename, None, stale)
+
+    def _record(
+        self,
+        filename: str,
+        content: str,
+        artifact: Optional[str],
+        model: Optional[str],
+        elapsed: Optional[float],
+        key: Optional[str],
+    ) -> None:
+        entry = {
+            "artifact": artifact or os.path.splitext(filename)[0],
+            "key": key,
+            "sha256": content_hash(content),
+            "size": len(content.encode("utf-8")),
+            "model": model,
+            "elapsed": round(elapsed, 3) if elapsed is not None else None,
+            "created_at": time.time(),
+        }
+        self._update(filename, entry)
+
+    def write(
+        self,
+        filename: str,
+        content: Any,
+        artifact: Optional[str] = None,
+        model: Optional[str] = None,
+        elapsed: Optional[float] = None,
+        key: Optional[str] = None,
+    ) -> None:
+        """Atomically write an artifact file, then record it (and its stage key) in the manifest."""
+        text = str(content or "")
+        atomic_write(os.path.join(self.directory, filename), text)
+        self._record(filename, text, artifact, model, elapsed, key)
+
+
+class CheckpointStore(ABC):
+    """
+    Where checkpointed artifacts live. Artifacts are addressed by `location` (the
+    checkpoint directory path the markdown layout would use, e.g. the course folder)
+    and `filename`, so every backend can be exported to the same markdown tree. `key` is the
+    stage key (see `stage_key`): reads with a key only return artifacts written under it.
+    """
+
+    @abstractmethod
+    def read(self, location: str, filename: str, key: Optional[str] = None) -> Optional[str]:
+        """Content of the artifact, or None if it is missing, invalid or built under another key."""
+
+    @abstractmethod
+    def write(
+        self,
+        location: str,
+        filename: str,
+        content: Any,
+        artifact: Optional[str] = None,
+        model: Optional[str] = None,
+        elapsed: Optional[float] = None,
+        key: Optional[str] = None,
+    ) -> None:
+        """Store the artifact together with its metadata and stage key."""
+
+    def close(self) -> None:
+        """Release connections or other resources held by the backend (none by default)."""
+
+
+class MarkdownStore(CheckpointStore):
+    """Default backend: one `.md` file per artifact plus a manifest.json per directory."""
+
+    def __init__(self, verify: bool = True):
+        self.verify = verify
+
+    def read(self, location: str, filename: str, key: Optional[str] = None) -> Optional[str]:
+        return CheckpointManifest.open(location).read(filename, key, verify=self.verify)
+
+    def write(
+        self,
+        location: str,
+        filename: str,
+        content: Any,
+        artifact: Optional[str] = None,
+        model: Optional[str] = None,
+        elapsed: Optional[float] = None,
+        key: Optional[str] = None,
+    ) -> None:
+        CheckpointManifest.open(location).write(filename, content, artifact, model, elapsed, key)
+
+
+class SQLiteStore(CheckpointStore):
+    """
+    Checkpoints in one SQLite database in WAL mode, so many threads and processes can read
+    and write concurrently without touching the filesystem tree.
+
+    Locations are stored relative to `root` (the checkpoint directory). The first path
+    component is the course folder `<course-slug>-<key>`, which is indexed as `course`
+    and `course_key` for `courses()` / `find()`. `export_markdown()` writes the
+    artifacts back out in the markdown layout, manifests included.
+    Each thread gets its own connection; `close()` closes all of them.
+    """
+
+    def __init__(self, db_path: str, root: str = ".addie_checkpoints", verify: bool = True, timeout: float = 30.0):
+        self.db_path = db_path
+        self.root = root
+        self.verify = verify
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    location TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    course TEXT,
+                    course_key TEXT,
+                    artifact TEXT,
+                    stage_key TEXT,
+                    content TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    model TEXT,
+                    elapsed REAL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (location, filename)
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(artifacts)")}
+            if "stage_key" not in columns:
+                conn.execute("ALTER TABLE artifacts ADD COLUMN stage_key TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_course ON artifacts (course)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_course_key ON artifacts (course_key)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        with self._connections_lock:
+            if conn is not None and conn in self._connections:
+                return conn
+            # Only this thread uses the connection; check_same_thread=False lets close() shut it
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            self._connections.append(conn)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        return conn
+
+    def _relative(self, location: str) -> str:
+        # Locations outside root (e.g. standalone Develop checkpoints) are kept absolute
+        path = os.path.abspath(location)
+        relative = os.path.relpath(path, os.path.abspath(self.root))
+        return path if relative.startswith("..") else relative.replace(os.sep, "/")
+
+    def _course_of(self, relative: str) -> tuple:
+        folder = relative.split("/", 1)[0]
+        if os.path.isabs(relative) or folder == "." or "-" not in folder:
+            return None, None
+        course, key = folder.rsplit("-", 1)
+        return course, key
+
+    def read(self, location: str, filename: str, key: Optional[str] = None) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT content, sha256, stage_key FROM artifacts WHERE location = ? AND filename = ?",
+            (self._relative(location), filename),
+        ).fetchone()
+        if row is None:
+            return None
+        content, digest, saved_key = row
+        if (key is not None and saved_key != key) or (self.verify and content_hash(content) != digest):
+            return None
+        return content
+
+    def write(
+        self,
+        location: str,
+        filename: str,
+        content: Any,
+        artifact: Optional[str] = None,
+        model: Optional[str] = None,
+        elapsed: Optional[float] = None,
+        key: Optional[str] = None,
+    ) -> None:
+        text = str(content or "")
+        relative = self._relative(location)
+        course, course_key = self._course_of(relative)
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts (location, filename, course, course_key, artifact, stage_key, "
+                "content, sha256, size, model, elapsed, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    relative, filename, course, course_key, artifact or os.path.splitext(filename)[0], key, text,
+                    content_hash(text), len(text.encode("utf-8")), model,
+                    round(elapsed, 3) if elapsed is not None else None, time.time(),
+                ),
+            )
+
+    def courses(self) -> List[Dict[str, Any]]:
+        """One row per course folder: course slug, key and artifact count."""
+        rows = self._conn().execute(
+            "SELECT course, course_key, COUNT(*) FROM artifacts WHERE course IS NOT NULL "
+            "GROUP BY course, course_key ORDER BY course"
+        ).fetchall()
+        return [{"course": course, "key": key, "artifacts": count} for course, key, count in rows]
+
+    def find(self, course: Optional[str] = None, key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Artifact metadata (without content) for a course slug and/or key."""
+        clauses, params = [], []
+        if course is not None:
+            clauses.append("course = ?")
+            params.append(course)
+        if key is not None:
+            clauses.append("course_key = ?")
+            params.append(key)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            "SELECT location, filename, artifact, stage_key, sha256, size, model, elapsed, created_at "
+            f"FROM artifacts {where} ORDER BY location, filename",
+            params,
+        ).fetchall()
+        fields = ("location", "filename", "artifact", "key", "sha256", "size", "model", "elapsed", "created_at")
+        return [dict(zip(fields, row)) for row in rows]
+
+    def export_markdown(self, directory: Optional[str] = None) -> int:
+        """
+        Write every artifact to the markdown layout under `directory` (default: root). Locations
+        outside root land in `<directory>/_external/<absolute path without drive>`, so an export
+        never writes outside `directory`. Returns the count.
+        """
+        target = MarkdownStore(verify=self.verify)
+        base = directory or self.root
+        count = 0
+        rows = self._conn().execute(
+            "SELECT location, filename, artifact, content, model, elapsed, stage_key FROM artifacts ORDER BY location, filename"
+        )
+        for location, filename, artifact, content, model, elapsed, key in rows:
+            if os.path.isabs(location):
+                location = os.path.join("_external", os.path.splitdrive(location)[1].lstrip("/\\"))
+            target.write(os.path.join(base, location), filename, content, artifact, model, elapsed, key)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        """Close the connections of every thread; a later call opens a fresh one."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
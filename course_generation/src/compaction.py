@@ -0,0 +1,170 @@
+import ast
+import json
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Lexical focus for each artifact that consumes research context
+PURPOSE_TERMS: Dict[str, str] = {
+    "objectives": "learning objectives outcomes goals measurable bloom competencies skills mastery success criteria assessment alignment standards",
+    "audience": "audience learners personas roles experience prerequisite prior knowledge skills motivation time constraints learning style accessibility misconceptions",
+    "resources": "resources tools platforms software datasets data budget cost licensing sme experts infrastructure lms standards references risks",
+    "analysis": "learning objectives outcomes audience learners personas prerequisite skills accessibility resources tools platforms datasets standards best practices",
+    "script": "concepts explanation examples case study demo trends terminology misconceptions best practices engagement activity",
+    "slides": "slides visuals diagrams charts flowchart presentation design accessibility contrast layout",
+    "assessment": "assessment rubric quiz questions formative summative criteria feedback weight evaluation lab project",
+}
+
+# Lines that carry no information for generation
+_BOILERPLATE = [
+    re.compile(r"^\s*\*?\s*end of (the )?report\s*\*?\s*$", re.I),
+    re.compile(r"^\s*\**\s*report\s*[-–—:(]\s*\d{4}.*$", re.I),
+    re.compile(r"^\s*(i hope (this|that) helps|let me know if|feel free to|happy (teaching|learning))\b.*$", re.I),
+    re.compile(r"^\s*[-*_]{3,}\s*$"),
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to with will your you".split()
+)
+
+
+def approx_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for budgeting."""
+    return max(1, len(text) // 4)
+
+
+def research_text(payload: Any) -> str:
+    """
+    Extract the research body from a researcher API payload.
+
+    Accepts the response dict, its Python repr or JSON (as stored in shared_context.md),
+    or plain text. The echoed "query" and status fields are dropped.
+    """
+    if payload is None:
+        return ""
+    if isinstance(payload, str):
+        stripped = payload.strip()
+        if not stripped.startswith("{"):
+            return stripped
+        try:
+            payload = json.loads(stripped)
+        except ValueError:
+            try:
+                payload = ast.literal_eval(stripped)
+            except (ValueError, SyntaxError):
+                return stripped
+    if isinstance(payload, dict):
+        if isinstance(payload.get("results"), str):
+            return payload["results"].strip()
+        parts = [str(v) for k, v in payload.items() if k not in ("query", "status") and v]
+        return "\n\n".join(parts).strip()
+    return str(payload).strip()
+
+
+def _is_table(lines: List[str]) -> bool:
+    return len(lines) >= 2 and all(line.lstrip().startswith("|") for line in lines[:2])
+
+
+def split_passages(text: str, max_tokens: int = 250) -> List[str]:
+    """
+    Split research text into passages: blank-line separated blocks, with long blocks cut
+    into line groups. Table chunks repeat the table header so each passage stands alone.
+    """
+    lines = [line for line in text.splitlines() if not any(p.match(line) for p in _BOILERPLATE)]
+    blocks: List[List[str]] = []
+    current: List[str] = []
+    for line in lines:
+        if not line.strip():
+            if current:
+                blocks.append(current)
+                current = []
+            continue
+        if line.lstrip().startswith("#") and current:
+            blocks.append(current)
+            current = []
+        current.append(line.rstrip())
+    if current:
+        blocks.append(current)
+
+    passages: List[str] = []
+    for block in blocks:
+        text_block = "\n".join(block)
+        if approx_tokens(text_block) <= max_tokens:
+            passages.append(text_block)
+            continue
+        header = block[:2] if _is_table(block) else []
+        body = block[2:] if header else block
+        chunk: List[str] = []
+        for line in body:
+            candidate = "\n".join(header + chunk + [line])
+            if chunk and approx_tokens(candidate) > max_tokens:
+                passages.append("\n".join(header + chunk))
+                chunk = []
+            chunk.append(line)
+        if chunk:
+            passages.append("\n".join(header + chunk))
+    return passages
+
+
+def _terms(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def rank_passages(passages: List[str], query: str) -> List[float]:
+    """BM25 scores of each passage against the query terms."""
+    docs = [_terms(p) for p in passages]
+    if not docs:
+        return []
+    avg_len = sum(len(d) for d in docs) / len(docs) or 1.0
+    df: Counter = Counter()
+    for doc in docs:
+        df.update(set(doc))
+    query_terms = set(_terms(query))
+    k1, b = 1.2, 0.75
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        score = 0.0
+        for term in query_terms:
+            if term not in tf:
+                continue
+            idf = math.log(1 + (len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * len(doc) / avg_len))
+        scores.append(score)
+    return scores
+
+
+def compact_context(
+    context: Any,
+    purpose: str,
+    token_budget: Optional[int] = 1200,
+    focus: str = "",
+) -> str:
+    """
+    Compact a research payload for one prompt.
+
+    Drops the echoed query and boilerplate, ranks passages by lexical relevance to the
+    artifact's purpose (see PURPOSE_TERMS) plus `focus` text, and keeps the best ones
+    within `token_budget`, in their original order. A budget of None keeps everything.
+    """
+    text = research_text(context)
+    if not text:
+        return ""
+    passages = split_passages(text)
+    if token_budget is None or sum(approx_tokens(p) for p in passages) <= token_budget:
+        return "\n\n".join(passages)
+
+    query = f"{PURPOSE_TERMS.get(purpose, purpose)} {focus}"
+    scores = rank_passages(passages, query)
+    order = sorted(range(len(passages)), key=lambda i: (-scores[i], i))
+    kept = set()
+    used = 0
+    for i in order:
+        cost = approx_tokens(passages[i])
+        if used + cost > token_budget:
+            continue
+        kept.add(i)
+        used += cost
+    return "\n\n".join(passages[i] for i in sorted(kept))
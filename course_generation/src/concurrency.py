@@ -0,0 +1,139 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class CallbackError(Exception):
+    """
+    `on_result` raised for calls that themselves succeeded. Raised once every call has
+    finished; `results` and `errors` are what the call would have returned, and
+    `callback_errors` maps each affected call to the callback's exception.
+    """
+
+    def __init__(self, results: Dict[str, Any], errors: Dict[str, Exception], callback_errors: Dict[str, Exception]):
+        super().__init__(f"Result callback failed for {format_errors(callback_errors)}")
+        self.results = results
+        self.errors = errors
+        self.callback_errors = callback_errors
+
+
+async def gather_bounded(
+    calls: Dict[str, Callable[[], Awaitable[Any]]],
+    max_concurrency: Optional[int] = None,
+    on_result: Optional[Callable[[str, Any], None]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    Run independent coroutine factories concurrently with at most `max_concurrency` in flight.
+
+    Args:
+        calls: Mapping of name -> zero-arg callable returning an awaitable.
+        max_concurrency: Upper bound on concurrent calls. None or <= 0 means unbounded.
+        on_result: Optional callback invoked with (name, result) as soon as each call succeeds,
+            e.g. to checkpoint an artifact before the slower calls finish. It runs in a worker
+            thread (with the caller's context), so blocking I/O does not stall the other calls.
+
+    Returns:
+        (results, errors): results for calls that succeeded, exceptions for calls that failed.
+        A failing call never cancels or discards the others.
+
+    Raises:
+        CallbackError: If on_result raised; the calls' results and errors are attached.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency and max_concurrency > 0 else None
+    callback_errors: Dict[str, Exception] = {}
+
+    async def _run(name: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        if semaphore is None:
+            result = await factory()
+        else:
+            async with semaphore:
+                result = await factory()
+        if on_result is not None:
+            try:
+                await asyncio.to_thread(on_result, name, result)
+            except Exception as exc:
+                callback_errors[name] = exc
+        return result
+
+    names = list(calls)
+    outcomes = await asyncio.gather(*(_run(name, calls[name]) for name in names), return_exceptions=True)
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, Exception):
+            errors[name] = outcome
+        elif isinstance(outcome, BaseException):
+            # Cancellation and interpreter exits are not per-call failures
+            raise outcome
+        else:
+            results[name] = outcome
+    if callback_errors:
+        raise CallbackError(results, errors, callback_errors)
+    return results, errors
+
+
+def run_threaded(
+    calls: Dict[str, Callable[[], Any]],
+    max_workers: int = 1,
+    on_result: Optional[Callable[[str, Any], None]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    Sync counterpart of gather_bounded using a thread pool.
+
+    Args:
+        calls: Mapping of name -> zero-arg callable.
+        max_workers: Thread pool size. 1 runs the calls serially in the caller's thread.
+        on_result: Optional callback invoked in the caller's thread with (name, result)
+            as each call succeeds, in completion order.
+
+    Returns:
+        (results, errors) with the same isolation semantics as gather_bounded.
+
+    Raises:
+        CallbackError: If on_result raised, as in gather_bounded.
+    """
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+    callback_errors: Dict[str, Exception] = {}
+
+    def _deliver(name: str) -> None:
+        if on_result is None:
+            return
+        try:
+            on_result(name, results[name])
+        except Exception as exc:
+            callback_errors[name] = exc
+
+    if max_workers <= 1 or len(calls) <= 1:
+        for name, fn in calls.items():
+            try:
+                results[name] = fn()
+            except Exception as exc:
+                errors[name] = exc
+                continue
+            _deliver(name)
+        if callback_errors:
+            raise CallbackError(results, errors, callback_errors)
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as pool:
+        # Each call runs in a copy of the caller's context, so context variables (e.g. metric labels) carry over
+        futures = {pool.submit(contextvars.copy_context().run, fn): name for name, fn in calls.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as exc:
+                errors[name] = exc
+                continue
+            _deliver(name)
+    if callback_errors:
+        raise CallbackError(results, errors, callback_errors)
+    return results, errors
+
+
+def format_errors(errors: Dict[str, Exception]) -> str:
+    """Render a name -> exception mapping as a single readable line."""
+    return "; ".join(f"{name}: {type(exc).__name__}: {exc}" for name, exc in errors.items())
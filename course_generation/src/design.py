@@ -1,7 +1,11 @@
-from src.services.llm import client, async_client
+from src.services.llm import client, async_client, MODEL
 from src.utils import fast_search, async_fast_search
-from typing import Optional, Dict
-import json
+from src.services.streaming import TokenStream
+from src.checkpoint import CheckpointStore, MarkdownStore, config_hash, stage_key
+from src.module_parser import parse_design_modules
+from src.module_schema import parse_modules
+from src.prompts import Prompt, build_prompt
+from typing import Any, Optional, Dict, List
 
 
 class Design:
@@ -13,9 +17,27 @@ class Design:
     - Assessment planning
     """
     
-    def __init__(self, client = client, async_client = async_client):
+    def __init__(self, client = client, async_client = async_client, checkpoint_store: Optional[CheckpointStore] = None):
         self.client = client
         self.async_client = async_client
+        # New: where streamed artifacts are checkpointed (markdown files + manifest by default)
+        self.store = checkpoint_store or MarkdownStore()
+        # New: model and per-stage sampling params (both part of each stage's checkpoint key)
+        self.model = MODEL
+        self.sampling: Dict[str, Dict[str, Any]] = {
+            "course": {"max_tokens": 5000, "temperature": 0.7},
+            "syllabus": {"max_tokens": 5000, "temperature": 0.5},
+            "slides_plan": {"max_tokens": 5000, "temperature": 0.6},
+            "assessment_plan": {"max_tokens": 1200, "temperature": 0.5},
+            "modules": {"max_tokens": 3000, "temperature": 0.3, "response_format": {"type": "json_object"}},
+            "modules_repair": {"max_tokens": 1500, "temperature": 0.0, "response_format": {"type": "json_object"}},
+        }
+        # New: request JSON mode for module extraction; switched off if the endpoint rejects it
+        self.json_mode = True
+        # New: split modules with the local markdown parser, calling the LLM extractor only when
+        # the parse confidence (see src/module_parser.py) is below min_parse_confidence
+        self.local_module_parser = True
+        self.min_parse_confidence = 0.9
         
         # Predefined outline templates
         self.syllabus_template = """
@@ -114,6 +136,18 @@ class Design:
 |------------|--------|--------|-----------------|
 | [Assignment Title] | [Project/Exam/Presentation] | [% of final grade] | • [Criteria 1]: [Performance levels]<br>• [Criteria 2]: [Performance levels] |
 
+### Module 3: [Module Title]
+
+#### Formative Assessments
+| Assessment | Format | Duration | Objectives Measured | Weight |
+|------------|--------|----------|-------------------|--------|
+| [Assessment Name] | [Quiz/Discussion/Exercise] | [Time allocation] | [Specific learning outcomes] | [% of grade] |
+
+#### Summative Assessments
+| Assessment | Format | Weight | Rubric Criteria |
+|------------|--------|--------|-----------------|
+| [Assignment Title] | [Project/Exam/Presentation] | [% of final grade] | • [Criteria 1]: [Performance levels]<br>• [Criteria 2]: [Performance levels] |
+
 ### Final Assessment
 | Component | Description | Weight | Evaluation Criteria |
 |-----------|-------------|--------|-------------------|
@@ -138,153 +172,124 @@ class Design:
         """ 
         Design the course based on the analysis and return the design.
         """
-        prompt = f"""
-        You are an expert instructional designer. 
-        Based on the following analysis, design a detailed course plan following this EXACT structure with properly formatted tables:
-
-        {self.combined_template}
-
-        Analysis: {analysis}
-
-        Replace ALL bracketed placeholders with specific, detailed content based on the analysis. Maintain the markdown table formatting exactly as shown. Use bullet points within table cells where indicated (• symbol followed by <br> for line breaks).
-        """
+        prompt = self._course_prompt(analysis)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=5000,
-            temperature=0.7,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["course"],
         )
         return response.choices[0].message.content
 
-    def design_syllabus(self, analysis: str) -> str:
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Syllabus design following this EXACT table structure:
+    # Prompt builders shared by the sync, async and streaming variants. Instructions and templates
+    # form a static system prefix; the analysis goes last, in the user message.
+    def _course_prompt(self, analysis: str) -> Prompt:
+        return build_prompt(
+            "Based on the analysis in the user message, design a detailed course plan following this EXACT structure with properly formatted tables:",
+            self.combined_template,
+            "Replace ALL bracketed placeholders with specific, detailed content based on the analysis. Maintain the markdown table formatting exactly as shown. Use bullet points within table cells where indicated (• symbol followed by <br> for line breaks). Write one `### Module N: [Module Title]` section per syllabus module in both the slide and assessment plans, numbered as in the syllabus.",
+            [("Analysis", analysis)],
+        )
 
-        {self.syllabus_template}
+    def _syllabus_prompt(self, analysis: str) -> Prompt:
+        return build_prompt(
+            "Produce ONLY the Syllabus design for the analysis in the user message, following this EXACT table structure:",
+            self.syllabus_template,
+            "Replace ALL bracketed placeholders with specific module information, durations, and prerequisites based on the analysis. Maintain the markdown table formatting exactly as shown with proper alignment.",
+            [("Analysis", analysis)],
+        )
 
-        Analysis: {analysis}
-        
-        Replace ALL bracketed placeholders with specific module information, durations, and prerequisites based on the analysis. Maintain the markdown table formatting exactly as shown with proper alignment.
-        """
+    def _slides_prompt(self, analysis: str) -> Prompt:
+        return build_prompt(
+            "Produce ONLY the Slide planning for the analysis in the user message, following this EXACT table structure:",
+            self.slides_template,
+            "Replace ALL bracketed placeholders with specific slide titles, 3-5 key points per slide using bullet format (• followed by <br>), and detailed visual suggestions. Maintain the markdown table formatting exactly as shown. Write one `### Module N: [Module Title]` section for every module in the syllabus, numbered as in the syllabus.",
+            [("Analysis", analysis)],
+        )
+
+    def _assessments_prompt(self, analysis: str) -> Prompt:
+        return build_prompt(
+            "Produce ONLY the Assessment planning for the analysis in the user message, following this EXACT table structure:",
+            self.assessment_template,
+            "Replace ALL bracketed placeholders with specific assessment names, formats, durations, objectives measured, weights, and rubric criteria based on the analysis. Maintain the markdown table formatting exactly as shown. Write one `### Module N: [Module Title]` section for every module in the syllabus, numbered as in the syllabus.",
+            [("Analysis", analysis)],
+        )
+
+    def design_syllabus(self, analysis: str) -> str:
+        prompt = self._syllabus_prompt(analysis)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["syllabus"],
         )
         return response.choices[0].message.content
 
     async def async_design_syllabus(self, analysis: str) -> str:
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Syllabus design following this EXACT table structure:
-
-        {self.syllabus_template}
-
-        Analysis: {analysis}
-        
-        Replace ALL bracketed placeholders with specific module information, durations, and prerequisites based on the analysis. Maintain the markdown table formatting exactly as shown with proper alignment.
-        """
+        prompt = self._syllabus_prompt(analysis)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["syllabus"],
         )
         return response.choices[0].message.content
 
     def plan_slides(self, analysis: str) -> str:
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Slide planning following this EXACT table structure:
-
-        {self.slides_template}
-
-        Analysis: {analysis}
-        
-        Replace ALL bracketed placeholders with specific slide titles, 3-5 key points per slide using bullet format (• followed by <br>), and detailed visual suggestions. Maintain the markdown table formatting exactly as shown.
-        """
+        prompt = self._slides_prompt(analysis)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.6,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["slides_plan"],
         )
         return response.choices[0].message.content
 
     async def async_plan_slides(self, analysis: str) -> str:
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Slide planning following this EXACT table structure:
-
-        {self.slides_template}
-
-        Analysis: {analysis}
-        
-        Replace ALL bracketed placeholders with specific slide titles, 3-5 key points per slide using bullet format (• followed by <br>), and detailed visual suggestions. Maintain the markdown table formatting exactly as shown.
-        """
+        prompt = self._slides_prompt(analysis)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.6,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["slides_plan"],
         )
         return response.choices[0].message.content
 
     def plan_assessments(self, analysis: str) -> str:
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Assessment planning following this EXACT table structure
-        {self.assessment_template}
-        Analysis: {analysis}
-        Replace ALL bracketed placeholders with specific assessment names, formats, durations, objectives measured, weights, and rubric criteria based on the analysis. Maintain the markdown table formatting exactly as shown.
-        """
+        prompt = self._assessments_prompt(analysis)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=1200,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["assessment_plan"],
         )
         return response.choices[0].message.content
     
     async def async_plan_assessments(self, analysis: str) -> str:
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Assessment planning following this EXACT table structure
-        {self.assessment_template}
-        Analysis: {analysis}
-        Replace ALL bracketed placeholders with specific assessment names, formats, durations, objectives measured, weights, and rubric criteria based on the analysis. Maintain the markdown table formatting exactly as shown.
-        """
+        prompt = self._assessments_prompt(analysis)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=1200,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["assessment_plan"],
         )
         return response.choices[0].message.content
 
+    # Streaming variants: token deltas as an async iterator, checkpointed incrementally to checkpoint_path
+    # and saved through the store under the same stage key generate_course uses
+    def _stream(self, prompt: Prompt, stage: str, analysis: str, checkpoint_path: Optional[str]) -> TokenStream:
+        request = {
+            "model": self.model,
+            "messages": prompt.messages(),
+            **self.sampling[stage],
+        }
+        return TokenStream(
+            self.async_client, request, path=checkpoint_path, store=self.store,
+            key=stage_key(self.stage_fingerprint(stage), [analysis]), artifact=stage,
+        )
+
+    def stream_syllabus(self, analysis: str, checkpoint_path: Optional[str] = None) -> TokenStream:
+        return self._stream(self._syllabus_prompt(analysis), "syllabus", analysis, checkpoint_path)
+
+    def stream_slides(self, analysis: str, checkpoint_path: Optional[str] = None) -> TokenStream:
+        return self._stream(self._slides_prompt(analysis), "slides_plan", analysis, checkpoint_path)
+
+    def stream_assessments(self, analysis: str, checkpoint_path: Optional[str] = None) -> TokenStream:
+        return self._stream(self._assessments_prompt(analysis), "assessment_plan", analysis, checkpoint_path)
+
     async def async_design_course(
         self,
         analysis: str,
@@ -292,68 +297,104 @@ class Design:
         """ 
         Asynchronously design the course based on the analysis and return the design.
         """
-        prompt = f"""
-        You are an expert instructional designer. 
-        Based on the following analysis, design a detailed course plan following this EXACT structure with properly formatted tables:
-
-        {self.combined_template}
-
-        Analysis: {analysis}
-
-        Replace ALL bracketed placeholders with specific, detailed content based on the analysis. Maintain the markdown table formatting exactly as shown. Use bullet points within table cells where indicated (• symbol followed by <br> for line breaks).
-        """
+        prompt = self._course_prompt(analysis)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=5000,
-            temperature=0.7,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["course"],
         )
         return response.choices[0].message.content
     
-    def extract_modules_from_design_output(self, syllabus: str, slides: str, assessments: str) -> Dict[str, Dict[str, str]]:
+    def _modules_prompt(self, syllabus: str, slides: str, assessments: str, repair: str = "") -> Prompt:
+        """
+        Extraction prompt. A repair call sends the same system message and designs with the
+        invalid part of an earlier answer appended, so it reuses the extraction call's cached prefix.
+        """
+        template = """Response template: {
+    "modules": [
+        {
+            "module_title": "<Module Title>",
+            "script": "<Module Content>",
+            "slides_plan": "<Module Slides Plan Content>",
+            "assessment_plan": "<Module Assessment Plan Content>"
+        }
+    ]
+}"""
+        fields = [("Syllabus", syllabus), ("Slides", slides), ("Assessments", assessments)]
+        if repair:
+            fields.append(("Invalid part of an earlier answer", repair))
+        return build_prompt(
+            "Given the combined syllabus, slide planning, and assessment planning in the user message, extract each module's title, content outline, slide plan, and assessment plan.",
+            template,
+            "Provide the response as a single JSON object in the specified format, with every field a string. "
+            "If the user message ends with an invalid part of an earlier answer, return ONLY the corrected module(s) "
+            "from that part, completed from the designs.",
+            fields,
+            role="You are an expert course designer skilled at breaking down course designs into individual module components.",
+        )
+
+    def _modules_repair_prompt(self, syllabus: str, slides: str, assessments: str, fragment: str, problem: str) -> Prompt:
+        return self._modules_prompt(syllabus, slides, assessments, repair=f"({problem})\n{fragment[:4000]}")
+
+    def _modules_completion(self, prompt: Prompt, stage: str) -> str:
+        """Run one extraction call, in JSON mode unless the endpoint has rejected it."""
+        sampling = dict(self.sampling[stage])
+        if not self.json_mode:
+            sampling.pop("response_format", None)
+        messages = prompt.messages()
+        try:
+            response = self.client.chat.completions.create(model=self.model, messages=messages, **sampling)
+        except Exception as exc:
+            if "response_format" not in sampling or getattr(exc, "status_code", None) not in (400, 422):
+                raise
+            # Endpoint without JSON mode: ask for plain text from now on, the parser copes
+            self.json_mode = False
+            sampling.pop("response_format")
+            response = self.client.chat.completions.create(model=self.model, messages=messages, **sampling)
+        return response.choices[0].message.content or ""
+
+    def extract_modules_from_design_output(self, syllabus: str, slides: str, assessments: str) -> List[Dict[str, str]]:
         """
         Helper to extract individual module designs from combined syllabus, slides, and assessments text.
-        Returns a dict mapping module titles to their design components.
+        Returns a list of dicts with the module's title, script, slides_plan and assessment_plan.
+        The templated markdown is split locally when it parses with enough confidence. Otherwise
+        an LLM call extracts the modules; its output is parsed tolerantly (see src/module_schema.py)
+        and each module that still fails validation gets one small repair call.
+
+        Raises:
+            RuntimeError: If no module could be extracted even after repair.
         """
-        shared_content = f"""Generated designs:
-Syllabus: {syllabus}
-Slides: {slides}
-Assessments: {assessments}
-
-Response template: [
-    {{
-        "module_title": "<Module Title>",
-        "Scipt": "<Module Content>",
-        "slides_plan": "<Module Slides Plan Content>",
-        "assessment_plan": "<Module Assessment Plan Content>"
-    }}
-]
-"""
-        prompt = """
-        You are an expert course designer skilled at breaking down course designs into individual module components.
-        Given the combined syllabus, slide planning, and assessment planning, extract each module's title, content outline, slide plan, and assessment plan.
-        Provide the response in the specified JSON format.
+        if self.local_module_parser:
+            parsed = parse_design_modules(syllabus, slides, assessments)
+            if parsed.modules and parsed.confidence >= self.min_parse_confidence:
+                return parsed.modules
+        text = self._modules_completion(self._modules_prompt(syllabus, slides, assessments), "modules")
+        extraction = parse_modules(text)
+        for fragment in extraction.invalid:
+            repair = self._modules_repair_prompt(syllabus, slides, assessments, fragment.text, fragment.problem)
+            try:
+                repaired = self._modules_completion(repair, "modules_repair")
+            except Exception:
+                # A failed repair keeps the modules that already parsed (and the fragment's partial fields)
+                repaired = ""
+            extraction.resolve(fragment, parse_modules(repaired))
+        modules = extraction.modules
+        if not modules:
+            problems = "; ".join(fragment.problem for fragment in extraction.invalid)
+            raise RuntimeError(f"Module extraction returned no usable modules ({problems})")
+        return modules
+
+    def stage_fingerprint(self, stage: str) -> str:
         """
-        response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert course designer skilled at breaking down course designs into individual module components."},
-                {"role": "user", "content": prompt + shared_content},
-            ],
-            max_tokens=3000,
-            temperature=0.3,
-        )
-        modules_list = json.loads(response.choices[0].message.content.strip("```json").strip("```").strip())
-        modules_array = []
-        for module in modules_list:
-            modules_array.append({
-                "title": module["module_title"],
-                "script": module["Scipt"],
-                "slides_plan": module["slides_plan"],
-                "assessment_plan": module["assessment_plan"],
-            })
-
-        return modules_array
\ No newline at end of file
+        Hash of what shapes a stage's output besides its inputs: the prompt rendered with
+        placeholder inputs, the model and sampling params.
+        Stages: syllabus, slides_plan, assessment_plan, modules.
+        """
+        prompts = {
+            "syllabus": lambda: self._syllabus_prompt("{analysis}"),
+            "slides_plan": lambda: self._slides_prompt("{analysis}"),
+            "assessment_plan": lambda: self._assessments_prompt("{analysis}"),
+            "modules": lambda: self._modules_prompt("{syllabus}", "{slides}", "{assessments}"),
+        }
+        extra = {"local_parser": [self.local_module_parser, self.min_parse_confidence]} if stage == "modules" else {}
+        return config_hash(stage=stage, prompt=prompts[stage]().messages(), model=self.model, sampling=self.sampling[stage], **extra)
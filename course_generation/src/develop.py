@@ -1,9 +1,32 @@
-from src.services.llm import client, async_client
+from src.services.llm import client, async_client, MODEL
 from src.utils import fast_search, async_fast_search
-from typing import Optional, Dict
+from src.services.streaming import TokenStream
+from src.compaction import compact_context
+from src.checkpoint import CheckpointStore, MarkdownStore, atomic_write, config_hash, stage_key
+from src.services.metrics import metric_labels
+from src.prompts import Prompt, build_prompt
+from typing import Any, Optional, Dict
 import os
+import time
 import hashlib
 
+# Per-module artifacts and their checkpoint files, in dependency order
+MODULE_FILES = {
+    "shared_context": "shared_context.md",
+    "script": "script.md",
+    "slides": "slides.md",
+    "assessment": "assessment.md",
+    "combined": "combined.md",
+}
+# Artifacts each module stage is built from; their content is part of the stage's checkpoint key
+MODULE_STAGE_INPUTS = {
+    "shared_context": (),
+    "script": ("shared_context",),
+    "slides": ("shared_context", "script"),
+    "assessment": ("shared_context", "script", "slides"),
+    "combined": ("script", "slides", "assessment"),
+}
+
 class Develop:
     """
     Develop phase of the ADDIE model.
@@ -13,9 +36,28 @@ class Develop:
     - Assessment questions
     """
 
-    def __init__(self, client = client, async_client = async_client, checkpoint_dir: Optional[str] = None):
+    def __init__(
+        self,
+        client = client,
+        async_client = async_client,
+        checkpoint_dir: Optional[str] = None,
+        compact_research: bool = True,
+        context_token_budget: Optional[int] = 1200,
+        verify_checkpoints: bool = True,
+        checkpoint_store: Optional[CheckpointStore] = None,
+    ):
         self.client = client
         self.async_client = async_client
+        # New: research context is compacted per artifact before prompt injection
+        self.compact_research = compact_research
+        self.context_token_budget = context_token_budget
+        # New: model and per-stage sampling params (both part of each stage's checkpoint key)
+        self.model = MODEL
+        self.sampling: Dict[str, Dict[str, Any]] = {
+            "script": {"max_tokens": 5000, "temperature": 0.5},
+            "slides": {"max_tokens": 5000, "temperature": 0.5},
+            "assessment": {"max_tokens": 5000, "temperature": 0.5},
+        }
         # Structured templates for consistency (modeled after Analyze quality)
         self.script_template = """
 ## Module Script
@@ -175,22 +217,26 @@ class Develop:
 """
         # New: checkpoint directory for Develop artifacts
         self.checkpoint_dir = checkpoint_dir or ".develop_checkpoints"
+        # New: pluggable checkpoint backend (markdown files + manifest by default)
+        self.store = checkpoint_store or MarkdownStore(verify=verify_checkpoints)
 
     # --- Research helpers (shared context similar to Analyze) ---
-    def build_shared_research_context(
-        self,
-        module_title: str,
-        design: str,
-        course_name: Optional[str] = None,
-    ) -> str:
-        query = f"""
+    def _research_query(self, module_title: str, design: str, course_name: Optional[str] = None) -> str:
+        return f"""
         Research to inform Script, Presentation Plan, and Assessment for a single module.
         Course Name: {course_name or "[unspecified]"}
         Module Title: {module_title}
         Module Design/Outline: {design}
         Include: domain trends, prerequisite skills, common misconceptions, accessibility, recommended visuals/diagrams, best assessment practices, datasets/tools, standards/terminology.
         """
-        return fast_search(query)
+
+    def build_shared_research_context(
+        self,
+        module_title: str,
+        design: str,
+        course_name: Optional[str] = None,
+    ) -> str:
+        return fast_search(self._research_query(module_title, design, course_name))
 
     async def async_build_shared_research_context(
         self,
@@ -198,14 +244,7 @@ class Develop:
         design: str,
         course_name: Optional[str] = None,
     ) -> str:
-        query = f"""
-        Research to inform Script, Presentation Plan, and Assessment for a single module.
-        Course Name: {course_name or "[unspecified]"}
-        Module Title: {module_title}
-        Module Design/Outline: {design}
-        Include: domain trends, prerequisite skills, common misconceptions, accessibility, recommended visuals/diagrams, best assessment practices, datasets/tools, standards/terminology.
-        """
-        return await async_fast_search(query)
+        return await async_fast_search(self._research_query(module_title, design, course_name))
 
     # Helper to accept a file path or raw text
     def _ensure_text(self, maybe_text_or_path: str) -> str:
@@ -251,13 +290,11 @@ class Develop:
         key: str,
         checkpoint_dir: Optional[str] = None,
     ) -> str:
+        # Location only: the checkpoint store creates directories when it writes
         base = checkpoint_dir or self.checkpoint_dir
-        os.makedirs(base, exist_ok=True)
         course_slug = self._sanitize_name(course_name or "course")
         module_slug = self._sanitize_name(module_title)
-        path = os.path.join(base, f"{course_slug}-{module_slug}-{key}")
-        os.makedirs(path, exist_ok=True)
-        return path
+        return os.path.join(base, f"{course_slug}-{module_slug}-{key}")
 
     def _read_md(self, path: str) -> Optional[str]:
         if os.path.exists(path):
@@ -269,11 +306,68 @@ class Develop:
         return None
 
     def _write_md(self, path: str, content: str) -> None:
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(str(content or ""))
-        except Exception:
-            pass
+        # Temp file + rename, so a crash never leaves a half-written artifact behind
+        atomic_write(path, str(content or ""))
+
+    def stage_fingerprint(self, stage: str) -> str:
+        """
+        Hash of what shapes a module stage's output besides its inputs: the prompt rendered
+        with placeholder inputs, the model, sampling params and research compaction.
+        Stages: shared_context, script, slides, assessment, combined.
+        """
+        if stage == "shared_context":
+            return config_hash(stage=stage, query=self._research_query("{module_title}", "{design}", "{course_name}"))
+        if stage == "combined":
+            return config_hash(stage=stage, text=self.combine_materials("{script}", "{slides}", "{assessment}"))
+        prompts = {
+            "script": lambda: self._script_prompt("{design}", "{module_title}", ""),
+            "slides": lambda: self._slides_prompt("{design}", "{module_title}", "{script}", ""),
+            "assessment": lambda: self._assessment_prompt("{design}", "{module_title}", "{script}", "{slides}", ""),
+        }
+        return config_hash(
+            stage=stage,
+            prompt=prompts[stage]().messages(),
+            model=self.model,
+            sampling=self.sampling[stage],
+            compaction=(self.compact_research, self.context_token_budget),
+        )
+
+    def _module_stage_key(self, name: str, materials: Dict[str, str]) -> str:
+        return stage_key(self.stage_fingerprint(name), [materials[dep] for dep in MODULE_STAGE_INPUTS[name]])
+
+    def _reuse_module_artifact(self, art_dir: str, name: str, materials: Dict[str, str]) -> bool:
+        """
+        Load `name` into materials if its checkpoint was built under the current stage key, i.e.
+        with the same prompt, model and sampling params from the same inputs. Empty artifacts
+        are not reused, except shared_context which is legitimately empty when research is off.
+        """
+        content = self.store.read(art_dir, MODULE_FILES[name], key=self._module_stage_key(name, materials))
+        if content is None or (not content.strip() and name != "shared_context"):
+            return False
+        materials[name] = content
+        return True
+
+    def _save_module_artifact(self, art_dir: str, name: str, materials: Dict[str, str], elapsed: float) -> None:
+        model = None if name in ("shared_context", "combined") else self.model
+        self.store.write(
+            art_dir, MODULE_FILES[name], materials[name], artifact=name, model=model, elapsed=elapsed,
+            key=self._module_stage_key(name, materials),
+        )
+
+    def _module_art_dir(
+        self,
+        design: str,
+        module_title: str,
+        do_research: bool,
+        course_name: Optional[str],
+        checkpoint_dir: Optional[str],
+    ) -> str:
+        design_hash = hashlib.sha256(design.encode("utf-8")).hexdigest()[:16]
+        key = self._make_develop_key(course_name, module_title, design_hash, do_research, stage="develop")
+        return self._artifact_dir(course_name, module_title, key, checkpoint_dir)
+
+    def combine_materials(self, script: str, slides: str, assessment: str) -> str:
+        return f"Script:\n{script}\n\nSlides:\n{slides}\n\nAssessment:\n{assessment}"
 
     # --- Orchestrated module development (script -> slides -> assessment) ---
     def develop_module(
@@ -285,56 +379,39 @@ class Develop:
         use_checkpoint: bool = True,
         checkpoint_dir: Optional[str] = None,
     ) -> Dict[str, str]:
-        # New: checkpoint read for module artifacts
-        art_dir = None
-        script_path = slides_path = assess_path = combined_path = shared_ctx_path = None
-        if use_checkpoint:
-            design_hash = hashlib.sha256(design.encode("utf-8")).hexdigest()[:16]
-            key = self._make_develop_key(course_name, module_title, design_hash, do_research, stage="develop")
-            art_dir = self._artifact_dir(course_name, module_title, key, checkpoint_dir)
-            script_path = os.path.join(art_dir, "script.md")
-            slides_path = os.path.join(art_dir, "slides.md")
-            assess_path = os.path.join(art_dir, "assessment.md")
-            combined_path = os.path.join(art_dir, "combined.md")
-            shared_ctx_path = os.path.join(art_dir, "shared_context.md")
-            if all(os.path.exists(p) for p in [script_path, slides_path, assess_path, combined_path, shared_ctx_path]):
-                return {
-                    "script": self._read_md(script_path) or "",
-                    "slides": self._read_md(slides_path) or "",
-                    "assessment": self._read_md(assess_path) or "",
-                    "combined": self._read_md(combined_path) or "",
-                    "shared_context": self._read_md(shared_ctx_path) or "",
-                }
-
-        shared_context = (
-            self.build_shared_research_context(module_title, design, course_name) if do_research else ""
-        )
-        script = self.develop_module_script(
-            design, module_title, do_research=False, shared_context=shared_context
-        )
-        slides = self.develop_module_slides(
-            design, module_title, script=script, do_research=False, shared_context=shared_context
-        )
-        assessment = self.develop_module_assessment(
-            design, module_title, script=script, slides=slides, do_research=False, shared_context=shared_context
-        )
-        combined = f"Script:\n{script}\n\nSlides:\n{slides}\n\nAssessment:\n{assessment}"
-
-        # New: checkpoint save
-        if use_checkpoint and art_dir:
-            self._write_md(script_path, script)
-            self._write_md(slides_path, slides)
-            self._write_md(assess_path, assessment)
-            self._write_md(combined_path, combined)
-            self._write_md(shared_ctx_path, shared_context)
-
-        return {
-            "script": script,
-            "slides": slides,
-            "assessment": assessment,
-            "combined": combined,
-            "shared_context": shared_context,
+        """
+        Research -> script -> slides -> assessment for one module. With checkpoints, each
+        artifact is reused while its stage key matches; a changed template, model or sampling
+        param re-runs that stage and, through their keys, only the stages built from it.
+        """
+        art_dir = self._module_art_dir(design, module_title, do_research, course_name, checkpoint_dir) if use_checkpoint else None
+        materials: Dict[str, str] = {}
+        steps = {
+            "shared_context": lambda: (
+                self.build_shared_research_context(module_title, design, course_name) if do_research else ""
+            ),
+            "script": lambda: self.develop_module_script(
+                design, module_title, do_research=False, shared_context=materials["shared_context"]
+            ),
+            "slides": lambda: self.develop_module_slides(
+                design, module_title, script=materials["script"], do_research=False,
+                shared_context=materials["shared_context"],
+            ),
+            "assessment": lambda: self.develop_module_assessment(
+                design, module_title, script=materials["script"], slides=materials["slides"],
+                do_research=False, shared_context=materials["shared_context"],
+            ),
+            "combined": lambda: self.combine_materials(materials["script"], materials["slides"], materials["assessment"]),
         }
+        for name, produce in steps.items():
+            if art_dir and self._reuse_module_artifact(art_dir, name, materials):
+                continue
+            start = time.monotonic()
+            with metric_labels(stage=name, module=module_title):
+                materials[name] = produce()
+            if art_dir:
+                self._save_module_artifact(art_dir, name, materials, time.monotonic() - start)
+        return materials
 
     async def async_develop_module(
         self,
@@ -345,56 +422,94 @@ class Develop:
         use_checkpoint: bool = True,
         checkpoint_dir: Optional[str] = None,
     ) -> Dict[str, str]:
-        # New: checkpoint read for module artifacts
-        art_dir = None
-        script_path = slides_path = assess_path = combined_path = shared_ctx_path = None
-        if use_checkpoint:
-            design_hash = hashlib.sha256(design.encode("utf-8")).hexdigest()[:16]
-            key = self._make_develop_key(course_name, module_title, design_hash, do_research, stage="develop")
-            art_dir = self._artifact_dir(course_name, module_title, key, checkpoint_dir)
-            script_path = os.path.join(art_dir, "script.md")
-            slides_path = os.path.join(art_dir, "slides.md")
-            assess_path = os.path.join(art_dir, "assessment.md")
-            combined_path = os.path.join(art_dir, "combined.md")
-            shared_ctx_path = os.path.join(art_dir, "shared_context.md")
-            if all(os.path.exists(p) for p in [script_path, slides_path, assess_path, combined_path, shared_ctx_path]):
-                return {
-                    "script": self._read_md(script_path) or "",
-                    "slides": self._read_md(slides_path) or "",
-                    "assessment": self._read_md(assess_path) or "",
-                    "combined": self._read_md(combined_path) or "",
-                    "shared_context": self._read_md(shared_ctx_path) or "",
-                }
-
-        shared_context = (
-            await self.async_build_shared_research_context(module_title, design, course_name) if do_research else ""
-        )
-        script = await self.async_develop_module_script(
-            design, module_title, do_research=False, shared_context=shared_context
+        art_dir = self._module_art_dir(design, module_title, do_research, course_name, checkpoint_dir) if use_checkpoint else None
+        materials: Dict[str, str] = {}
+
+        async def _research():
+            if not do_research:
+                return ""
+            return await self.async_build_shared_research_context(module_title, design, course_name)
+
+        async def _combined():
+            return self.combine_materials(materials["script"], materials["slides"], materials["assessment"])
+
+        steps = {
+            "shared_context": _research,
+            "script": lambda: self.async_develop_module_script(
+                design, module_title, do_research=False, shared_context=materials["shared_context"]
+            ),
+            "slides": lambda: self.async_develop_module_slides(
+                design, module_title, script=materials["script"], do_research=False,
+                shared_context=materials["shared_context"],
+            ),
+            "assessment": lambda: self.async_develop_module_assessment(
+                design, module_title, script=materials["script"], slides=materials["slides"],
+                do_research=False, shared_context=materials["shared_context"],
+            ),
+            "combined": _combined,
+        }
+        for name, produce in steps.items():
+            if art_dir and self._reuse_module_artifact(art_dir, name, materials):
+                continue
+            start = time.monotonic()
+            with metric_labels(stage=name, module=module_title):
+                materials[name] = await produce()
+            if art_dir:
+                self._save_module_artifact(art_dir, name, materials, time.monotonic() - start)
+        return materials
+
+    def _context_for(self, context: Any, purpose: str, focus: str = "") -> Any:
+        """Keep only the research passages relevant to `purpose`, within the token budget."""
+        if not self.compact_research or not context:
+            return context
+        return compact_context(context, purpose, token_budget=self.context_token_budget, focus=focus)
+
+    # Prompt builders shared by the sync, async and streaming variants. Instructions and templates
+    # form a static system prefix shared by every module; module data goes last, in the user message.
+    def _script_prompt(self, design: str, module_title: str, context: Any) -> Prompt:
+        context = self._context_for(context, "script", focus=module_title)
+        return build_prompt(
+            "Produce ONLY the Script for the module in the user message, using this EXACT structure:",
+            self.script_template,
+            "Replace bracketed placeholders with specific, concise, and measurable content.\n"
+            "Maintain the markdown structure exactly as shown.",
+            [
+                ("Module Title", module_title),
+                ("Module Design/Outline", design),
+                ("Additional Context", context),
+            ],
         )
-        slides = await self.async_develop_module_slides(
-            design, module_title, script=script, do_research=False, shared_context=shared_context
+
+    def _slides_prompt(self, design: str, module_title: str, script: Optional[str], context: Any) -> Prompt:
+        context = self._context_for(context, "slides", focus=module_title)
+        return build_prompt(
+            "Produce ONLY the Presentation Plan (slides outline) for the module in the user message, using this EXACT structure:",
+            self.slides_template,
+            "Replace bracketed placeholders with specific slide titles, bullets, visuals, and notes.\n"
+            "Maintain the markdown structure exactly as shown.",
+            [
+                ("Module Title", module_title),
+                ("Module Design/Outline", design),
+                ("Previous Output - Script", script or "[not provided]"),
+                ("Additional Context", context),
+            ],
         )
-        assessment = await self.async_develop_module_assessment(
-            design, module_title, script=script, slides=slides, do_research=False, shared_context=shared_context
+
+    def _assessment_prompt(self, design: str, module_title: str, script: Optional[str], slides: Optional[str], context: Any) -> Prompt:
+        context = self._context_for(context, "assessment", focus=module_title)
+        return build_prompt(
+            "Produce ONLY the Assessment Package for the module in the user message, using this EXACT structure:",
+            self.assessment_template,
+            "Replace bracketed placeholders with specific, measurable assessment items aligned to learning objectives.\n"
+            "Maintain the markdown structure exactly as shown.",
+            [
+                ("Module Title", module_title),
+                ("Module Design/Outline", design),
+                ("Previous Output - Script", script or "[not provided]"),
+                ("Previous Output - Slides", slides or "[not provided]"),
+                ("Additional Context", context),
+            ],
         )
-        combined = f"Script:\n{script}\n\nSlides:\n{slides}\n\nAssessment:\n{assessment}"
-
-        # New: checkpoint save
-        if use_checkpoint and art_dir:
-            self._write_md(script_path, script)
-            self._write_md(slides_path, slides)
-            self._write_md(assess_path, assessment)
-            self._write_md(combined_path, combined)
-            self._write_md(shared_ctx_path, shared_context)
-
-        return {
-            "script": script,
-            "slides": slides,
-            "assessment": assessment,
-            "combined": combined,
-            "shared_context": shared_context,
-        }
 
     # --- Updated per-artifact generators (use templates + shared_context) ---
     def develop_module_script(
@@ -407,26 +522,11 @@ class Develop:
         context = shared_context if shared_context is not None else (fast_search(
             f"Best practices and key content for module '{module_title}'. Outline: {design}"
         ) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Script for the module: "{module_title}" using this EXACT structure:
-
-        {self.script_template}
-
-        Module Design/Outline: {design}
-        Additional Context: {context}
-
-        Replace bracketed placeholders with specific, concise, and measurable content.
-        Maintain the markdown structure exactly as shown.
-        """
+        prompt = self._script_prompt(design, module_title, context)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["script"],
         )
         return response.choices[0].message.content
 
@@ -440,26 +540,11 @@ class Develop:
         context = shared_context if shared_context is not None else (await async_fast_search(
             f"Best practices and key content for module '{module_title}'. Outline: {design}"
         ) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Script for the module: "{module_title}" using this EXACT structure:
-
-        {self.script_template}
-
-        Module Design/Outline: {design}
-        Additional Context: {context}
-
-        Replace bracketed placeholders with specific, concise, and measurable content.
-        Maintain the markdown structure exactly as shown.
-        """
+        prompt = self._script_prompt(design, module_title, context)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["script"],
         )
         return response.choices[0].message.content
 
@@ -474,27 +559,11 @@ class Develop:
         context = shared_context if shared_context is not None else (fast_search(
             f"Effective slide planning for module '{module_title}'. Outline: {design}"
         ) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Presentation Plan (slides outline) for the module: "{module_title}" using this EXACT structure:
-
-        {self.slides_template}
-
-        Module Design/Outline: {design}
-        Previous Output - Script: {script or "[not provided]"}
-        Additional Context: {context}
-
-        Replace bracketed placeholders with specific slide titles, bullets, visuals, and notes.
-        Maintain the markdown structure exactly as shown.
-        """
+        prompt = self._slides_prompt(design, module_title, script, context)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["slides"],
         )
         return response.choices[0].message.content
 
@@ -509,27 +578,11 @@ class Develop:
         context = shared_context if shared_context is not None else (await async_fast_search(
             f"Effective slide planning for module '{module_title}'. Outline: {design}"
         ) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Presentation Plan (slides outline) for the module: "{module_title}" using this EXACT structure:
-
-        {self.slides_template}
-
-        Module Design/Outline: {design}
-        Previous Output - Script: {script or "[not provided]"}
-        Additional Context: {context}
-
-        Replace bracketed placeholders with specific slide titles, bullets, visuals, and notes.
-        Maintain the markdown structure exactly as shown.
-        """
+        prompt = self._slides_prompt(design, module_title, script, context)
         response = await self.async_client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["slides"],
         )
         return response.choices[0].message.content
 
@@ -545,27 +598,78 @@ class Develop:
         context = shared_context if shared_context is not None else (fast_search(
             f"Assessment best practices for module '{module_title}'. Outline: {design}"
         ) if do_research else "")
-        prompt = f"""
-        You are an expert instructional designer.
-        Produce ONLY the Assessment Package for the module: "{module_title}" using this EXACT structure
-        {self.assessment_template}
-        Module Design/Outline: {design}
-        Previous Output - Script: {script or "[not provided]"}
-        Previous Output - Slides: {slides or "[not provided]"}
-
-        Additional Context: {context}   
-        Replace bracketed placeholders with specific, measurable assessment items aligned to learning objectives.
-        Maintain the markdown structure exactly as shown.
-        """
+        prompt = self._assessment_prompt(design, module_title, script, slides, context)
         response = self.client.chat.completions.create(
-            model="openai/gpt-oss-20b",
-            messages=[
-                {"role": "system", "content": "You are an expert instructional designer."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=5000,
-            temperature=0.5,
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["assessment"],
         )
         return response.choices[0].message.content
 
-    
\ No newline at end of file
+    async def async_develop_module_assessment(
+        self,
+        design: str,
+        module_title: str,
+        script: Optional[str] = None,
+        slides: Optional[str] = None,
+        do_research: bool = True,
+        shared_context: Optional[str] = None,
+    ) -> str:
+        context = shared_context if shared_context is not None else (await async_fast_search(
+            f"Assessment best practices for module '{module_title}'. Outline: {design}"
+        ) if do_research else "")
+        prompt = self._assessment_prompt(design, module_title, script, slides, context)
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=prompt.messages(),
+            **self.sampling["assessment"],
+        )
+        return response.choices[0].message.content
+
+    # --- Streaming variants: token deltas as an async iterator, checkpointed incrementally ---
+    # Research is not run here; pass the module's shared_context (e.g. from build_shared_research_context).
+    # The finished text is saved through self.store under the stage key develop_module uses.
+    def _stream(self, prompt: Prompt, stage: str, inputs: Dict[str, Any], checkpoint_path: Optional[str]) -> TokenStream:
+        request = {
+            "model": self.model,
+            "messages": prompt.messages(),
+            **self.sampling[stage],
+        }
+        return TokenStream(
+            self.async_client, request, path=checkpoint_path, store=self.store,
+            key=self._module_stage_key(stage, inputs), artifact=stage,
+        )
+
+    def stream_module_script(
+        self,
+        design: str,
+        module_title: str,
+        shared_context: Any = "",
+        checkpoint_path: Optional[str] = None,
+    ) -> TokenStream:
+        inputs = {"shared_context": shared_context}
+        return self._stream(self._script_prompt(design, module_title, shared_context), "script", inputs, checkpoint_path)
+
+    def stream_module_slides(
+        self,
+        design: str,
+        module_title: str,
+        script: Optional[str] = None,
+        shared_context: Any = "",
+        checkpoint_path: Optional[str] = None,
+    ) -> TokenStream:
+        inputs = {"shared_context": shared_context, "script": script}
+        return self._stream(self._slides_prompt(design, module_title, script, shared_context), "slides", inputs, checkpoint_path)
+
+    def stream_module_assessment(
+        self,
+        design: str,
+        module_title: str,
+        script: Optional[str] = None,
+        slides: Optional[str] = None,
+        shared_context: Any = "",
+        checkpoint_path: Optional[str] = None,
+    ) -> TokenStream:
+        inputs = {"shared_context": shared_context, "script": script, "slides": slides}
+        prompt = self._assessment_prompt(design, module_title, script, slides, shared_context)
+        return self._stream(prompt, "assessment", inputs, checkpoint_path)
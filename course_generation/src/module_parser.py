@@ -0,0 +1,139 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+# "### Module 2: Title", "## Module 2 - Title", "#### **Module 2. Title**"
+_MODULE_HEADING = re.compile(
+    r"^(?P<hashes>#{1,6})\s*\**\s*Module\s+(?P<number>\d+)\s*[:.\-\u2013\u2014]?\s*(?P<title>.*?)\**\s*$",
+    re.IGNORECASE,
+)
+_HEADING = re.compile(r"^(?P<hashes>#{1,6})\s")
+
+
+@dataclass
+class ModuleParse:
+    """
+    Modules split out of the design artifacts locally. `confidence` (0-1) is the share of
+    per-module slides/assessment sections found, halved when either plan disagrees with the
+    syllabus on the number of modules, so a parse missing any section stays at 0.5 or below
+    and is never accepted as complete; `problems` says what lowered it.
+    """
+
+    modules: List[Dict[str, str]]
+    confidence: float
+    problems: List[str] = field(default_factory=list)
+
+
+def _cell(value: str) -> str:
+    return re.sub(r"<br\s*/?>", "\n", value, flags=re.IGNORECASE).strip()
+
+
+def _table_rows(lines: List[str]) -> List[List[str]]:
+    return [[_cell(c) for c in line.strip().strip("|").split("|")] for line in lines]
+
+
+def _tables(text: str) -> List[Tuple[List[str], List[List[str]]]]:
+    """Every markdown table in text as (header, rows)."""
+    tables = []
+    block: List[str] = []
+    for line in (text or "").splitlines() + [""]:
+        if line.strip().startswith("|"):
+            block.append(line)
+            continue
+        if len(block) >= 2 and re.fullmatch(r"\|?[\s:\-|]+\|?", block[1].strip()):
+            header, *rows = _table_rows([block[0]] + block[2:])
+            tables.append(([h.strip("* ").lower() for h in header], rows))
+        block = []
+    return tables
+
+
+def module_sections(text: str) -> Dict[int, Tuple[str, str]]:
+    """
+    Map module number to (title, section) for each `Module N: Title` heading. A section runs
+    until the next heading of the same or a higher level, e.g. `### Presentation Guidelines`.
+    """
+    lines = (text or "").splitlines()
+    sections: Dict[int, Tuple[str, str]] = {}
+    i = 0
+    while i < len(lines):
+        match = _MODULE_HEADING.match(lines[i].strip())
+        if not match:
+            i += 1
+            continue
+        level = len(match.group("hashes"))
+        end = i + 1
+        while end < len(lines):
+            heading = _HEADING.match(lines[end].strip())
+            if heading and len(heading.group("hashes")) <= level:
+                break
+            end += 1
+        number = int(match.group("number"))
+        if number not in sections:
+            sections[number] = (match.group("title").strip(), "\n".join(lines[i:end]).strip())
+        i = end
+    return sections
+
+
+def syllabus_modules(syllabus: str) -> Dict[int, Tuple[str, str]]:
+    """
+    Map module number to (title, syllabus content) from the Module Structure table, or from
+    `Module N: Title` sections when the syllabus has no such table.
+    """
+    for header, rows in _tables(syllabus):
+        if "module" not in header or "title" not in header:
+            continue
+        number_col, title_col = header.index("module"), header.index("title")
+        modules: Dict[int, Tuple[str, str]] = {}
+        for row in rows:
+            if len(row) != len(header):
+                continue
+            number = re.search(r"\d+", row[number_col])
+            title = row[title_col].strip("* ")
+            if not number or not title:
+                continue
+            details = "\n".join(
+                f"**{name.title()}**: {value}" for name, value in zip(header, row) if name not in ("module", "title") and value
+            )
+            modules.setdefault(int(number.group()), (title, f"Module {number.group()}: {title}\n{details}".strip()))
+        if modules:
+            return modules
+    return module_sections(syllabus)
+
+
+def parse_design_modules(syllabus: str, slides: str, assessments: str) -> ModuleParse:
+    """
+    Split the syllabus, slide plan and assessment plan into per-module records (title, script,
+    slides_plan, assessment_plan) by module number, without an LLM call. Titles come from the
+    syllabus; a missing slides/assessment section leaves that field empty and lowers confidence.
+    """
+    outline = syllabus_modules(syllabus)
+    if not outline:
+        return ModuleParse([], 0.0, ["no modules found in the syllabus"])
+    slide_sections = module_sections(slides)
+    assessment_sections = module_sections(assessments)
+
+    modules: List[Dict[str, str]] = []
+    problems: List[str] = []
+    found = 0
+    for number in sorted(outline):
+        title, script = outline[number]
+        slides_plan = slide_sections.get(number, ("", ""))[1]
+        assessment_plan = assessment_sections.get(number, ("", ""))[1]
+        for name, section in (("slides", slides_plan), ("assessment", assessment_plan)):
+            if section:
+                found += 1
+            else:
+                problems.append(f"no {name} section for module {number}")
+        modules.append({"title": title, "script": script, "slides_plan": slides_plan, "assessment_plan": assessment_plan})
+
+    confidence = found / (2 * len(outline))
+    placeholders = [m["title"] for m in modules if re.fullmatch(r"\[.*\]", m["title"])]
+    if placeholders:
+        problems.append(f"placeholder titles {placeholders}")
+        confidence = 0.0
+    extra = sorted((set(slide_sections) | set(assessment_sections)) - set(outline))
+    if extra:
+        problems.append(f"sections for modules {extra} missing from the syllabus")
+    if extra or found < 2 * len(outline):
+        confidence /= 2
+    return ModuleParse(modules, round(confidence, 3), problems)
@@ -0,0 +1,245 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MODULE_FIELDS = ("title", "script", "slides_plan", "assessment_plan")
+
+# Accepted keys for each field, compared lowercase with non-letters removed
+_ALIASES = {
+    "title": ("module_title", "title", "module", "module_name", "name"),
+    "script": ("script", "scipt", "content", "module_content", "outline", "module_script"),
+    "slides_plan": ("slides_plan", "slides", "slide_plan", "slides_planning", "presentation_plan"),
+    "assessment_plan": ("assessment_plan", "assessment", "assessments", "assessment_planning"),
+}
+_KEY_TO_FIELD = {re.sub(r"[^a-z]", "", alias): name for name, aliases in _ALIASES.items() for alias in aliases}
+_OPENING = re.compile(r"[{\[]")
+
+
+@dataclass
+class InvalidFragment:
+    """One module (or the whole output) that did not validate, with what was recovered from it."""
+
+    index: int
+    text: str
+    problem: str
+    partial: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class ModuleExtraction:
+    """Parsed modules in output order; slots[i] holds the modules fragment i yielded (none if invalid)."""
+
+    slots: List[List[Dict[str, str]]]
+    invalid: List[InvalidFragment]
+
+    @property
+    def modules(self) -> List[Dict[str, str]]:
+        return [module for slot in self.slots for module in slot]
+
+    def resolve(self, fragment: InvalidFragment, repaired: "ModuleExtraction") -> bool:
+        """
+        Fill the invalid fragment's slot from a repair pass. Without a usable repair, a fragment
+        that at least has a title is kept with its missing fields empty. Returns True if repaired.
+        """
+        if repaired.modules:
+            self.slots[fragment.index] = repaired.modules
+            return True
+        if fragment.partial.get("title"):
+            self.slots[fragment.index] = [{name: fragment.partial.get(name, "") for name in MODULE_FIELDS}]
+        return False
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return "\n".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return "" if value is None else str(value)
+
+
+def validate_module(obj: Any) -> Tuple[Dict[str, str], List[str]]:
+    """Map an object's keys onto MODULE_FIELDS. Returns (fields found, problems)."""
+    if not isinstance(obj, dict):
+        return {}, [f"expected an object, got {type(obj).__name__}"]
+    found: Dict[str, str] = {}
+    for key, value in obj.items():
+        name = _KEY_TO_FIELD.get(re.sub(r"[^a-z]", "", str(key).lower()))
+        if name and name not in found:
+            found[name] = _text(value)
+    problems = [f"missing {name}" for name in MODULE_FIELDS if name not in found]
+    if "title" in found and not found["title"]:
+        problems.append("empty title")
+    return found, problems
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"```[a-zA-Z]*", "", text or "")
+
+
+def _span_end(text: str, start: int) -> int:
+    """Index just past the bracket closing the one at `start`, or -1 if it is never closed."""
+    depth, in_string, escaped = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _loads(text: str, accept: Optional[Callable[[Any], bool]] = None) -> Any:
+    """
+    The first JSON value in text that `accept` approves. Bracketed prose before the JSON (e.g.
+    "Modules [see below]:") is skipped; a value that is never closed stops the search, since
+    every later start lies inside it. Retries without trailing commas, then with smart quotes
+    as plain quotes (only as a fallback, since they are legitimate inside string values).
+    """
+    no_trailing_commas = re.sub(r",\s*([}\]])", r"\1", text)
+    attempts = (text, no_trailing_commas, no_trailing_commas.replace("\u201c", '"').replace("\u201d", '"'))
+    decoder = json.JSONDecoder()
+    error: Optional[ValueError] = None
+    for attempt in attempts:
+        match = _OPENING.search(attempt)
+        while match:
+            try:
+                value, end = decoder.raw_decode(attempt, match.start())
+            except ValueError as exc:
+                error = error or exc
+                end = _span_end(attempt, match.start())
+                if end < 0:
+                    break
+            else:
+                if accept is None or accept(value):
+                    return value
+            match = _OPENING.search(attempt, end)
+    raise error or ValueError("no JSON value found")
+
+
+def _module_list(value: Any) -> Optional[List[Any]]:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        for key in ("modules", "Modules"):
+            if isinstance(value.get(key), list):
+                return value[key]
+        lists = [v for v in value.values() if isinstance(v, list)]
+        if len(lists) == 1:
+            return lists[0]
+        if validate_module(value)[0].get("title"):
+            return [value]
+    return None
+
+
+def _has_objects(value: Any) -> bool:
+    """True for a module list (or wrapper) with at least one object, so `[1]` in prose is skipped."""
+    return any(isinstance(item, dict) for item in _module_list(value) or [])
+
+
+def _array_items(text: str) -> List[str]:
+    """Object fragments inside the first JSON array in text; the last may be unterminated."""
+    start = text.find("[")
+    if start < 0:
+        return []
+    items: List[str] = []
+    depth, in_string, escaped, begin = 0, False, False, None
+    for i in range(start + 1, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            if depth == 0 and ch == "{":
+                begin = i
+            depth += 1
+        elif ch in "}]":
+            if depth == 0:
+                break
+            depth -= 1
+            if depth == 0 and begin is not None:
+                items.append(text[begin:i + 1])
+                begin = None
+    if begin is not None:
+        items.append(text[begin:])
+    return items
+
+
+def _partial_fields(fragment: str) -> Dict[str, str]:
+    """Best-effort "key": "value" pairs from a fragment that is not valid JSON."""
+    found: Dict[str, str] = {}
+    for key, value in re.findall(r'"([^"\\]+)"\s*:\s*"((?:[^"\\]|\\.)*)"', fragment):
+        name = _KEY_TO_FIELD.get(re.sub(r"[^a-z]", "", key.lower()))
+        if name and name not in found:
+            try:
+                found[name] = json.loads(f'"{value}"').strip()
+            except ValueError:
+                found[name] = value.strip()
+    return found
+
+
+def parse_modules(text: str) -> ModuleExtraction:
+    """
+    Parse model output into modules. Accepts {"modules": [...]} or a bare list, code fences, prose
+    around the JSON, trailing commas, smart quotes, key variants (e.g. "Scipt") and a truncated
+    last module. Whatever still does not validate is returned as an InvalidFragment.
+    """
+    cleaned = _clean(text)
+    try:
+        items: Optional[List[Any]] = _module_list(_loads(cleaned, accept=_has_objects))
+    except ValueError:
+        items = None
+
+    slots: List[List[Dict[str, str]]] = []
+    invalid: List[InvalidFragment] = []
+    if items is not None:
+        for item in items:
+            found, problems = validate_module(item)
+            fragment = json.dumps(item, ensure_ascii=False) if problems else ""
+            _add(slots, invalid, found, problems, fragment)
+    else:
+        for fragment in _array_items(cleaned):
+            try:
+                found, problems = validate_module(_loads(fragment))
+            except ValueError as exc:
+                found, problems = _partial_fields(fragment), [f"invalid JSON ({exc})"]
+            _add(slots, invalid, found, problems, fragment)
+
+    if not slots:
+        slots.append([])
+        invalid.append(InvalidFragment(0, text or "", "no list of modules found"))
+    return ModuleExtraction(slots, invalid)
+
+
+def _add(
+    slots: List[List[Dict[str, str]]],
+    invalid: List[InvalidFragment],
+    found: Dict[str, str],
+    problems: List[str],
+    fragment: str,
+) -> None:
+    if problems:
+        slots.append([])
+        invalid.append(InvalidFragment(len(slots) - 1, fragment, "; ".join(problems), found))
+    else:
+        slots.append([found])
@@ -0,0 +1,311 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.checkpoint import CheckpointStore, MarkdownStore, stage_key
+from src.services.metrics import metric_labels
+
+
+@dataclass
+class Node:
+    """
+    One stage of the pipeline.
+
+    `fn` receives the artifacts named in `inputs` as keyword arguments. A node with a single
+    output returns that artifact; a node with several outputs returns a dict keyed by output
+    name. `checkpoints` maps outputs to file paths, read and written through the checkpoint store:
+    when every checkpointed output of a node is present and valid the node is not run.
+    `.json` files hold JSON, anything else the str() of the value. With a `fingerprint` (hash of
+    the node's prompt, model and sampling params), checkpoints are keyed by it plus the content
+    of the node's inputs, so a changed template re-runs the node and, transitively, its dependents.
+    `expand`, if set, is called with the node's outputs and returns nodes to add to the graph
+    (e.g. one develop chain per extracted module). `pool` names the concurrency limit the node
+    counts against; None means unlimited (cheap local work). `stage` and `module` label the
+    node's LLM/research calls in the metrics (stage defaults to the node name). Empty
+    checkpoints are not restored, as in generate_course/develop_module, unless `allow_empty`
+    (research context, legitimately empty when research is off).
+    """
+
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    checkpoints: Dict[str, str] = field(default_factory=dict)
+    expand: Optional[Callable[[Dict[str, Any]], List["Node"]]] = None
+    pool: Optional[str] = "llm"
+    fingerprint: Optional[str] = None
+    stage: Optional[str] = None
+    module: Optional[str] = None
+    allow_empty: bool = False
+
+
+@dataclass
+class PipelineResult:
+    artifacts: Dict[str, Any]
+    errors: Dict[str, Exception]
+    timings: Dict[str, Dict[str, Any]]
+    blocked: Dict[str, List[str]]
+
+
+_MISSING = object()
+
+
+def _load(store: CheckpointStore, path: str, key: Optional[str], allow_empty: bool = False) -> Any:
+    """Checkpointed value from the store, or _MISSING if absent, invalid, empty or built under another key."""
+    text = store.read(os.path.dirname(path) or ".", os.path.basename(path), key=key)
+    if text is None or not (text.strip() or allow_empty):
+        return _MISSING
+    return json.loads(text) if path.endswith(".json") else text
+
+
+def _save(store: CheckpointStore, path: str, value: Any, artifact: str, elapsed: float, key: Optional[str]) -> None:
+    text = json.dumps(value, ensure_ascii=False, indent=2) if path.endswith(".json") else str(value or "")
+    store.write(os.path.dirname(path) or ".", os.path.basename(path), text, artifact=artifact, elapsed=elapsed, key=key)
+
+
+class Scheduler:
+    """
+    Run a dependency graph of Nodes, starting each node as soon as all of its inputs exist.
+
+    `limits` caps concurrently running nodes per pool (e.g. {"llm": 8, "research": 4}), so
+    wall time follows the critical path rather than the sum of all calls. A failed node
+    only blocks the nodes downstream of it; everything else still runs.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        use_checkpoint: bool = True,
+        store: Optional[CheckpointStore] = None,
+    ):
+        self.limits = limits or {}
+        self.use_checkpoint = use_checkpoint
+        self.store = store or MarkdownStore()
+
+    def _key(self, node: Node, artifacts: Dict[str, Any]) -> Optional[str]:
+        if node.fingerprint is None:
+            return None
+        return stage_key(node.fingerprint, [artifacts[name] for name in node.inputs])
+
+    def _restore(self, node: Node, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not self.use_checkpoint or not node.checkpoints:
+            return None
+        if set(node.checkpoints) != set(node.outputs):
+            return None
+        restored = {}
+        for name, path in node.checkpoints.items():
+            try:
+                value = _load(self.store, path, key, node.allow_empty)
+            except ValueError:
+                return None
+            if value is _MISSING:
+                return None
+            restored[name] = value
+        return restored
+
+    async def _execute(self, node: Node, artifacts: Dict[str, Any], semaphores: Dict[str, asyncio.Semaphore]) -> Tuple[Dict[str, Any], bool]:
+        key = self._key(node, artifacts)
+        restored = self._restore(node, key)
+        if restored is not None:
+            return restored, True
+        kwargs = {name: artifacts[name] for name in node.inputs}
+        semaphore = semaphores.get(node.pool) if node.pool else None
+        with metric_labels(stage=node.stage or node.name, module=node.module):
+            if semaphore is None:
+                start = time.monotonic()
+                value = await node.fn(**kwargs)
+            else:
+                async with semaphore:
+                    start = time.monotonic()
+                    value = await node.fn(**kwargs)
+        elapsed = time.monotonic() - start
+        outputs = {node.outputs[0]: value} if len(node.outputs) == 1 else dict(value or {})
+        missing = [name for name in node.outputs if name not in outputs]
+        if missing:
+            raise RuntimeError(f"Node {node.name!r} did not produce {', '.join(missing)}")
+        if self.use_checkpoint:
+            for name, path in node.checkpoints.items():
+                _save(self.store, path, outputs[name], name, elapsed, key)
+        return outputs, False
+
+    async def run(self, nodes: List[Node], artifacts: Optional[Dict[str, Any]] = None) -> PipelineResult:
+        artifacts = dict(artifacts or {})
+        semaphores = {pool: asyncio.Semaphore(limit) for pool, limit in self.limits.items() if limit and limit > 0}
+        waiting: Dict[str, Node] = {}
+        running: Dict[asyncio.Task, Tuple[Node, float]] = {}
+        errors: Dict[str, Exception] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+
+        def _add(new_nodes: List[Node]) -> None:
+            for node in new_nodes:
+                if node.name in waiting or node.name in timings or any(n.name == node.name for n, _ in running.values()):
+                    raise RuntimeError(f"Duplicate pipeline node {node.name!r}")
+                waiting[node.name] = node
+
+        def _start_ready() -> None:
+            for name in [n for n, node in waiting.items() if all(i in artifacts for i in node.inputs)]:
+                node = waiting.pop(name)
+                task = asyncio.ensure_future(self._execute(node, artifacts, semaphores))
+                running[task] = (node, time.monotonic())
+
+        _add(nodes)
+        try:
+            _start_ready()
+            while running:
+                done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node, started = running.pop(task)
+                    timings[node.name] = {"seconds": round(time.monotonic() - started, 3), "cached": False}
+                    if task.exception() is not None:
+                        exc = task.exception()
+                        if not isinstance(exc, Exception):
+                            raise exc
+                        errors[node.name] = exc
+                        continue
+                    outputs, cached = task.result()
+                    timings[node.name]["cached"] = cached
+                    artifacts.update(outputs)
+                    if node.expand is not None:
+                        _add(node.expand(outputs))
+                _start_ready()
+        finally:
+            for task in running:
+                task.cancel()
+
+        blocked = {name: [i for i in node.inputs if i not in artifacts] for name, node in waiting.items()}
+        return PipelineResult(artifacts=artifacts, errors=errors, timings=timings, blocked=blocked)
+
+
+def course_graph(
+    addie: Any,
+    course_name: str,
+    course_description: str,
+    learning_objectives: str,
+    course_path: str,
+    do_research: bool = True,
+    develop: bool = True,
+) -> List[Node]:
+    """
+    ADDIE as a graph: research -> objectives/audience/resources -> combined analysis ->
+    syllabus/slides plan/assessment plan -> module extraction -> per module:
+    research -> script -> slides -> assessment. Checkpoint files and stage keys follow
+    generate_course and develop_module, so either path can resume the other's work.
+    """
+    analyze, design, dev = addie.analyze, addie.design, addie.develop
+    args = (course_name, course_description, learning_objectives)
+
+    def _md(name: str) -> Dict[str, str]:
+        return {name: os.path.join(course_path, f"{name}.md")}
+
+    async def research():
+        if not do_research:
+            return ""
+        return await analyze.async_build_shared_research_context(*args)
+
+    async def combine(objectives, audience, resources):
+        return analyze.combine_analysis(objectives, audience, resources)
+
+    async def extract(syllabus, slides_plan, assessment_plan):
+        return await asyncio.to_thread(design.extract_modules_from_design_output, syllabus, slides_plan, assessment_plan)
+
+    def module_nodes(outputs: Dict[str, Any]) -> List[Node]:
+        modules = outputs["modules"]
+        designs = [addie._module_design(module) for module in modules]
+        owners = addie._module_owners(modules, designs)
+        nodes = []
+        for i in sorted(set(owners)):
+            nodes.extend(_module_chain(i, modules[i]["title"], designs[i]))
+        return nodes
+
+    def _module_chain(i: int, title: str, module_design: str) -> List[Node]:
+        art_dir = dev._module_art_dir(module_design, title, do_research, course_name, addie._module_dir(course_path, title))
+
+        def ckpt(artifact: str) -> Dict[str, str]:
+            return {f"{artifact}:{i}": os.path.join(art_dir, f"{artifact}.md")}
+
+        async def module_research():
+            if not do_research:
+                return ""
+            return await dev.async_build_shared_research_context(title, module_design, course_name)
+
+        async def script(**kw):
+            return await dev.async_develop_module_script(
+                module_design, title, do_research=False, shared_context=kw[f"shared_context:{i}"]
+            )
+
+        async def slides(**kw):
+            return await dev.async_develop_module_slides(
+                module_design, title, script=kw[f"script:{i}"], do_research=False, shared_context=kw[f"shared_context:{i}"]
+            )
+
+        async def assessment(**kw):
+            return await dev.async_develop_module_assessment(
+                module_design, title, script=kw[f"script:{i}"], slides=kw[f"slides:{i}"],
+                do_research=False, shared_context=kw[f"shared_context:{i}"],
+            )
+
+        async def module_combined(**kw):
+            return dev.combine_materials(kw[f"script:{i}"], kw[f"slides:{i}"], kw[f"assessment:{i}"])
+
+        # Inputs are listed in MODULE_STAGE_INPUTS order so stage keys match develop_module's
+        ctx = f"shared_context:{i}"
+        fp = dev.stage_fingerprint
+        labels = {"module": title}
+        return [
+            Node(f"module_research:{i}", module_research, (), (ctx,), ckpt("shared_context"), pool="research",
+                 fingerprint=fp("shared_context"), stage="shared_context", allow_empty=True, **labels),
+            Node(f"script:{i}", script, (ctx,), (f"script:{i}",), ckpt("script"), fingerprint=fp("script"),
+                 stage="script", **labels),
+            Node(f"slides:{i}", slides, (ctx, f"script:{i}"), (f"slides:{i}",), ckpt("slides"), fingerprint=fp("slides"),
+                 stage="slides", **labels),
+            Node(f"assessment:{i}", assessment, (ctx, f"script:{i}", f"slides:{i}"), (f"assessment:{i}",),
+                 ckpt("assessment"), fingerprint=fp("assessment"), stage="assessment", **labels),
+            Node(
+                f"module_combined:{i}", module_combined, (f"script:{i}", f"slides:{i}", f"assessment:{i}"),
+                (f"combined:{i}",), ckpt("combined"), pool=None, fingerprint=fp("combined"), stage="combined", **labels,
+            ),
+        ]
+
+    async def analyze_objectives(shared_context):
+        return await analyze.async_analyze_objectives(*args, do_research=False, shared_context=shared_context)
+
+    async def analyze_audience(shared_context):
+        return await analyze.async_analyze_audience(*args, do_research=False, shared_context=shared_context)
+
+    async def analyze_resources(shared_context):
+        return await analyze.async_analyze_resources(*args, do_research=False, shared_context=shared_context)
+
+    # Inputs are listed in COURSE_STAGE_INPUTS order so stage keys match generate_course's
+    fp = addie._course_fingerprint
+    nodes = [
+        Node("research", research, (), ("shared_context",), _md("shared_context"), pool="research",
+             fingerprint=fp("shared_context"), stage="shared_context", allow_empty=True),
+        Node("objectives", analyze_objectives, ("shared_context",), ("objectives",), _md("objectives"),
+             fingerprint=fp("objectives")),
+        Node("audience", analyze_audience, ("shared_context",), ("audience",), _md("audience"),
+             fingerprint=fp("audience")),
+        Node("resources", analyze_resources, ("shared_context",), ("resources",), _md("resources"),
+             fingerprint=fp("resources")),
+        Node(
+            "analysis_combined", combine, ("objectives", "audience", "resources"), ("analysis_combined",),
+            _md("analysis_combined"), pool=None, fingerprint=fp("combined"),
+        ),
+        Node("syllabus", lambda analysis_combined: design.async_design_syllabus(analysis_combined),
+             ("analysis_combined",), ("syllabus",), _md("syllabus"), fingerprint=fp("syllabus")),
+        Node("slides_plan", lambda analysis_combined: design.async_plan_slides(analysis_combined),
+             ("analysis_combined",), ("slides_plan",), _md("slides_plan"), fingerprint=fp("slides_plan")),
+        Node("assessment_plan", lambda analysis_combined: design.async_plan_assessments(analysis_combined),
+             ("analysis_combined",), ("assessment_plan",), _md("assessment_plan"), fingerprint=fp("assessment_plan")),
+    ]
+    if develop:
+        nodes.append(
+            Node(
+                "modules", extract, ("syllabus", "slides_plan", "assessment_plan"), ("modules",),
+                {"modules": os.path.join(course_path, "modules.json")}, expand=module_nodes,
+                fingerprint=design.stage_fingerprint("modules"),
+            )
+        )
+    return nodes
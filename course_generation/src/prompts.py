@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+ROLE = "You are an expert instructional designer."
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """
+    A chat prompt laid out for provider prefix (KV) caching. `instructions` is the system
+    message: role, task, template and formatting rules, byte-identical for every course and
+    module. `data` is the user message with everything that varies per call, so it comes last
+    and vLLM/OpenAI-style servers can reuse the cached prefill of the instructions.
+    """
+
+    instructions: str
+    data: str
+
+    def messages(self) -> List[Dict[str, str]]:
+        return [{"role": "system", "content": self.instructions}, {"role": "user", "content": self.data}]
+
+
+def _value(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def build_prompt(
+    task: str,
+    template: str = "",
+    rules: str = "",
+    fields: Sequence[Tuple[str, Any]] = (),
+    role: str = ROLE,
+) -> Prompt:
+    """
+    Static parts (role, task, template, rules) go into the instructions and must not mention
+    per-course data; `fields` are (label, value) pairs rendered in order as "Label: value".
+    """
+    instructions = "\n\n".join(part.strip() for part in (role, task, template, rules) if part and part.strip())
+    data = "\n\n".join(f"{label}: {_value(value)}" for label, value in fields)
+    return Prompt(instructions, data)
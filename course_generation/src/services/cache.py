@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.services.wrapper import AsyncChatClientWrapper, ChatClientWrapper, Record, to_plain
+
+
+class DiskCache:
+    """
+    Content-addressed JSON store on disk with LRU eviction.
+
+    Entries live in `<directory>/<key[:2]>/<key>.json` and are written atomically
+    (temp file + rename). The file mtime is the entry's `created_at`, so lookups and
+    eviction age entries by the same clock; a hit refreshes the access time, which is
+    the LRU clock. Eviction drops entries older than `max_age` seconds and then the
+    least recently used ones until the store is within `max_bytes` / `max_entries`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = 30 * 24 * 3600,
+        evict_every: int = 64,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.evict_every = evict_every
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        created_at = entry.get("created_at", 0)
+        now = time.time()
+        if self.max_age is not None and now - created_at > self.max_age:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path, (now, created_at))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        created_at = time.time()
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"created_at": created_at, "value": value}, f, ensure_ascii=False)
+            os.utime(tmp_path, (created_at, created_at))
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            return
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self) -> int:
+        """Apply age and size limits now. Returns the number of entries removed."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_atime, st.st_mtime, st.st_size, path))
+        entries.sort()  # least recently used first
+
+        now = time.time()
+        removed = 0
+        if self.max_age is not None:
+            fresh = []
+            for entry in entries:
+                if now - entry[1] > self.max_age:
+                    self._remove(entry[3])
+                    removed += 1
+                else:
+                    fresh.append(entry)
+            entries = fresh
+
+        total = sum(entry[2] for entry in entries)
+        while entries and (
+            (self.max_bytes is not None and total > self.max_bytes)
+            or (self.max_entries is not None and len(entries) > self.max_entries)
+        ):
+            _, _, size, path = entries.pop(0)
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "writes": self._writes}
+
+
+def request_key(kwargs: Dict[str, Any]) -> str:
+    """Hash of the full completion request (model, messages, sampling params, ...)."""
+    blob = json.dumps(to_plain(kwargs), sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _cacheable(kwargs: Dict[str, Any]) -> bool:
+    return not kwargs.get("stream")
+
+
+def _from_cache(value: Any) -> Record:
+    record = Record(value)
+    record.cache_hit = True
+    return record
+
+
+class CachedClient(ChatClientWrapper):
+    """
+    Sync client wrapper that serves byte-identical completion requests from a DiskCache.
+    Streaming requests are passed through uncached.
+    """
+
+    def __init__(self, client: Any, cache: DiskCache):
+        super().__init__(client)
+        self.cache = cache
+
+    def create(self, **kwargs: Any) -> Any:
+        if not _cacheable(kwargs):
+            return self.client.chat.completions.create(**kwargs)
+        key = request_key(kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return _from_cache(cached)
+        response = self.client.chat.completions.create(**kwargs)
+        self.cache.set(key, to_plain(response))
+        return response
+
+
+class AsyncCachedClient(AsyncChatClientWrapper):
+    """Async counterpart of CachedClient; disk access runs off the event loop."""
+
+    def __init__(self, client: Any, cache: DiskCache):
+        super().__init__(client)
+        self.cache = cache
+
+    async def create(self, **kwargs: Any) -> Any:
+        if not _cacheable(kwargs):
+            return await self.client.chat.completions.create(**kwargs)
+        key = request_key(kwargs)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return _from_cache(cached)
+        response = await self.client.chat.completions.create(**kwargs)
+        await asyncio.to_thread(self.cache.set, key, to_plain(response))
+        return response
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and indentation so differently formatted f-string queries share a key."""
+    return " ".join((query or "").split())
+
+
+def research_key(endpoint: str, query: str) -> str:
+    """Key of a researcher API call: endpoint plus whitespace-normalized query."""
+    blob = f"{endpoint}\n{normalize_query(query)}".encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class ResearchCache(DiskCache):
+    """
+    TTL cache for researcher API payloads, keyed on endpoint + normalized query text.
+    `ttl` is the maximum age of an entry in seconds; hits/misses are counted by DiskCache.
+    """
+
+    def __init__(self, directory: str, ttl: float = 12 * 3600, **kwargs: Any):
+        super().__init__(directory, max_age=ttl, **kwargs)
+        self.ttl = ttl
+
+    def key(self, endpoint: str, query: str) -> str:
+        return research_key(endpoint, query)
+
+    def lookup(self, endpoint: str, query: str) -> Optional[Dict[str, Any]]:
+        return self.get(self.key(endpoint, query))
+
+    def store(self, endpoint: str, query: str, data: Dict[str, Any]) -> None:
+        self.set(self.key(endpoint, query), data)
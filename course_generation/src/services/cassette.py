@@ -0,0 +1,217 @@
+import asyncio
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.services.cache import request_key
+from src.services.wrapper import AsyncChatClientWrapper, ChatClientWrapper, Record, to_plain
+
+
+class CassetteMiss(RuntimeError):
+    """A replayed request has no recording in the cassette."""
+
+
+class Cassette:
+    """
+    Record/replay store for LLM completions and researcher API payloads.
+
+    A cassette is a gzip-compressed JSONL file with one entry per call: its kind ("llm" or
+    "research"), the request key, the response (or stream chunks) and the recorded latency.
+
+    mode="record" truncates the file and appends every call as it completes. mode="replay"
+    serves calls from the file without touching the network; repeated identical requests get
+    their recorded responses in order (the last one once they run out) and an unknown request
+    raises CassetteMiss. Replays return instantly unless `latency_scale` (a multiple of the
+    recorded latency) or a fixed `latency` in seconds is set.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        latency_scale: float = 0.0,
+        latency: Optional[float] = None,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Cassette mode must be 'record' or 'replay', got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.latency = latency
+        self.recorded = 0
+        self.played = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._last: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._file = None
+        if mode == "record":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+            atexit.register(self.close)
+        else:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    self._entries.setdefault((entry["kind"], entry["key"]), deque()).append(entry)
+        except EOFError:
+            # Recording was interrupted before the gzip trailer; every flushed entry is intact
+            pass
+        except (OSError, ValueError, KeyError) as exc:
+            raise RuntimeError(f"Could not read cassette {self.path}: {exc}") from exc
+
+    def record(self, kind: str, key: str, response: Any, elapsed: float, stream: bool = False) -> None:
+        entry = {"kind": kind, "key": key, "elapsed": round(elapsed, 4), "response": response}
+        if stream:
+            entry["stream"] = True
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.recorded += 1
+
+    def play(self, kind: str, key: str) -> Tuple[Dict[str, Any], float]:
+        """Return the next recorded entry for this request and how long to wait before serving it."""
+        with self._lock:
+            queue = self._entries.get((kind, key))
+            if queue:
+                entry = queue.popleft()
+                self._last[(kind, key)] = entry
+            else:
+                entry = self._last.get((kind, key))
+            if entry is None:
+                raise CassetteMiss(f"No {kind} recording for request {key[:12]} in {self.path}")
+            self.played += 1
+        delay = self.latency if self.latency is not None else entry.get("elapsed", 0.0) * self.latency_scale
+        return entry, max(0.0, delay)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"recorded": self.recorded, "played": self.played}
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """
+        Cassette configured by CASSETTE (path), CASSETTE_MODE (record/replay; default replay if
+        the file exists, else record) and CASSETTE_LATENCY_SCALE; None when CASSETTE is unset.
+        """
+        path = os.getenv("CASSETTE")
+        if not path:
+            return None
+        mode = os.getenv("CASSETTE_MODE") or ("replay" if os.path.exists(path) else "record")
+        return cls(path, mode=mode, latency_scale=float(os.getenv("CASSETTE_LATENCY_SCALE", "0")))
+
+
+def _replayed(entry: Dict[str, Any]) -> Any:
+    if entry.get("stream"):
+        return [Record(chunk) for chunk in entry["response"]]
+    return Record(entry["response"])
+
+
+class CassetteClient(ChatClientWrapper):
+    """Sync client wrapper recording completions to, or replaying them from, a Cassette."""
+
+    def __init__(self, client: Any, cassette: Cassette):
+        super().__init__(client)
+        self.cassette = cassette
+
+    def create(self, **kwargs: Any) -> Any:
+        key = request_key(kwargs)
+        if self.cassette.replaying:
+            entry, delay = self.cassette.play("llm", key)
+            if delay:
+                time.sleep(delay)
+            replayed = _replayed(entry)
+            return iter(replayed) if entry.get("stream") else replayed
+        start = time.monotonic()
+        response = self.client.chat.completions.create(**kwargs)
+        if kwargs.get("stream"):
+            return self._record_stream(response, key, start)
+        self.cassette.record("llm", key, to_plain(response), time.monotonic() - start)
+        return response
+
+    def _record_stream(self, stream: Any, key: str, start: float) -> Iterator[Any]:
+        chunks: List[Any] = []
+        for chunk in stream:
+            chunks.append(to_plain(chunk))
+            yield chunk
+        self.cassette.record("llm", key, chunks, time.monotonic() - start, stream=True)
+
+
+async def _aiter(items: List[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+class AsyncCassetteClient(AsyncChatClientWrapper):
+    """Async counterpart of CassetteClient."""
+
+    def __init__(self, client: Any, cassette: Cassette):
+        super().__init__(client)
+        self.cassette = cassette
+
+    async def create(self, **kwargs: Any) -> Any:
+        key = request_key(kwargs)
+        if self.cassette.replaying:
+            entry, delay = self.cassette.play("llm", key)
+            if delay:
+                await asyncio.sleep(delay)
+            replayed = _replayed(entry)
+            return _aiter(replayed) if entry.get("stream") else replayed
+        start = time.monotonic()
+        response = await self.client.chat.completions.create(**kwargs)
+        if kwargs.get("stream"):
+            return self._record_stream(response, key, start)
+        self.cassette.record("llm", key, to_plain(response), time.monotonic() - start)
+        return response
+
+    async def _record_stream(self, stream: Any, key: str, start: float) -> AsyncIterator[Any]:
+        chunks: List[Any] = []
+        async for chunk in stream:
+            chunks.append(to_plain(chunk))
+            yield chunk
+        self.cassette.record("llm", key, chunks, time.monotonic() - start, stream=True)
+
+
+# Process-wide cassette for research calls (src.utils) and the default LLM clients (src.services.llm).
+# Set from the environment on import; see Cassette.from_env.
+_cassette: Optional[Cassette] = Cassette.from_env()
+
+
+def get_cassette() -> Optional[Cassette]:
+    return _cassette
+
+
+def set_cassette(cassette: Optional[Cassette]) -> None:
+    """Record or replay research calls through `cassette` (None disables)."""
+    global _cassette
+    _cassette = cassette
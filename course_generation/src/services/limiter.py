@@ -0,0 +1,341 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from src.services.wrapper import AsyncChatClientWrapper, ChatClientWrapper
+
+OVERLOAD_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def status_of(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by an SDK error (openai.APIStatusError and similar), if any."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_timeout(exc: BaseException) -> bool:
+    return isinstance(exc, (TimeoutError, asyncio.TimeoutError)) or "Timeout" in type(exc).__name__
+
+
+def is_overload(exc: BaseException) -> bool:
+    """True for errors that signal server pressure: 429, 5xx and timeouts."""
+    status = status_of(exc)
+    return (status is not None and (status in OVERLOAD_STATUSES or status >= 500)) or is_timeout(exc)
+
+
+class _Waiter:
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+        self.granted = False
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on in-flight LLM requests, shared by sync threads and async tasks.
+
+    Every successful call raises the limit by `increase / limit` (about +1 per window of
+    calls). A 429, 5xx or timeout cuts it by `backoff`; so does a call whose latency exceeds
+    `latency_tolerance` times the best latency seen recently. Latency is compared per
+    completion token when usage is reported, so long generations are not mistaken for
+    congestion. Cuts are applied at most once per `cooldown` seconds so one burst of errors
+    counts as a single congestion signal. Waiters are admitted in FIFO order.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_backoff: float = 0.9,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._last_cut = 0.0
+        self._baseline: Optional[float] = None
+        self._latency_ewma: Optional[float] = None
+        self.successes = 0
+        self.overloads = 0
+        self.slow_calls = 0
+        self.errors = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _grant_locked(self) -> None:
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self._in_flight += 1
+            if waiter.event is not None:
+                waiter.event.set()
+            else:
+                waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+
+    def acquire(self) -> None:
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+        waiter.event.wait()
+
+    async def async_acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            waiter = _Waiter(loop)
+            self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was granted as we were cancelled; hand it on without feedback
+            with self._lock:
+                self._in_flight -= 1
+                self._grant_locked()
+            raise
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        error: Optional[BaseException] = None,
+        completion_tokens: Optional[int] = None,
+    ) -> None:
+        """
+        Free a slot and feed the outcome back into the limit. `latency` is None for calls
+        that carry no latency signal (e.g. streams closed early); errors other than
+        overloads are neutral.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            if error is not None:
+                if is_overload(error):
+                    self.overloads += 1
+                    self._cut_locked(self.backoff, now)
+                else:
+                    self.errors += 1
+            else:
+                self.successes += 1
+                if latency is not None and self._is_slow_locked(latency, completion_tokens):
+                    self.slow_calls += 1
+                    self._cut_locked(self.latency_backoff, now)
+                else:
+                    self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+            self._grant_locked()
+
+    def _is_slow_locked(self, latency: float, completion_tokens: Optional[int]) -> bool:
+        sample = latency / completion_tokens if completion_tokens else latency
+        self._latency_ewma = sample if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * sample
+        if self._baseline is None or sample < self._baseline:
+            self._baseline = sample
+            return False
+        # Let the baseline drift up slowly so a permanently slower backend is re-learned
+        self._baseline += 0.01 * (sample - self._baseline)
+        return sample > self.latency_tolerance * self._baseline
+
+    def _cut_locked(self, factor: float, now: float) -> None:
+        if now - self._last_cut < self.cooldown:
+            return
+        self._last_cut = now
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "queue_depth": len(self._waiters),
+                "successes": self.successes,
+                "overloads": self.overloads,
+                "slow_calls": self.slow_calls,
+                "errors": self.errors,
+                "latency_ewma": self._latency_ewma,
+            }
+
+
+def _completion_tokens(response: Any) -> Optional[int]:
+    return getattr(getattr(response, "usage", None), "completion_tokens", None)
+
+
+class _LimitedStream:
+    """
+    Stream that holds a limiter slot until it is exhausted, fails, is closed or is garbage
+    collected, so a stream that is never iterated cannot leak its slot. A completed stream
+    reports its latency per completion token (from the usage chunk, else the chunk count).
+    """
+
+    def __init__(self, stream: Any, limiter: AdaptiveLimiter, start: float):
+        self._stream = stream
+        self._iterator: Any = None
+        self._limiter = limiter
+        self._start = start
+        self._chunks = 0
+        self._completion_tokens: Optional[int] = None
+        self._released = False
+        self._release_lock = threading.Lock()
+
+    def _release(self, error: Optional[BaseException] = None, completed: bool = False) -> None:
+        with self._release_lock:
+            if self._released:
+                return
+            self._released = True
+        latency = time.monotonic() - self._start if completed else None
+        self._limiter.release(latency, error=error, completion_tokens=self._completion_tokens or self._chunks or None)
+
+    def _observe(self, chunk: Any) -> None:
+        self._chunks += 1
+        tokens = _completion_tokens(chunk)
+        if tokens is not None:
+            self._completion_tokens = tokens
+
+    def __iter__(self) -> "_LimitedStream":
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            if self._iterator is None:
+                self._iterator = iter(self._stream)
+            chunk = next(self._iterator)
+        except StopIteration:
+            self._release(completed=True)
+            raise
+        except BaseException as exc:
+            self._release(error=exc if isinstance(exc, Exception) else None)
+            raise
+        self._observe(chunk)
+        return chunk
+
+    def close(self) -> None:
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._release()
+
+    def __enter__(self) -> "_LimitedStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self._release()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+class _AsyncLimitedStream(_LimitedStream):
+    """Async counterpart of _LimitedStream."""
+
+    def __aiter__(self) -> "_AsyncLimitedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            if self._iterator is None:
+                self._iterator = self._stream.__aiter__()
+            chunk = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._release(completed=True)
+            raise
+        except BaseException as exc:
+            self._release(error=exc if isinstance(exc, Exception) else None)
+            raise
+        self._observe(chunk)
+        return chunk
+
+    async def close(self) -> None:
+        try:
+            close = getattr(self._stream, "close", None) or getattr(self._stream, "aclose", None)
+            if close is not None:
+                await close()
+        finally:
+            self._release()
+
+    async def aclose(self) -> None:
+        await self.close()
+
+    async def __aenter__(self) -> "_AsyncLimitedStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+class LimitedClient(ChatClientWrapper):
+    """
+    Sync client wrapper admitting requests through an AdaptiveLimiter.
+    Streaming requests hold their slot until the stream is exhausted, closed or collected.
+    """
+
+    def __init__(self, client: Any, limiter: Optional[AdaptiveLimiter] = None):
+        super().__init__(client)
+        self.limiter = limiter or AdaptiveLimiter()
+
+    def create(self, **kwargs: Any) -> Any:
+        self.limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = self.client.chat.completions.create(**kwargs)
+        except BaseException as exc:
+            self.limiter.release(error=exc)
+            raise
+        if kwargs.get("stream"):
+            return _LimitedStream(response, self.limiter, start)
+        self.limiter.release(time.monotonic() - start, completion_tokens=_completion_tokens(response))
+        return response
+
+
+class AsyncLimitedClient(AsyncChatClientWrapper):
+    """Async counterpart of LimitedClient."""
+
+    def __init__(self, client: Any, limiter: Optional[AdaptiveLimiter] = None):
+        super().__init__(client)
+        self.limiter = limiter or AdaptiveLimiter()
+
+    async def create(self, **kwargs: Any) -> Any:
+        await self.limiter.async_acquire()
+        start = time.monotonic()
+        try:
+            response = await self.client.chat.completions.create(**kwargs)
+        except BaseException as exc:
+            self.limiter.release(error=exc)
+            raise
+        if kwargs.get("stream"):
+            return _AsyncLimitedStream(response, self.limiter, start)
+        self.limiter.release(time.monotonic() - start, completion_tokens=_completion_tokens(response))
+        return response
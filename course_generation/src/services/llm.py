@@ -1,6 +1,17 @@
 from openai import OpenAI, AsyncOpenAI
-import os 
+import os
+from typing import Any, Optional, Tuple
 
+from src.services.cache import AsyncCachedClient, CachedClient, DiskCache
+from src.services.cassette import AsyncCassetteClient, Cassette, CassetteClient, get_cassette
+from src.services.limiter import AdaptiveLimiter, AsyncLimitedClient, LimitedClient
+from src.services.metrics import AsyncMeteredClient, MeteredClient, MetricsRecorder, metrics
+from src.services.resilience import AsyncResilientClient, Hedger, ResilientClient, RetryPolicy
+from src.services.singleflight import AsyncSingleFlightClient, SingleFlightClient
+
+
+# Model served by the self-hosted endpoint; recorded in checkpoint manifests
+MODEL = "openai/gpt-oss-20b"
 
 client = OpenAI(
     api_key = os.getenv("OPENAI_API_KEY"),
@@ -12,3 +23,91 @@ async_client = AsyncOpenAI(
     base_url = os.getenv("OPENAI_BASE_URL")
 )
 
+
+def wrap_clients(
+    client: Any,
+    async_client: Any,
+    cache_dir: Optional[str] = None,
+    cache: Optional[DiskCache] = None,
+    singleflight: bool = False,
+    limiter: Optional[AdaptiveLimiter] = None,
+    retry: Optional[RetryPolicy] = None,
+    hedger: Optional[Hedger] = None,
+    metrics: Optional[MetricsRecorder] = None,
+    cassette: Optional[Cassette] = None,
+) -> Tuple[Any, Any]:
+    """
+    Stack optional layers around a sync/async client pair and return the wrapped pair.
+    Both wrapped clients share the same layer state (e.g. one response cache).
+
+    Args:
+        client: OpenAI-compatible sync client.
+        async_client: OpenAI-compatible async client.
+        cache_dir: Directory for a persistent response cache (ignored if `cache` is given).
+        cache: Pre-built DiskCache to serve identical requests from.
+        singleflight: Coalesce concurrent identical requests into one upstream call.
+        limiter: AdaptiveLimiter bounding in-flight upstream requests. It is the innermost
+            layer, so cache hits and coalesced callers never take a slot.
+        retry: RetryPolicy for classified retries. The SDK's own retries are turned off so
+            attempts are not multiplied; each retry and hedge takes its own limiter slot.
+        hedger: Hedger sending a duplicate request once a call exceeds the recent p95 latency.
+        cassette: Cassette recording every completion, or replaying them without calling the
+            wrapped client. It sits just inside metrics, so replayed calls are still metered.
+        metrics: MetricsRecorder receiving latency, token usage and cache hits of every call.
+            It is the outermost layer, so cache hits are recorded too.
+    """
+    if retry is not None or hedger is not None:
+        if hasattr(client, "with_options"):
+            client = client.with_options(max_retries=0)
+        if hasattr(async_client, "with_options"):
+            async_client = async_client.with_options(max_retries=0)
+    if limiter is not None:
+        client = LimitedClient(client, limiter)
+        async_client = AsyncLimitedClient(async_client, limiter)
+    if retry is not None or hedger is not None:
+        client = ResilientClient(client, retry, hedger)
+        async_client = AsyncResilientClient(async_client, retry, hedger)
+    if singleflight:
+        client = SingleFlightClient(client)
+        async_client = AsyncSingleFlightClient(async_client)
+    if cache is None and cache_dir:
+        cache = DiskCache(cache_dir)
+    if cache is not None:
+        client = CachedClient(client, cache)
+        async_client = AsyncCachedClient(async_client, cache)
+    if cassette is not None:
+        client = CassetteClient(client, cassette)
+        async_client = AsyncCassetteClient(async_client, cassette)
+    if metrics is not None:
+        client = MeteredClient(client, metrics)
+        async_client = AsyncMeteredClient(async_client, metrics)
+    return client, async_client
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+# Opt-in layers for the default clients: LLM_CACHE_DIR enables the persistent response cache,
+# LLM_SINGLEFLIGHT=1 coalesces concurrent identical requests, LLM_ADAPTIVE_LIMIT=1 enables the
+# AIMD limiter (LLM_MAX_CONCURRENCY caps it). `limiter.stats()` reports limit and queue depth.
+# LLM_RETRIES=N retries rate limits, timeouts and 5xx with jittered backoff; LLM_HEDGE=1 hedges
+# calls slower than the recent p95. Every call is recorded in `src.services.metrics.metrics`.
+# CASSETTE=path records LLM and research traffic to a cassette, or replays it (see Cassette.from_env).
+limiter: Optional[AdaptiveLimiter] = None
+if _env_flag("LLM_ADAPTIVE_LIMIT"):
+    limiter = AdaptiveLimiter(max_limit=int(os.getenv("LLM_MAX_CONCURRENCY", "64")))
+retry: Optional[RetryPolicy] = RetryPolicy(max_retries=int(os.environ["LLM_RETRIES"])) if os.getenv("LLM_RETRIES") else None
+hedger: Optional[Hedger] = Hedger() if _env_flag("LLM_HEDGE") else None
+
+client, async_client = wrap_clients(
+    client,
+    async_client,
+    cache_dir=os.getenv("LLM_CACHE_DIR"),
+    singleflight=_env_flag("LLM_SINGLEFLIGHT"),
+    limiter=limiter,
+    retry=retry,
+    hedger=hedger,
+    metrics=metrics,
+    cassette=get_cassette(),
+)
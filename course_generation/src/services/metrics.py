@@ -0,0 +1,330 @@
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.services.wrapper import AsyncChatClientWrapper, ChatClientWrapper
+
+# Pipeline position of the current call; set by the orchestrators with `metric_labels`
+_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("metrics_stage", default=None)
+_module: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("metrics_module", default=None)
+
+# Latency histogram bucket bounds (seconds) for the Prometheus export
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+@contextlib.contextmanager
+def metric_labels(stage: Optional[str] = None, module: Optional[str] = None) -> Iterator[None]:
+    """Label every LLM/research call made inside the block (threads via run_threaded, tasks too)."""
+    tokens = []
+    if stage is not None:
+        tokens.append((_stage, _stage.set(stage)))
+    if module is not None:
+        tokens.append((_module, _module.set(module)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+@dataclass
+class CallRecord:
+    """One LLM or research call. `target` is the model for LLM calls, the endpoint for research."""
+
+    kind: str
+    target: str
+    stage: Optional[str]
+    module: Optional[str]
+    latency: float
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    cache_hit: bool = False
+    error: Optional[str] = None
+    timestamp: float = 0.0
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _aggregate(records: List[CallRecord]) -> Dict[str, Any]:
+    latencies = sorted(r.latency for r in records)
+    upstream = [r for r in records if not r.cache_hit]
+    out: Dict[str, Any] = {
+        "calls": len(records),
+        "errors": sum(1 for r in records if r.error),
+        "cache_hits": len(records) - len(upstream),
+        "latency_total": round(sum(latencies), 3),
+        "latency_mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+        "latency_p50": round(_percentile(latencies, 0.5), 3) if latencies else None,
+        "latency_p95": round(_percentile(latencies, 0.95), 3) if latencies else None,
+        "latency_max": round(latencies[-1], 3) if latencies else None,
+    }
+    if any(r.kind == "llm" for r in records):
+        out["prompt_tokens"] = sum(r.prompt_tokens or 0 for r in upstream)
+        out["completion_tokens"] = sum(r.completion_tokens or 0 for r in upstream)
+        out["cached_tokens"] = sum(r.cached_tokens or 0 for r in upstream)
+        out["cached_ratio"] = round(out["cached_tokens"] / out["prompt_tokens"], 3) if out["prompt_tokens"] else None
+    return out
+
+
+def _escape(value: Any) -> str:
+    return str(value or "").replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRecorder:
+    """
+    Collects one CallRecord per LLM and research call.
+
+    The last `max_records` calls are kept for the JSON export and `summary()` (per kind,
+    stage and module: call/error/cache-hit counts, latency percentiles and, for LLM calls,
+    prompt, completion and provider-cached prompt tokens of calls that actually reached the
+    model). Cumulative counters behind `prometheus()` are kept separately, so they never
+    drop samples in long-running workers.
+    """
+
+    def __init__(self, max_records: int = 100_000):
+        self._lock = threading.Lock()
+        self.records: Deque[CallRecord] = deque(maxlen=max_records)
+        self._counters: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    def record(
+        self,
+        kind: str,
+        target: str,
+        latency: float,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        cached_tokens: Optional[int] = None,
+        cache_hit: bool = False,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        entry = CallRecord(
+            kind=kind,
+            target=target,
+            stage=_stage.get(),
+            module=_module.get(),
+            latency=latency,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            cache_hit=cache_hit,
+            error=f"{type(error).__name__}: {error}" if error is not None else None,
+            timestamp=time.time(),
+        )
+        with self._lock:
+            self.records.append(entry)
+            counters = self._counters.setdefault(
+                (kind, entry.stage or "", target),
+                {"calls": 0, "errors": 0, "cache_hits": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                 "cached_tokens": 0, "latency_sum": 0.0, "buckets": [0] * len(LATENCY_BUCKETS)},
+            )
+            counters["calls"] += 1
+            counters["errors"] += int(error is not None)
+            counters["cache_hits"] += int(cache_hit)
+            if not cache_hit:
+                counters["prompt_tokens"] += prompt_tokens or 0
+                counters["completion_tokens"] += completion_tokens or 0
+                counters["cached_tokens"] += cached_tokens or 0
+            counters["latency_sum"] += latency
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    counters["buckets"][i] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records.clear()
+            self._counters.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-run aggregates: totals per kind, then per stage and per module."""
+        with self._lock:
+            records = list(self.records)
+        out: Dict[str, Any] = {"totals": {}, "stages": {}, "modules": {}}
+        for kind in sorted({r.kind for r in records}):
+            of_kind = [r for r in records if r.kind == kind]
+            out["totals"][kind] = _aggregate(of_kind)
+            for stage in sorted({r.stage or "" for r in of_kind}):
+                out["stages"].setdefault(stage, {})[kind] = _aggregate([r for r in of_kind if (r.stage or "") == stage])
+            for module in sorted({r.module for r in of_kind if r.module}):
+                out["modules"].setdefault(module, {})[kind] = _aggregate([r for r in of_kind if r.module == module])
+        return out
+
+    def to_json(self, include_records: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            records = [asdict(r) for r in self.records] if include_records else []
+        data: Dict[str, Any] = {"summary": self.summary()}
+        if include_records:
+            data["records"] = records
+        return data
+
+    def write_json(self, path: str, include_records: bool = True) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(include_records), f, ensure_ascii=False, indent=2)
+
+    def prometheus(self) -> str:
+        """Cumulative counters and latency histograms in the Prometheus text exposition format."""
+        with self._lock:
+            counters = {key: dict(value, buckets=list(value["buckets"])) for key, value in self._counters.items()}
+        lines: List[str] = []
+
+        def _family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def _labels(key: Tuple[str, str, str], **extra: str) -> str:
+            kind, stage, target = key
+            pairs = {"kind": kind, "stage": stage, "target": target, **extra}
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + "}"
+
+        for name, field, help_text in (
+            ("addie_calls_total", "calls", "LLM and research calls."),
+            ("addie_call_errors_total", "errors", "Calls that raised."),
+            ("addie_cache_hits_total", "cache_hits", "Calls served from a cache."),
+        ):
+            _family(name, "counter", help_text)
+            for key, value in sorted(counters.items()):
+                lines.append(f"{name}{_labels(key)} {value[field]}")
+        _family(
+            "addie_tokens_total",
+            "counter",
+            "Tokens sent to and generated by the model (cache hits excluded); type=cached is the part of "
+            "the prompt tokens the provider served from its prefix cache.",
+        )
+        for key, value in sorted(counters.items()):
+            if key[0] == "llm":
+                lines.append(f"addie_tokens_total{_labels(key, type='prompt')} {value['prompt_tokens']}")
+                lines.append(f"addie_tokens_total{_labels(key, type='completion')} {value['completion_tokens']}")
+                lines.append(f"addie_tokens_total{_labels(key, type='cached')} {value['cached_tokens']}")
+        _family("addie_call_latency_seconds", "histogram", "Call latency in seconds.")
+        for key, value in sorted(counters.items()):
+            for bound, count in zip(LATENCY_BUCKETS, value["buckets"]):
+                lines.append(f"addie_call_latency_seconds_bucket{_labels(key, le=str(bound))} {count}")
+            lines.append(f"addie_call_latency_seconds_bucket{_labels(key, le='+Inf')} {value['calls']}")
+            lines.append(f"addie_call_latency_seconds_sum{_labels(key)} {value['latency_sum']:.6f}")
+            lines.append(f"addie_call_latency_seconds_count{_labels(key)} {value['calls']}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide recorder used by the default clients and the research helpers
+metrics = MetricsRecorder()
+
+
+def serve_prometheus(port: int, recorder: Optional[MetricsRecorder] = None, host: str = "") -> ThreadingHTTPServer:
+    """Serve `recorder.prometheus()` at /metrics from a daemon thread; call .shutdown() to stop."""
+    recorder = recorder or metrics
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = recorder.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def _usage(response: Any) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """(prompt, completion, cached prompt) tokens; cached comes from usage.prompt_tokens_details."""
+    usage = getattr(response, "usage", None)
+    cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+    return getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None), cached
+
+
+class MeteredClient(ChatClientWrapper):
+    """
+    Sync client wrapper recording latency, token usage and cache hits of every completion.
+    It is the outermost layer, so cache hits and retried/hedged calls count once each.
+    Streams are recorded when exhausted, with usage from the final chunk if the server sends it.
+    """
+
+    def __init__(self, client: Any, recorder: Optional[MetricsRecorder] = None):
+        super().__init__(client)
+        self.recorder = recorder or metrics
+
+    def create(self, **kwargs: Any) -> Any:
+        model = str(kwargs.get("model", ""))
+        start = time.monotonic()
+        try:
+            response = self.client.chat.completions.create(**kwargs)
+        except Exception as exc:
+            self.recorder.record("llm", model, time.monotonic() - start, error=exc)
+            raise
+        if kwargs.get("stream"):
+            return self._record_after(response, model, start)
+        self.recorder.record(
+            "llm", model, time.monotonic() - start, *_usage(response), cache_hit=bool(getattr(response, "cache_hit", False))
+        )
+        return response
+
+    def _record_after(self, stream: Any, model: str, start: float) -> Iterator[Any]:
+        last = None
+        error = None
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    last = chunk
+                yield chunk
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self.recorder.record("llm", model, time.monotonic() - start, *_usage(last), error=error)
+
+
+class AsyncMeteredClient(AsyncChatClientWrapper):
+    """Async counterpart of MeteredClient."""
+
+    def __init__(self, client: Any, recorder: Optional[MetricsRecorder] = None):
+        super().__init__(client)
+        self.recorder = recorder or metrics
+
+    async def create(self, **kwargs: Any) -> Any:
+        model = str(kwargs.get("model", ""))
+        start = time.monotonic()
+        try:
+            response = await self.client.chat.completions.create(**kwargs)
+        except Exception as exc:
+            self.recorder.record("llm", model, time.monotonic() - start, error=exc)
+            raise
+        if kwargs.get("stream"):
+            return self._record_after(response, model, start)
+        self.recorder.record(
+            "llm", model, time.monotonic() - start, *_usage(response), cache_hit=bool(getattr(response, "cache_hit", False))
+        )
+        return response
+
+    async def _record_after(self, stream: Any, model: str, start: float) -> AsyncIterator[Any]:
+        last = None
+        error = None
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    last = chunk
+                yield chunk
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self.recorder.record("llm", model, time.monotonic() - start, *_usage(last), error=error)
@@ -0,0 +1,287 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from src.services.limiter import is_timeout, status_of
+from src.services.wrapper import AsyncChatClientWrapper, ChatClientWrapper
+from src.utils import backoff_delay
+
+
+def classify_error(exc: BaseException) -> Optional[str]:
+    """
+    Map an LLM call failure to a retry class: "rate_limit" (429), "timeout", "server" (5xx,
+    408/409) or "connection". Returns None for errors that retrying cannot fix.
+    """
+    status = status_of(exc)
+    if status == 429:
+        return "rate_limit"
+    if is_timeout(exc):
+        return "timeout"
+    if status is not None:
+        return "server" if status >= 500 or status in (408, 409) else None
+    if isinstance(exc, ConnectionError) or "Connection" in type(exc).__name__:
+        return "connection"
+    return None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Classified retries with full-jitter exponential backoff.
+
+    `max_retries` applies per class in `retry_on`, so with the default of 3 a call may retry
+    three rate limits and then three timeouts; backoff grows with the retries of that class.
+    A 429 waits at least as long as its Retry-After header (capped at `backoff_max`).
+    `attempt_timeout`, if set, is passed to each attempt as the SDK `timeout` so a stuck
+    request is abandoned and retried.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        retry_on: tuple = ("rate_limit", "timeout", "server", "connection"),
+        attempt_timeout: Optional[float] = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_on = frozenset(retry_on)
+        self.attempt_timeout = attempt_timeout
+
+    def delay(self, attempt: int, exc: BaseException) -> Optional[float]:
+        """
+        Seconds to wait before retrying `exc`, or None to give up. `attempt` is the number of
+        retries this call has already made for the same error class (see `classify_error`).
+        """
+        kind = classify_error(exc)
+        if kind not in self.retry_on or attempt >= self.max_retries:
+            return None
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+        retry_after = _retry_after(exc) if kind == "rate_limit" else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+
+class Hedger:
+    """
+    Tracks recent completion latencies and decides when to send a duplicate request.
+
+    The hedge delay is the p95 of the last `window` latencies (at least `min_delay`);
+    until `min_samples` latencies are known nothing is hedged. `max_ratio` caps hedges
+    as a fraction of calls so a slow backend is not flooded with duplicates.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 1.0,
+        max_ratio: float = 0.1,
+    ):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> Optional[float]:
+        """Hedge delay for a new call, or None if this call should not be hedged."""
+        with self._lock:
+            self.calls += 1
+            if len(self._latencies) < self.min_samples or self.hedges >= self.max_ratio * self.calls:
+                return None
+            ordered = sorted(self._latencies)
+            p = ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+            return max(self.min_delay, p)
+
+    def record_hedge(self, won: bool) -> None:
+        with self._lock:
+            self.hedges += 1
+            self.hedge_wins += int(won)
+
+
+class _Counters:
+    """Call/retry/failure counters shared by the sync and async wrappers."""
+
+    def _init_counters(self) -> None:
+        self._counter_lock = threading.Lock()
+        self.calls = 0
+        self.retries: Dict[str, int] = {}
+        self.failures = 0
+
+    def _count_retry(self, exc: BaseException) -> None:
+        kind = classify_error(exc)
+        with self._counter_lock:
+            self.retries[kind] = self.retries.get(kind, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            out: Dict[str, Any] = {"calls": self.calls, "retries": dict(self.retries), "failures": self.failures}
+        if self.hedger is not None:
+            out.update({"hedges": self.hedger.hedges, "hedge_wins": self.hedger.hedge_wins})
+        return out
+
+
+class ResilientClient(_Counters, ChatClientWrapper):
+    """
+    Sync client wrapper adding classified retries and optional hedging.
+    Hedged attempts run on a small thread pool; a losing attempt is left to finish
+    in the background and its result discarded. Streaming requests are only retried
+    if opening the stream fails.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        policy: Optional[RetryPolicy] = None,
+        hedger: Optional[Hedger] = None,
+        hedge_workers: int = 8,
+    ):
+        super().__init__(client)
+        self.policy = policy or RetryPolicy()
+        self.hedger = hedger
+        self._init_counters()
+        self._pool = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="llm-hedge")
+            if hedger is not None else None
+        )
+
+    def create(self, **kwargs: Any) -> Any:
+        with self._counter_lock:
+            self.calls += 1
+        if self.policy.attempt_timeout is not None:
+            kwargs.setdefault("timeout", self.policy.attempt_timeout)
+        attempts: Dict[Optional[str], int] = {}
+        while True:
+            try:
+                return self._attempt(kwargs)
+            except Exception as exc:
+                kind = classify_error(exc)
+                delay = self.policy.delay(attempts.get(kind, 0), exc)
+                if delay is None:
+                    with self._counter_lock:
+                        self.failures += 1
+                    raise
+                self._count_retry(exc)
+                time.sleep(delay)
+                attempts[kind] = attempts.get(kind, 0) + 1
+
+    def _timed(self, kwargs: Dict[str, Any]) -> Any:
+        start = time.monotonic()
+        response = self.client.chat.completions.create(**kwargs)
+        if self.hedger is not None:
+            self.hedger.observe(time.monotonic() - start)
+        return response
+
+    def _attempt(self, kwargs: Dict[str, Any]) -> Any:
+        delay = self.hedger.delay() if self.hedger is not None and not kwargs.get("stream") else None
+        if delay is None:
+            return self._timed(kwargs)
+        primary = self._pool.submit(self._timed, kwargs)
+        done, _ = concurrent.futures.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        hedge = self._pool.submit(self._timed, kwargs)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self.hedger.record_hedge(won=future is hedge)
+                    return future.result()
+                error = error or future.exception()
+        self.hedger.record_hedge(won=False)
+        raise error
+
+
+class AsyncResilientClient(_Counters, AsyncChatClientWrapper):
+    """Async counterpart of ResilientClient; the losing hedged attempt is cancelled."""
+
+    def __init__(self, client: Any, policy: Optional[RetryPolicy] = None, hedger: Optional[Hedger] = None):
+        super().__init__(client)
+        self.policy = policy or RetryPolicy()
+        self.hedger = hedger
+        self._init_counters()
+
+    async def create(self, **kwargs: Any) -> Any:
+        with self._counter_lock:
+            self.calls += 1
+        if self.policy.attempt_timeout is not None:
+            kwargs.setdefault("timeout", self.policy.attempt_timeout)
+        attempts: Dict[Optional[str], int] = {}
+        while True:
+            try:
+                return await self._attempt(kwargs)
+            except Exception as exc:
+                kind = classify_error(exc)
+                delay = self.policy.delay(attempts.get(kind, 0), exc)
+                if delay is None:
+                    with self._counter_lock:
+                        self.failures += 1
+                    raise
+                self._count_retry(exc)
+                await asyncio.sleep(delay)
+                attempts[kind] = attempts.get(kind, 0) + 1
+
+    async def _timed(self, kwargs: Dict[str, Any]) -> Any:
+        start = time.monotonic()
+        response = await self.client.chat.completions.create(**kwargs)
+        if self.hedger is not None:
+            self.hedger.observe(time.monotonic() - start)
+        return response
+
+    async def _attempt(self, kwargs: Dict[str, Any]) -> Any:
+        delay = self.hedger.delay() if self.hedger is not None and not kwargs.get("stream") else None
+        if delay is None:
+            return await self._timed(kwargs)
+        primary = asyncio.ensure_future(self._timed(kwargs))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except BaseException:
+            primary.cancel()
+            raise
+        if done:
+            return primary.result()
+        hedge = asyncio.ensure_future(self._timed(kwargs))
+        return await self._first_success(primary, hedge)
+
+    async def _first_success(self, primary: asyncio.Future, hedge: asyncio.Future) -> Any:
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.hedger.record_hedge(won=task is hedge)
+                        return task.result()
+                    error = error or task.exception()
+            self.hedger.record_hedge(won=False)
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
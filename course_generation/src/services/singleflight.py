@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.services.cache import request_key
+from src.services.wrapper import AsyncChatClientWrapper, ChatClientWrapper
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls across threads.
+
+    The first caller for a key runs the function; callers arriving while it is in flight
+    wait for it and receive the same result (or exception). Nothing is cached afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent identical coroutine calls within an event loop.
+
+    The upstream call runs as its own task, so a cancelled waiter does not cancel it
+    for the other waiters.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        self.calls += 1
+        entry = self._tasks.get(key)
+        if entry is not None and entry[0] is loop and not entry[1].done():
+            self.coalesced += 1
+            task = entry[1]
+        else:
+            task = loop.create_task(fn())
+            self._tasks[key] = (loop, task)
+            task.add_done_callback(lambda t, key=key: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        entry = self._tasks.get(key)
+        if entry is not None and entry[1] is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._tasks)}
+
+
+class SingleFlightClient(ChatClientWrapper):
+    """Sync client wrapper sharing one upstream call among concurrent identical requests."""
+
+    def __init__(self, client: Any, flight: Optional[SingleFlight] = None):
+        super().__init__(client)
+        self.flight = flight or SingleFlight()
+
+    def create(self, **kwargs: Any) -> Any:
+        if kwargs.get("stream"):
+            return self.client.chat.completions.create(**kwargs)
+        return self.flight.do(request_key(kwargs), lambda: self.client.chat.completions.create(**kwargs))
+
+
+class AsyncSingleFlightClient(AsyncChatClientWrapper):
+    """Async counterpart of SingleFlightClient."""
+
+    def __init__(self, client: Any, flight: Optional[AsyncSingleFlight] = None):
+        super().__init__(client)
+        self.flight = flight or AsyncSingleFlight()
+
+    async def create(self, **kwargs: Any) -> Any:
+        if kwargs.get("stream"):
+            return await self.client.chat.completions.create(**kwargs)
+        return await self.flight.do(request_key(kwargs), lambda: self.client.chat.completions.create(**kwargs))
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src.checkpoint import CheckpointStore, MarkdownStore
+
+
+@dataclass
+class StreamResult:
+    """Final assembled output of a streamed completion."""
+
+    text: str
+    finish_reason: Optional[str]
+    usage: Optional[Any]
+    first_token_latency: Optional[float]
+    elapsed: float
+    path: Optional[str] = None
+
+
+class TokenStream:
+    """
+    Async iterator over the token deltas of one streamed chat completion.
+
+    Iterating starts the request. When `path` is given, deltas are appended to
+    `<path>.partial` as they arrive (so progress is visible on disk) and only the
+    completed text is saved, through `store` (a MarkdownStore by default) under the stage
+    `key`, so a crash never leaves a truncated artifact where checkpoint readers look and
+    keyed resume reuses streamed output. Call `await stream.result()` for the assembled
+    StreamResult; it drains the stream if it was not iterated and re-raises the error of
+    a stream that failed. The request
+    asks for a final usage chunk (`stream_options.include_usage`) unless it sets its own
+    stream_options, so StreamResult.usage and the metrics see streamed token counts.
+    """
+
+    def __init__(
+        self,
+        async_client: Any,
+        request: Dict[str, Any],
+        path: Optional[str] = None,
+        store: Optional[CheckpointStore] = None,
+        key: Optional[str] = None,
+        artifact: Optional[str] = None,
+    ):
+        self.async_client = async_client
+        self.request = dict(request, stream=True)
+        self.request.setdefault("stream_options", {"include_usage": True})
+        self.path = path
+        self.store = store or MarkdownStore()
+        self.key = key
+        self.artifact = artifact
+        self._result: Optional[StreamResult] = None
+        self._error: Optional[BaseException] = None
+        self._iterator: Optional[AsyncIterator[str]] = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        if self._iterator is None:
+            self._iterator = self._run()
+        return self._iterator
+
+    async def _run(self) -> AsyncIterator[str]:
+        start = time.monotonic()
+        first_token_latency = None
+        parts: List[str] = []
+        finish_reason = None
+        usage = None
+        partial_path = f"{self.path}.partial" if self.path else None
+        out = None
+        try:
+            if partial_path:
+                os.makedirs(os.path.dirname(os.path.abspath(partial_path)), exist_ok=True)
+                out = open(partial_path, "w", encoding="utf-8")
+            response = await self.async_client.chat.completions.create(**self.request)
+            async for chunk in response:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = getattr(choice.delta, "content", None)
+                if not delta:
+                    continue
+                if first_token_latency is None:
+                    first_token_latency = time.monotonic() - start
+                parts.append(delta)
+                if out is not None:
+                    out.write(delta)
+                    out.flush()
+                yield delta
+            text = "".join(parts)
+            if self.path:
+                # Off the event loop: the store may rewrite a manifest under a file lock
+                await asyncio.to_thread(
+                    self.store.write, os.path.dirname(self.path) or ".", os.path.basename(self.path), text,
+                    artifact=self.artifact, model=self.request.get("model"), elapsed=time.monotonic() - start,
+                    key=self.key,
+                )
+        except Exception as exc:
+            self._error = exc
+            raise
+        finally:
+            if out is not None:
+                out.close()
+        if partial_path:
+            os.remove(partial_path)
+        self._result = StreamResult(
+            text=text,
+            finish_reason=finish_reason,
+            usage=usage,
+            first_token_latency=first_token_latency,
+            elapsed=time.monotonic() - start,
+            path=self.path,
+        )
+
+    async def result(self) -> StreamResult:
+        if self._result is None and self._error is None:
+            async for _ in self:
+                pass
+        if self._error is not None:
+            raise self._error
+        if self._result is None:
+            raise RuntimeError("stream was closed before it completed")
+        return self._result
@@ -0,0 +1,91 @@
+from typing import Any
+
+
+class _Completions:
+    def __init__(self, create):
+        self.create = create
+
+
+class _Chat:
+    def __init__(self, create):
+        self.completions = _Completions(create)
+
+
+class ChatClientWrapper:
+    """
+    Base for layers around an OpenAI-style sync client.
+
+    Exposes `chat.completions.create(**kwargs)` like the wrapped client, so wrappers can be
+    injected anywhere `client` is accepted and stacked on top of each other. Subclasses
+    override `create`; every other attribute is delegated to the wrapped client.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.chat = _Chat(self.create)
+
+    def create(self, **kwargs: Any) -> Any:
+        return self.client.chat.completions.create(**kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+class AsyncChatClientWrapper:
+    """Async counterpart of ChatClientWrapper for OpenAI-style async clients."""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.chat = _Chat(self.create)
+
+    async def create(self, **kwargs: Any) -> Any:
+        return await self.client.chat.completions.create(**kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+def to_plain(obj: Any) -> Any:
+    """Convert an SDK response object into JSON-serializable builtins."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, dict):
+        return {k: to_plain(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_plain(v) for v in obj]
+    if hasattr(obj, "__dict__"):
+        return {k: to_plain(v) for k, v in vars(obj).items() if not k.startswith("_")}
+    return obj
+
+
+class Record:
+    """Attribute view over plain response data, e.g. `record.choices[0].message.content`."""
+
+    def __init__(self, data: dict):
+        for key, value in data.items():
+            setattr(self, key, _to_record(value))
+
+    def __getattr__(self, name: str) -> Any:
+        # Optional SDK fields (usage details, tool calls, ...) read as None when absent
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return None
+
+    def model_dump(self, **kwargs: Any) -> dict:
+        return {k: _from_record(v) for k, v in vars(self).items()}
+
+
+def _to_record(value: Any) -> Any:
+    if isinstance(value, dict):
+        return Record(value)
+    if isinstance(value, list):
+        return [_to_record(v) for v in value]
+    return value
+
+
+def _from_record(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_from_record(v) for v in value]
+    return value
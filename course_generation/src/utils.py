@@ -1,91 +1,351 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 import json
 import os
+import random
+import threading
+import time
+from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 import aiohttp
 
+from src.services.cache import ResearchCache, normalize_query, research_key
+from src.services.cassette import get_cassette
+from src.services.metrics import metrics
+from src.services.singleflight import AsyncSingleFlight
+
 # Optional dependency: requests
 try:
     import requests  # type: ignore
 except Exception:
     requests = None  # type: ignore
 
-FAST_RESEARCH_URL = "https://tinh12345bn--researcher-api-create-app.modal.run/fast_research"
-FAST_SEARCH_URL = "https://tinh12345bn--researcher-api-create-app.modal.run/fast_search"
+# Researcher API endpoints; RESEARCHER_BASE_URL (or the per-endpoint variables) point them elsewhere,
+# e.g. at the local stand-in server in benchmarks/
+RESEARCHER_BASE_URL = os.getenv("RESEARCHER_BASE_URL", "https://tinh12345bn--researcher-api-create-app.modal.run").rstrip("/")
+FAST_RESEARCH_URL = os.getenv("FAST_RESEARCH_URL", f"{RESEARCHER_BASE_URL}/fast_research")
+FAST_SEARCH_URL = os.getenv("FAST_SEARCH_URL", f"{RESEARCHER_BASE_URL}/fast_search")
 DEFAULT_API_KEY = os.getenv("RESEARCHER_API_KEY")
 
 
-def fast_research(query: str, api_key: Optional[str] = None, timeout: float = 60.0) -> Dict[str, Any]:
-    """
-    Call the fast research endpoint.
+# HTTP statuses worth retrying: rate limiting and transient server-side failures
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
 
-    Args:
-        query: The query string to research.
-        api_key: Optional API key. Defaults to env RESEARCHER_API_KEY
-        timeout: Request timeout in seconds.
 
-    Returns:
-        Parsed JSON response as dict.
+class ResearchHTTPError(RuntimeError):
+    """Researcher API answered with a non-2xx status."""
 
-    Raises:
-        RuntimeError: On HTTP errors or invalid JSON response.
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+class ResearchTransportError(RuntimeError):
+    """Connection failure or timeout before the researcher API answered."""
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0.0, min(cap, base * (2 ** attempt)))
+
+
+@dataclass
+class ResearchResponse:
+    """Parsed researcher API payload plus how many attempts it took."""
+
+    data: Dict[str, Any]
+    attempts: int
+    elapsed: float
+
+
+class ResearchClient:
     """
-    key = api_key or DEFAULT_API_KEY
-    headers = {
-        "accept": "application/json",
-        "X-API-Key": key,
-        "Content-Type": "application/json",
-    }
-    payload = {"query": query}
-
-    if requests is not None:
-        try:
-            resp = requests.post(FAST_RESEARCH_URL, headers=headers, json=payload, timeout=timeout)
-        except Exception as exc:
-            raise RuntimeError(f"fast_research request failed: {exc}") from exc
-        if not (200 <= resp.status_code < 300):
-            raise RuntimeError(f"fast_research HTTP {resp.status_code}: {resp.text}")
-        try:
-            return resp.json()
-        except ValueError as exc:
-            raise RuntimeError("fast_research returned non-JSON response") from exc
-    else:
+    Pooled sync client for the researcher API.
+
+    Uses one requests.Session (keep-alive connection pool shared by all threads) and retries
+    transient failures (connection errors, timeouts, 408/425/429/5xx) with jittered exponential
+    backoff. Other request errors (invalid URL, missing schema, ...) fail on the first
+    attempt. `timeout` applies to each attempt, not to the whole call. Falls back to urllib
+    without pooling when requests is not installed.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        pool_maxsize: int = 32,
+    ):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = None
+        if requests is not None:
+            from requests.adapters import HTTPAdapter  # type: ignore
+
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        # Aggregate counters across all calls
+        self.calls = 0
+        self.attempts = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def _send(self, url: str, headers: Dict[str, str], payload: Dict[str, Any], name: str, timeout: float) -> Dict[str, Any]:
+        if self.session is not None:
+            try:
+                resp = self.session.post(url, headers=headers, json=payload, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                raise ResearchTransportError(f"{name} request failed: {exc}") from exc
+            except Exception as exc:
+                raise RuntimeError(f"{name} request failed: {exc}") from exc
+            if not (200 <= resp.status_code < 300):
+                raise ResearchHTTPError(f"{name} HTTP {resp.status_code}: {resp.text}", resp.status_code)
+            try:
+                return resp.json()
+            except ValueError as exc:
+                raise ValueError(f"{name} returned non-JSON response") from exc
+
         # Fallback to stdlib to avoid adding dependencies
         import urllib.request
         import urllib.error
 
         data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(FAST_RESEARCH_URL, data=data, method="POST", headers=headers)
+        req = urllib.request.Request(url, data=data, method="POST", headers=headers)
         try:
             with urllib.request.urlopen(req, timeout=timeout) as r:
                 status = r.getcode()
                 body = r.read()
         except urllib.error.HTTPError as e:
-            body = e.read().decode("utf-8", errors="replace")
-            raise RuntimeError(f"fast_research HTTP {e.code}: {body}") from e
+            text = e.read().decode("utf-8", errors="replace")
+            raise ResearchHTTPError(f"{name} HTTP {e.code}: {text}", e.code) from e
+        except OSError as exc:
+            # URLError (unreachable host, refused connection) and socket timeouts
+            raise ResearchTransportError(f"{name} request failed: {exc}") from exc
         except Exception as exc:
-            raise RuntimeError(f"fast_research request failed: {exc}") from exc
+            raise RuntimeError(f"{name} request failed: {exc}") from exc
 
         if not (200 <= status < 300):
-            raise RuntimeError(f"fast_research HTTP {status}: {body.decode('utf-8', errors='replace')}")
+            raise ResearchHTTPError(f"{name} HTTP {status}: {body.decode('utf-8', errors='replace')}", status)
         try:
             return json.loads(body.decode("utf-8"))
         except json.JSONDecodeError as exc:
-            raise RuntimeError("fast_research returned non-JSON response") from exc
+            raise ValueError(f"{name} returned non-JSON response") from exc
+
+    def request(
+        self, url: str, query: str, name: str, api_key: Optional[str] = None, timeout: Optional[float] = None
+    ) -> ResearchResponse:
+        """
+        POST {"query": query} to `url`, retrying transient failures.
+
+        Returns:
+            ResearchResponse with the parsed payload and the number of attempts used.
+
+        Raises:
+            RuntimeError: On invalid requests, non-retryable HTTP errors, invalid JSON, or once
+                retries are exhausted.
+        """
+        key = api_key or self.api_key or DEFAULT_API_KEY
+        headers = {
+            "accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        if key:
+            headers["X-API-Key"] = key
+        payload = {"query": query}
+        per_attempt_timeout = timeout if timeout is not None else self.timeout
+
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                data = self._send(url, headers, payload, name, per_attempt_timeout)
+            except ValueError as exc:
+                self._record(attempt, failed=True)
+                raise RuntimeError(str(exc)) from exc
+            except ResearchHTTPError as exc:
+                if exc.status not in RETRYABLE_STATUSES or attempt > self.max_retries:
+                    self._record(attempt, failed=True)
+                    raise RuntimeError(f"{exc} (after {attempt} attempt(s))") from exc
+            except ResearchTransportError as exc:
+                if attempt > self.max_retries:
+                    self._record(attempt, failed=True)
+                    raise RuntimeError(f"{exc} (after {attempt} attempt(s))") from exc
+            except RuntimeError:
+                # Request errors that another attempt cannot fix (invalid URL, missing schema, ...)
+                self._record(attempt, failed=True)
+                raise
+            else:
+                self._record(attempt, failed=False)
+                return ResearchResponse(data=data, attempts=attempt, elapsed=time.monotonic() - start)
+            time.sleep(backoff_delay(attempt - 1, self.backoff_base, self.backoff_max))
+
+    def _record(self, attempts: int, failed: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.attempts += attempts
+            if failed:
+                self.failures += 1
+
+    def fast_search(self, query: str, api_key: Optional[str] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return self.request(FAST_SEARCH_URL, query, "fast_search", api_key=api_key, timeout=timeout).data
+
+    def fast_research(self, query: str, api_key: Optional[str] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return self.request(FAST_RESEARCH_URL, query, "fast_research", api_key=api_key, timeout=timeout).data
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
+
+    def __enter__(self) -> "ResearchClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+# Process-wide client shared by Analyze and Develop through fast_search/fast_research
+_research_client: Optional[ResearchClient] = None
+_research_client_lock = threading.Lock()
+
+
+def get_research_client() -> ResearchClient:
+    """Return the shared ResearchClient, creating it on first use."""
+    global _research_client
+    with _research_client_lock:
+        if _research_client is None:
+            _research_client = ResearchClient()
+        return _research_client
+
+
+def set_research_client(research_client: Optional[ResearchClient]) -> None:
+    """Replace the shared ResearchClient (None resets to a lazily created default)."""
+    global _research_client
+    with _research_client_lock:
+        _research_client = research_client
+
+
+# Optional research cache shared by the sync and async module-level functions.
+# Every fast_search/fast_research call (cached or not) is timed into src.services.metrics.metrics,
+# and recorded to / replayed from the cassette when one is set (see src.services.cassette).
+# RESEARCH_CACHE_DIR enables it; RESEARCH_CACHE_TTL sets the entry lifetime in seconds.
+_research_cache: Optional[ResearchCache] = (
+    ResearchCache(os.environ["RESEARCH_CACHE_DIR"], ttl=float(os.getenv("RESEARCH_CACHE_TTL", 12 * 3600)))
+    if os.getenv("RESEARCH_CACHE_DIR")
+    else None
+)
+
+
+def get_research_cache() -> Optional[ResearchCache]:
+    return _research_cache
+
+
+def set_research_cache(cache: Optional[ResearchCache]) -> None:
+    """Enable (or with None, disable) caching of fast_search/fast_research results."""
+    global _research_cache
+    _research_cache = cache
+
+
+def _cached_research(endpoint: str, query: str, fetch) -> Dict[str, Any]:
+    cache = _research_cache
+    cassette = get_cassette()
+    start = time.monotonic()
+    try:
+        if cassette is not None and cassette.replaying:
+            entry, delay = cassette.play("research", research_key(endpoint, query))
+            time.sleep(delay)
+            metrics.record("research", endpoint, time.monotonic() - start)
+            return copy.deepcopy(entry["response"])
+        cached = cache.lookup(endpoint, query) if cache is not None else None
+        if cached is not None:
+            metrics.record("research", endpoint, time.monotonic() - start, cache_hit=True)
+            # Recorded too, so a cassette made with a warm cache replays without it
+            if cassette is not None:
+                cassette.record("research", research_key(endpoint, query), cached, time.monotonic() - start)
+            return cached
+        data = fetch()
+    except Exception as exc:
+        metrics.record("research", endpoint, time.monotonic() - start, error=exc)
+        raise
+    metrics.record("research", endpoint, time.monotonic() - start)
+    if cache is not None:
+        cache.store(endpoint, query, data)
+    if cassette is not None:
+        cassette.record("research", research_key(endpoint, query), data, time.monotonic() - start)
+    return data
+
+
+async def _async_cached_research(endpoint: str, query: str, fetch) -> Dict[str, Any]:
+    cache = _research_cache
+    cassette = get_cassette()
+    start = time.monotonic()
+    try:
+        if cassette is not None and cassette.replaying:
+            entry, delay = cassette.play("research", research_key(endpoint, query))
+            await asyncio.sleep(delay)
+            metrics.record("research", endpoint, time.monotonic() - start)
+            return copy.deepcopy(entry["response"])
+        cached = await asyncio.to_thread(cache.lookup, endpoint, query) if cache is not None else None
+        if cached is not None:
+            metrics.record("research", endpoint, time.monotonic() - start, cache_hit=True)
+            # Recorded too, so a cassette made with a warm cache replays without it
+            if cassette is not None:
+                cassette.record("research", research_key(endpoint, query), cached, time.monotonic() - start)
+            return cached
+        data = await fetch()
+    except Exception as exc:
+        metrics.record("research", endpoint, time.monotonic() - start, error=exc)
+        raise
+    metrics.record("research", endpoint, time.monotonic() - start)
+    if cache is not None:
+        await asyncio.to_thread(cache.store, endpoint, query, data)
+    if cassette is not None:
+        cassette.record("research", research_key(endpoint, query), data, time.monotonic() - start)
+    return data
+
+
+def fast_research(query: str, api_key: Optional[str] = None, timeout: float = 60.0) -> Dict[str, Any]:
+    """
+    Call the fast research endpoint through the shared pooled, retrying client.
+    Served from the research cache when one is configured (see set_research_cache).
+
+    Args:
+        query: The query string to research.
+        api_key: Optional API key. Defaults to env RESEARCHER_API_KEY
+        timeout: Per-attempt request timeout in seconds.
+
+    Returns:
+        Parsed JSON response as dict.
+
+    Raises:
+        RuntimeError: On HTTP errors or invalid JSON response.
+    """
+    return _cached_research(
+        "fast_research", query, lambda: get_research_client().fast_research(query, api_key=api_key, timeout=timeout)
+    )
 
 
 def fast_search(
     query: str, api_key: Optional[str] = None, timeout: float = 60.0
 ) -> Dict[str, Any]:
     """
-    Call the fast search endpoint.
+    Call the fast search endpoint through the shared pooled, retrying client.
+    Served from the research cache when one is configured (see set_research_cache).
 
     Args:
         query: The query string to search.
         api_key: Optional API key. Defaults to env RESEARCHER_API_KEY
-        timeout: Request timeout in seconds.
+        timeout: Per-attempt request timeout in seconds.
 
     Returns:
         Parsed JSON response as dict.
@@ -93,55 +353,167 @@ def fast_search(
     Raises:
         RuntimeError: On HTTP errors or invalid JSON response.
     """
-    key = api_key or DEFAULT_API_KEY
-    headers = {
-        "accept": "application/json",
-        "X-API-Key": key,
-        "Content-Type": "application/json",
-    }
-    payload = {"query": query}
-
-    if requests is not None:
-        try:
-            resp = requests.post(FAST_SEARCH_URL, headers=headers, json=payload, timeout=timeout)
-        except Exception as exc:
-            raise RuntimeError(f"fast_search request failed: {exc}") from exc
-        if not (200 <= resp.status_code < 300):
-            raise RuntimeError(f"fast_search HTTP {resp.status_code}: {resp.text}")
-        try:
-            return resp.json()
-        except ValueError as exc:
-            raise RuntimeError("fast_search returned non-JSON response") from exc
-    else:
-        # Fallback to stdlib to avoid adding dependencies
-        import urllib.request
-        import urllib.error
+    return _cached_research(
+        "fast_search", query, lambda: get_research_client().fast_search(query, api_key=api_key, timeout=timeout)
+    )
 
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(FAST_SEARCH_URL, data=data, method="POST", headers=headers)
+
+class AsyncResearchClient:
+    """
+    Long-lived async client for the researcher API.
+
+    Keeps one aiohttp session (and its connection pool) per event loop alive across calls
+    so concurrent research requests reuse warm TCP+TLS connections instead of handshaking
+    every time.
+    Close it with `await client.close()` or use it as an async context manager.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        timeout: float = 60.0,
+        limit: int = 100,
+        limit_per_host: int = 32,
+        keepalive_timeout: float = 60.0,
+        ttl_dns_cache: int = 300,
+    ):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        # aiohttp sessions are bound to the loop that created them, so keep one per event loop
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._sessions_lock = threading.Lock()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        with self._sessions_lock:
+            # A session whose loop has closed (e.g. a finished asyncio.run) cannot be closed any more
+            for closed_loop in [other for other in self._sessions if other.is_closed()]:
+                del self._sessions[closed_loop]
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                session = self._sessions[loop] = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self.limit,
+                        limit_per_host=self.limit_per_host,
+                        keepalive_timeout=self.keepalive_timeout,
+                        ttl_dns_cache=self.ttl_dns_cache,
+                        use_dns_cache=True,
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers={"accept": "application/json", "Content-Type": "application/json"},
+                )
+            return session
+
+    async def post(
+        self, url: str, query: str, name: str, api_key: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        POST {"query": query} to `url` over the pooled session.
+
+        Raises:
+            RuntimeError: On HTTP errors, transport errors or invalid JSON response.
+        """
+        session = self._get_session()
+        key = api_key or self.api_key or DEFAULT_API_KEY
+        headers = {"X-API-Key": key} if key else {}
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout is not None else None
         try:
-            with urllib.request.urlopen(req, timeout=timeout) as r:
-                status = r.getcode()
-                body = r.read()
-        except urllib.error.HTTPError as e:
-            body = e.read().decode("utf-8", errors="replace")
-            raise RuntimeError(f"fast_search HTTP {e.code}: {body}") from e
+            async with session.post(url, headers=headers, json={"query": query}, timeout=request_timeout) as resp:
+                if not (200 <= resp.status < 300):
+                    text = await resp.text()
+                    raise RuntimeError(f"{name} HTTP {resp.status}: {text}")
+                try:
+                    return await resp.json()
+                except aiohttp.ContentTypeError as exc:
+                    raise RuntimeError(f"{name} returned non-JSON response") from exc
+        except RuntimeError:
+            raise
         except Exception as exc:
-            raise RuntimeError(f"fast_search request failed: {exc}") from exc
+            raise RuntimeError(f"{name} request failed: {exc!r}") from exc
+
+    async def fast_search(
+        self, query: str, api_key: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        return await self.post(FAST_SEARCH_URL, query, "async_fast_search", api_key=api_key, timeout=timeout)
+
+    async def fast_research(
+        self, query: str, api_key: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        return await self.post(FAST_RESEARCH_URL, query, "async_fast_research", api_key=api_key, timeout=timeout)
+
+    async def close(self) -> None:
+        """
+        Close every session on the loop that owns it: this loop's directly, those of other
+        running loops (other threads) through run_coroutine_threadsafe.
+        """
+        current = asyncio.get_running_loop()
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, {}
+        for loop, session in sessions.items():
+            if session.closed or loop.is_closed():
+                continue
+            if loop is current:
+                await session.close()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+
+    async def __aenter__(self) -> "AsyncResearchClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+# Process-wide client shared by Analyze and Develop through async_fast_search/async_fast_research
+_async_research_client: Optional[AsyncResearchClient] = None
+
+
+def get_async_research_client() -> AsyncResearchClient:
+    """Return the shared AsyncResearchClient, creating it on first use."""
+    global _async_research_client
+    if _async_research_client is None:
+        _async_research_client = AsyncResearchClient()
+    return _async_research_client
 
-        if not (200 <= status < 300):
-            raise RuntimeError(f"fast_search HTTP {status}: {body.decode('utf-8', errors='replace')}")
-        try:
-            return json.loads(body.decode("utf-8"))
-        except json.JSONDecodeError as exc:
-            raise RuntimeError("fast_search returned non-JSON response") from exc
+
+def set_async_research_client(research_client: Optional[AsyncResearchClient]) -> None:
+    """Replace the shared AsyncResearchClient (None resets to a lazily created default)."""
+    global _async_research_client
+    _async_research_client = research_client
+
+
+async def close_async_research_client() -> None:
+    """Close the shared AsyncResearchClient's pooled connections."""
+    if _async_research_client is not None:
+        await _async_research_client.close()
+
+
+# Concurrent identical async research queries share one upstream request
+_research_flight = AsyncSingleFlight()
+
+
+def get_research_singleflight() -> AsyncSingleFlight:
+    """Single-flight group used by async_fast_search/async_fast_research (see .stats())."""
+    return _research_flight
+
+
+async def _deduped_research(endpoint: str, query: str, fetch) -> Dict[str, Any]:
+    data = await _research_flight.do((endpoint, normalize_query(query)), fetch)
+    # Every waiter gets its own copy of the shared payload
+    return copy.deepcopy(data)
 
 
 async def async_fast_research(
     query: str, api_key: Optional[str] = None, timeout: float = 60.0
 ) -> Dict[str, Any]:
     """
-    Asynchronously call the fast research endpoint.
+    Asynchronously call the fast research endpoint over the shared pooled session.
+    Served from the research cache when one is configured (see set_research_cache);
+    concurrent identical queries share a single request.
 
     Args:
         query: The query string to research.
@@ -154,34 +526,22 @@ async def async_fast_research(
     Raises:
         RuntimeError: On HTTP errors or invalid JSON response.
     """
-    import aiohttp  # type: ignore
+    return await _async_cached_research(
+        "fast_research",
+        query,
+        lambda: _deduped_research(
+            "fast_research", query, lambda: get_async_research_client().fast_research(query, api_key=api_key, timeout=timeout)
+        ),
+    )
 
-    key = api_key or DEFAULT_API_KEY
-    headers = {
-        "accept": "application/json",
-        "X-API-Key": key,
-        "Content-Type": "application/json",
-    }
-    payload = {"query": query}
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(FAST_RESEARCH_URL, headers=headers, json=payload, timeout=timeout) as resp:
-                if not (200 <= resp.status < 300):
-                    text = await resp.text()
-                    raise RuntimeError(f"async_fast_research HTTP {resp.status}: {text}")
-                try:
-                    return await resp.json()
-                except aiohttp.ContentTypeError as exc:
-                    raise RuntimeError("async_fast_research returned non-JSON response") from exc
-        except Exception as exc:
-            raise RuntimeError(f"async_fast_research request failed: {exc}") from exc
-        
 async def async_fast_search(
     query: str, api_key: Optional[str] = None, timeout: float = 60.0
 ) -> Dict[str, Any]:
     """
-    Asynchronously call the fast search endpoint.
+    Asynchronously call the fast search endpoint over the shared pooled session.
+    Served from the research cache when one is configured (see set_research_cache);
+    concurrent identical queries share a single request.
 
     Args:
         query: The query string to search.
@@ -194,25 +554,10 @@ async def async_fast_search(
     Raises:
         RuntimeError: On HTTP errors or invalid JSON response.
     """
-    import aiohttp  # type: ignore
-
-    key = api_key or DEFAULT_API_KEY
-    headers = {
-        "accept": "application/json",
-        "X-API-Key": key,
-        "Content-Type": "application/json",
-    }
-    payload = {"query": query}
-
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(FAST_SEARCH_URL, headers=headers, json=payload, timeout=timeout) as resp:
-                if not (200 <= resp.status < 300):
-                    text = await resp.text()
-                    raise RuntimeError(f"async_fast_search HTTP {resp.status}: {text}")
-                try:
-                    return await resp.json()
-                except aiohttp.ContentTypeError as exc:
-                    raise RuntimeError("async_fast_search returned non-JSON response") from exc
-        except Exception as exc:
-            raise RuntimeError(f"async_fast_search request failed: {exc}") from exc
\ No newline at end of file
+    return await _async_cached_research(
+        "fast_search",
+        query,
+        lambda: _deduped_research(
+            "fast_search", query, lambda: get_async_research_client().fast_search(query, api_key=api_key, timeout=timeout)
+        ),
+    )
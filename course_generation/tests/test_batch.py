@@ -0,0 +1,27 @@
+import asyncio
+
+from src import batch
+
+
+def test_run_manifest_closes_the_checkpoint_db(tmp_path, monkeypatch):
+    manifest = tmp_path / "courses.jsonl"
+    manifest.write_text('{"course_name": "C", "course_description": "D", "learning_objectives": "O"}\n', encoding="utf-8")
+    built = []
+
+    def build_addie(*args, **kwargs):
+        built.append(original(*args, **kwargs))
+        return built[-1]
+
+    async def run(self, specs):
+        self.addie.store.read(str(tmp_path / "C-abc"), "syllabus.md")  # opens a connection
+        return []
+
+    original = batch.build_addie
+    monkeypatch.setattr(batch, "build_addie", build_addie)
+    monkeypatch.setattr(batch.BatchRunner, "run", run)
+    asyncio.run(batch.run_manifest(
+        str(manifest), max_llm_calls=0, checkpoint_dir=str(tmp_path), checkpoint_db=str(tmp_path / "checkpoints.db"),
+        report_path=str(tmp_path / "report.jsonl"),
+    ))
+
+    assert built[0].store._connections == []
@@ -0,0 +1,31 @@
+import json
+import os
+import time
+
+from src.services.cache import DiskCache
+
+
+def test_hits_do_not_extend_the_age_limit(tmp_path):
+    cache = DiskCache(str(tmp_path), max_age=60)
+    path = cache._path("aa")
+    os.makedirs(os.path.dirname(path))
+    created_at = time.time() - 120
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created_at": created_at, "value": "value"}, f)
+    # Written two minutes ago, read just now
+    os.utime(path, (time.time(), created_at))
+
+    assert cache.evict() == 1
+    assert cache.get("aa") is None
+
+
+def test_eviction_drops_the_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_age=None, max_entries=2)
+    cache.set("aa", 1)
+    cache.set("bb", 2)
+    os.utime(cache._path("bb"), (time.time() - 10, os.stat(cache._path("bb")).st_mtime))
+    cache.get("aa")
+    cache.set("cc", 3)
+
+    assert cache.evict() == 1
+    assert (cache.get("aa"), cache.get("bb"), cache.get("cc")) == (1, None, 3)
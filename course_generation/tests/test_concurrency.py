@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.concurrency import CallbackError, gather_bounded, run_threaded
+
+
+def _save(saved):
+    def on_result(name, result):
+        if name == "bad":
+            raise OSError("disk full")
+        saved[name] = threading.get_ident()
+
+    return on_result
+
+
+def test_gather_bounded_reports_callback_errors_separately():
+    async def ok():
+        return "ok"
+
+    async def fails():
+        raise ValueError("call failed")
+
+    saved = {}
+    with pytest.raises(CallbackError) as info:
+        asyncio.run(gather_bounded({"good": ok, "bad": ok, "failed": fails}, on_result=_save(saved)))
+
+    assert info.value.results == {"good": "ok", "bad": "ok"}
+    assert list(info.value.errors) == ["failed"]
+    assert list(info.value.callback_errors) == ["bad"]
+    assert saved["good"] != threading.get_ident()  # ran off the event loop thread
+
+
+def test_gather_bounded_callback_does_not_block_other_calls():
+    finished = []
+
+    async def quick():
+        await asyncio.sleep(0.01)
+        finished.append(time.monotonic())
+        return "quick"
+
+    async def slow_save_first():
+        return "first"
+
+    def on_result(name, result):
+        if name == "first":
+            time.sleep(0.2)
+
+    async def main():
+        start = time.monotonic()
+        await gather_bounded({"first": slow_save_first, "quick": quick}, on_result=on_result)
+        return start
+
+    start = asyncio.run(main())
+    assert finished[0] - start < 0.15
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_threaded_reports_callback_errors_separately(max_workers):
+    saved = {}
+    with pytest.raises(CallbackError) as info:
+        run_threaded({"bad": lambda: "ok", "good": lambda: "ok"}, max_workers=max_workers, on_result=_save(saved))
+
+    assert info.value.results == {"bad": "ok", "good": "ok"}
+    assert info.value.errors == {}
+    assert list(info.value.callback_errors) == ["bad"]
+    assert "good" in saved
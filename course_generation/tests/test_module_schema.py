@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from src.module_schema import parse_modules
+
+
+def _module(title: str, script_key: str = "script") -> dict:
+    return {"module_title": title, script_key: f"{title} script", "slides_plan": f"{title} slides", "assessment_plan": f"{title} quiz"}
+
+
+def _smart_quotes(text: str) -> str:
+    """Every straight quote as an opening or closing curly quote, as some models write JSON."""
+    parts = text.split('"')
+    return "".join(part + ("\u201c" if i % 2 == 0 else "\u201d") for i, part in enumerate(parts[:-1])) + parts[-1]
+
+
+TWO = json.dumps({"modules": [_module("Intro"), _module("Pricing")]})
+
+# (output, titles of the valid modules, title recovered from the invalid last fragment or None)
+CASES = {
+    "plain object": (TWO, ["Intro", "Pricing"], None),
+    "bare list": (json.dumps([_module("Intro")]), ["Intro"], None),
+    "code fence": (f"```json\n{TWO}\n```", ["Intro", "Pricing"], None),
+    "trailing commas": (TWO.replace("}]", "},]").replace('quiz"}', 'quiz",}'), ["Intro", "Pricing"], None),
+    "smart quotes": (_smart_quotes(TWO), ["Intro", "Pricing"], None),
+    "Scipt key": (json.dumps([_module("Intro", script_key="Scipt")]), ["Intro"], None),
+    "prose around the JSON": (f"Here are the modules [as requested]:\n{TWO}\nLet me know if [1] needs changes.", ["Intro", "Pricing"], None),
+    "truncated last module": (
+        '{"modules": [' + json.dumps(_module("Intro")) + ', {"module_title": "Pricing", "script": "Pricing scr',
+        ["Intro"],
+        "Pricing",
+    ),
+}
+
+
+@pytest.mark.parametrize("output, titles, partial_title", CASES.values(), ids=list(CASES))
+def test_parse_modules(output, titles, partial_title):
+    extraction = parse_modules(output)
+
+    assert [module["title"] for module in extraction.modules] == titles
+    for module in extraction.modules:
+        assert module["script"] == f"{module['title']} script"
+        assert module["assessment_plan"] == f"{module['title']} quiz"
+    if partial_title is None:
+        assert extraction.invalid == []
+    else:
+        [fragment] = extraction.invalid
+        assert fragment.index == len(titles)
+        assert fragment.partial["title"] == partial_title
+
+
+def test_truncated_module_is_kept_with_empty_fields_without_a_repair():
+    extraction = parse_modules('[' + json.dumps(_module("Intro")) + ', {"module_title": "Pricing", "script": "tru')
+    [fragment] = extraction.invalid
+
+    assert not extraction.resolve(fragment, parse_modules(""))
+    assert [module["title"] for module in extraction.modules] == ["Intro", "Pricing"]
+    assert extraction.modules[1]["slides_plan"] == ""
+
+
+def test_output_without_modules_is_one_invalid_fragment():
+    extraction = parse_modules("I could not find any modules.")
+
+    assert extraction.modules == []
+    assert [fragment.problem for fragment in extraction.invalid] == ["no list of modules found"]
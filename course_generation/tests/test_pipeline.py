@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+
+from src.checkpoint import MarkdownStore
+from src.pipeline import Node, Scheduler
+
+
+@pytest.mark.parametrize("allow_empty, runs", [(False, 1), (True, 0)])
+def test_empty_checkpoints_are_only_restored_when_allowed(tmp_path, allow_empty, runs):
+    store = MarkdownStore()
+    path = str(tmp_path / "syllabus.md")
+    store.write(str(tmp_path), "syllabus.md", "", key=None)
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        return "syllabus"
+
+    node = Node("syllabus", produce, (), ("syllabus",), {"syllabus": path}, allow_empty=allow_empty)
+    result = asyncio.run(Scheduler(store=store).run([node]))
+
+    assert len(calls) == runs
+    assert result.artifacts["syllabus"] == ("" if allow_empty else "syllabus")
@@ -0,0 +1,119 @@
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.addie import ADDIE, COURSE_FILES
+from src.checkpoint import SQLiteStore, content_hash
+
+COURSE = {
+    "course_name": "Stage Keys",
+    "course_description": "A course used to check which stages are regenerated.",
+    "learning_objectives": "Reuse checkpoints",
+}
+EDIT = "Keep every table compact."
+
+
+class StubClient:
+    """Sync chat client answering "v1" to every prompt, or "v2" once a template carries EDIT."""
+
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        instructions = kwargs["messages"][0]["content"]
+        with self._lock:
+            self.prompts.append(instructions)
+        message = SimpleNamespace(role="assistant", content="v2" if EDIT in instructions else "v1")
+        usage = SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop", index=0)], usage=usage, model="stub")
+
+
+@pytest.fixture
+def run(tmp_path):
+    client = StubClient()
+
+    def _run(edit=None):
+        """generate_course on a fresh ADDIE (as after a restart); returns how many LLM calls it made."""
+        addie = ADDIE(client, None, checkpoint_dir=str(tmp_path))
+        if edit:
+            edit(addie)
+        before = len(client.prompts)
+        addie.generate_course(**COURSE, do_research=False)
+        return len(client.prompts) - before
+
+    _run.client = client
+    return _run
+
+
+def test_unchanged_course_is_fully_reused(run):
+    # objectives, audience, resources, syllabus, slides_plan, assessment_plan (combined is not an LLM call)
+    assert run() == 6
+    assert run() == 0
+
+
+def test_template_edit_reruns_exactly_that_stage(run):
+    run()
+
+    def reword(addie):
+        addie.design.slides_template += "\nUse one row per slide."
+
+    assert run(reword) == 1
+    assert "Use one row per slide." in run.client.prompts[-1]
+    assert run(reword) == 0
+
+
+def test_dependents_are_reused_when_their_input_content_is_unchanged(run):
+    run()
+
+    # A reworded audience template still yields "v1", so combined and the design stages keep their keys
+    def reword(addie):
+        addie.analyze.audience_template += "\nName the audience segments."
+
+    assert run(reword) == 1
+
+
+def test_dependents_rerun_when_their_input_content_changes(run):
+    run()
+
+    def edit(addie):
+        addie.analyze.audience_template += "\n" + EDIT
+
+    # audience answers "v2", so combined changes and the three design stages rerun; objectives
+    # and resources keep their keys
+    assert run(edit) == 4
+    assert run(edit) == 0
+
+
+def test_sqlite_store_adds_stage_key_column(tmp_path):
+    db = str(tmp_path / "checkpoints.db")
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute(
+            "CREATE TABLE artifacts (location TEXT NOT NULL, filename TEXT NOT NULL, course TEXT, course_key TEXT, "
+            "artifact TEXT, content TEXT NOT NULL, sha256 TEXT NOT NULL, size INTEGER NOT NULL, model TEXT, "
+            "elapsed REAL, created_at REAL NOT NULL, PRIMARY KEY (location, filename))"
+        )
+        conn.execute(
+            "INSERT INTO artifacts VALUES ('Course-abc', 'syllabus.md', 'Course', 'abc', 'syllabus', 'old', ?, 3, NULL, NULL, 0)",
+            (content_hash("old"),),
+        )
+    conn.close()
+
+    store = SQLiteStore(db, root=str(tmp_path))
+    try:
+        columns = {row[1] for row in store._conn().execute("PRAGMA table_info(artifacts)")}
+        assert "stage_key" in columns
+        location = str(tmp_path / "Course-abc")
+        # Rows written before stage keys existed are kept but never match a keyed read
+        assert store.read(location, COURSE_FILES["syllabus"]) == "old"
+        assert store.read(location, COURSE_FILES["syllabus"], key="k1") is None
+        store.write(location, COURSE_FILES["syllabus"], "new", key="k1")
+        assert store.read(location, COURSE_FILES["syllabus"], key="k1") == "new"
+    finally:
+        store.close()
+    # Opening the migrated database again is a no-op
+    SQLiteStore(db, root=str(tmp_path)).close()
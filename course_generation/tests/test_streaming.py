@@ -0,0 +1,89 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.checkpoint import SQLiteStore
+from src.develop import MODULE_FILES, Develop
+
+DESIGN = "Module 1: Pricing"
+TITLE = "Pricing"
+
+
+def _chunk(content=None, finish_reason=None, usage=None):
+    choices = [] if content is None and finish_reason is None else [
+        SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)
+    ]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class StubAsyncClient:
+    """Streams "v1" in two deltas, or fails after the first delta when `fail` is set."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls += 1
+
+        async def chunks():
+            yield _chunk("v")
+            if self.fail:
+                raise ConnectionError("stream dropped")
+            yield _chunk("1", finish_reason="stop")
+            yield _chunk(usage=SimpleNamespace(prompt_tokens=1, completion_tokens=2, total_tokens=3))
+
+        return chunks()
+
+
+class StubClient:
+    """Sync client for develop_module; counts calls and answers "sync"."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(role="assistant", content="sync")
+        usage = SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop", index=0)], usage=usage, model="stub")
+
+
+@pytest.mark.parametrize("backend", ["markdown", "sqlite"])
+def test_streamed_script_is_reused_by_develop_module(tmp_path, backend):
+    store = SQLiteStore(str(tmp_path / "checkpoints.db"), root=str(tmp_path)) if backend == "sqlite" else None
+    client = StubClient()
+    develop = Develop(client, StubAsyncClient(), checkpoint_dir=str(tmp_path), checkpoint_store=store)
+    # The module directory does not exist yet; the stream creates it
+    art_dir = develop._module_art_dir(DESIGN, TITLE, False, None, None)
+    stream = develop.stream_module_script(DESIGN, TITLE, checkpoint_path=os.path.join(art_dir, MODULE_FILES["script"]))
+
+    result = asyncio.run(stream.result())
+    assert result.text == "v1"
+    assert not os.path.exists(os.path.join(art_dir, MODULE_FILES["script"] + ".partial"))
+
+    materials = develop.develop_module(DESIGN, TITLE, do_research=False)
+    assert materials["script"] == "v1"
+    assert client.calls == 2  # slides and assessment only
+    if store is not None:
+        store.close()
+
+
+def test_result_reraises_a_failed_stream(tmp_path):
+    develop = Develop(StubClient(), StubAsyncClient(fail=True), checkpoint_dir=str(tmp_path))
+    path = str(tmp_path / "module" / MODULE_FILES["script"])
+    stream = develop.stream_module_script(DESIGN, TITLE, checkpoint_path=path)
+
+    async def _consume():
+        async for _ in stream:
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(_consume())
+    with pytest.raises(ConnectionError):
+        asyncio.run(stream.result())
+    assert not os.path.exists(path)